@@ -4,9 +4,14 @@ from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 
 from services.config_loader import get_scoring_rules, update_scoring_rules
+from services.friend_graph import get_friend_graph_metrics
+from services.post_insert_queue import get_queue_metrics
+from services.response_cache import get_cache_metrics
 
 router = APIRouter()
 
+REDACTED_FAILURE_FIELDS = ("user_id", "error")
+
 
 class ScoringRulesPayload(BaseModel):
     rules: dict[str, Any]
@@ -30,3 +35,26 @@ def admin_update_scoring_rules(payload: ScoringRulesPayload):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         ) from exc
+
+
+def _redacted_queue_metrics() -> dict[str, Any]:
+    metrics = get_queue_metrics()
+    metrics["recent_failures"] = [
+        {key: value for key, value in failure.items() if key not in REDACTED_FAILURE_FIELDS}
+        for failure in metrics["recent_failures"]
+    ]
+    return metrics
+
+
+@router.get("/admin/metrics")
+def admin_get_metrics():
+    try:
+        return {
+            "post_insert_queue": _redacted_queue_metrics(),
+            "response_cache": get_cache_metrics(),
+            "friend_graph": get_friend_graph_metrics(),
+        }
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
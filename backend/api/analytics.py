@@ -6,11 +6,12 @@ from pydantic import BaseModel
 from api.events import get_authenticated_user_id
 from services.analytics_service import (
     get_before_after_comparison,
-    get_breakdown_data,
-    get_dashboard_stats,
+    get_breakdown_data_async,
+    get_dashboard_stats_async,
     get_score_history,
-    get_trend_data,
+    get_trend_data_async,
 )
+from services.response_cache import cached_response_async
 
 router = APIRouter()
 
@@ -68,7 +69,7 @@ class ScoreHistoryPoint(BaseModel):
 
 
 @router.get("/analytics/trends", response_model=TrendResponse)
-def analytics_trends(
+async def analytics_trends(
     metric: str = Query(...),
     start: datetime = Query(...),
     end: datetime = Query(...),
@@ -76,7 +77,12 @@ def analytics_trends(
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        data = get_trend_data(user_id, metric, start, end, granularity)
+        data = await cached_response_async(
+            user_id,
+            "analytics.trends",
+            {"metric": metric, "start": start, "end": end, "granularity": granularity},
+            lambda: get_trend_data_async(user_id, metric, start, end, granularity),
+        )
         return TrendResponse(metric=metric, granularity=granularity, data=data)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -87,14 +93,19 @@ def analytics_trends(
 
 
 @router.get("/analytics/breakdown", response_model=BreakdownResponse)
-def analytics_breakdown(
+async def analytics_breakdown(
     type: str = Query(...),
     start: datetime = Query(...),
     end: datetime = Query(...),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        data = get_breakdown_data(user_id, type, start, end)
+        data = await cached_response_async(
+            user_id,
+            "analytics.breakdown",
+            {"type": type, "start": start, "end": end},
+            lambda: get_breakdown_data_async(user_id, type, start, end),
+        )
         return BreakdownResponse(type=type, data=data)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -105,12 +116,17 @@ def analytics_breakdown(
 
 
 @router.get("/analytics/dashboard-stats", response_model=DashboardStats)
-def analytics_dashboard_stats(
+async def analytics_dashboard_stats(
     period: str = Query("week", pattern="^(week|month)$"),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return get_dashboard_stats(user_id, period)
+        return await cached_response_async(
+            user_id,
+            "analytics.dashboard_stats",
+            {"period": period},
+            lambda: get_dashboard_stats_async(user_id, period),
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
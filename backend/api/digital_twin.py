@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 from api.events import get_authenticated_user_id
 from services.digital_twin import (
@@ -9,6 +11,8 @@ from services.digital_twin import (
     project_wallet_shortterm,
     project_wellness,
 )
+from services.projection_engine import Layout
+from services.scenario_simulation import DEFAULT_PATHS, MAX_PATHS
 
 router = APIRouter()
 
@@ -20,6 +24,16 @@ class WalletTrajectoryPoint(BaseModel):
     upper: float | None = None
 
 
+class WalletTrajectoryColumns(BaseModel):
+    date: list[str]
+    balance: list[float]
+    lower: list[float]
+    upper: list[float]
+
+
+WalletTrajectory = list[WalletTrajectoryPoint] | WalletTrajectoryColumns
+
+
 class RecurringExpense(BaseModel):
     name: str
     amount: float
@@ -29,7 +43,7 @@ class RecurringExpense(BaseModel):
 
 class WalletProjection(BaseModel):
     current_balance: float
-    trajectories: dict[str, list[WalletTrajectoryPoint]]
+    trajectories: dict[str, WalletTrajectory]
     recurring_expenses: list[RecurringExpense]
     savings_potential: float
 
@@ -44,7 +58,7 @@ class WalletMonthlyBreakdown(BaseModel):
 
 class WalletLongTermProjection(BaseModel):
     current_balance: float
-    trajectories: dict[str, list[WalletTrajectoryPoint]]
+    trajectories: dict[str, WalletTrajectory]
     monthly_breakdown: list[WalletMonthlyBreakdown]
     cumulative_savings: dict[str, float]
     major_expenses: list[dict[str, str | float]]
@@ -59,6 +73,18 @@ class WellnessProjectionPoint(BaseModel):
     stress: float
 
 
+class WellnessProjectionColumns(BaseModel):
+    date: list[str]
+    score: list[float]
+    sleep: list[float]
+    diet: list[float]
+    movement: list[float]
+    stress: list[float]
+
+
+WellnessTrajectory = list[WellnessProjectionPoint] | WellnessProjectionColumns
+
+
 class WellnessFactor(BaseModel):
     name: str
     impact: float
@@ -67,8 +93,8 @@ class WellnessFactor(BaseModel):
 
 class WellnessProjection(BaseModel):
     current_score: float
-    projected_scores: list[WellnessProjectionPoint]
-    trajectories: dict[str, list[WellnessProjectionPoint]]
+    projected_scores: WellnessTrajectory
+    trajectories: dict[str, WellnessTrajectory]
     factors_impacting: list[WellnessFactor]
     recommended_changes: list[str]
 
@@ -80,6 +106,16 @@ class SustainabilityPoint(BaseModel):
     waste: float
 
 
+class SustainabilityColumns(BaseModel):
+    date: list[str]
+    co2e: list[float]
+    water: list[float]
+    waste: list[float]
+
+
+SustainabilityTrajectory = list[SustainabilityPoint] | SustainabilityColumns
+
+
 class SustainabilityImpact(BaseModel):
     name: str
     impact: float
@@ -89,7 +125,7 @@ class SustainabilityImpact(BaseModel):
 class SustainabilityProjection(BaseModel):
     current_footprint: float
     projected_footprint: float
-    trajectories: dict[str, list[SustainabilityPoint]]
+    trajectories: dict[str, SustainabilityTrajectory]
     improvement_potential: float
     top_impact_areas: list[SustainabilityImpact]
 
@@ -104,10 +140,34 @@ class ScenarioPoint(BaseModel):
     value: float
 
 
+class ScenarioColumns(BaseModel):
+    date: list[str]
+    value: list[float]
+
+
+class ScenarioBandPoint(BaseModel):
+    date: str
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+
+class ScenarioBandColumns(BaseModel):
+    date: list[str]
+    p5: list[float]
+    p25: list[float]
+    p50: list[float]
+    p75: list[float]
+    p95: list[float]
+
+
 class ScenarioResult(BaseModel):
     name: str
-    data: list[ScenarioPoint]
+    data: list[ScenarioPoint] | ScenarioColumns
     final_value: float
+    bands: list[ScenarioBandPoint] | ScenarioBandColumns | None = None
 
 
 class DivergencePoint(BaseModel):
@@ -123,16 +183,21 @@ class ScenarioComparisonResponse(BaseModel):
 class ScenarioComparisonRequest(BaseModel):
     scenarios: list[ScenarioInputs]
     metric: str
-    days: int = 30
+    days: int = Field(30, ge=1, le=365)
+    layout: Layout = "points"
+    mode: Literal["projection", "simulation"] = "projection"
+    paths: int = Field(DEFAULT_PATHS, ge=100, le=MAX_PATHS)
+    seed: int | None = None
 
 
 @router.get("/digital-twin/wallet", response_model=WalletProjection)
 def digital_twin_wallet(
-    days: int = Query(30, ge=1, le=90),
+    days: int = Query(30, ge=1, le=365),
+    layout: Layout = Query("points"),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return project_wallet_shortterm(user_id, days)
+        return project_wallet_shortterm(user_id, days, layout=layout)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -141,11 +206,12 @@ def digital_twin_wallet(
 
 @router.get("/digital-twin/wallet-long", response_model=WalletLongTermProjection)
 def digital_twin_wallet_long(
-    months: int = Query(3, ge=3, le=6),
+    months: int = Query(3, ge=3, le=12),
+    layout: Layout = Query("points"),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return project_wallet_longterm(user_id, months)
+        return project_wallet_longterm(user_id, months, layout=layout)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -154,11 +220,12 @@ def digital_twin_wallet_long(
 
 @router.get("/digital-twin/wellness", response_model=WellnessProjection)
 def digital_twin_wellness(
-    days: int = Query(30, ge=30, le=90),
+    days: int = Query(30, ge=30, le=365),
+    layout: Layout = Query("points"),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return project_wellness(user_id, days)
+        return project_wellness(user_id, days, layout=layout)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -167,11 +234,12 @@ def digital_twin_wellness(
 
 @router.get("/digital-twin/sustainability", response_model=SustainabilityProjection)
 def digital_twin_sustainability(
-    days: int = Query(30, ge=30, le=90),
+    days: int = Query(30, ge=30, le=365),
+    layout: Layout = Query("points"),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return project_sustainability(user_id, days)
+        return project_sustainability(user_id, days, layout=layout)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -184,7 +252,17 @@ def digital_twin_compare(
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return compare_scenarios(user_id, payload.scenarios, payload.metric, payload.days)
+        scenarios = [scenario.model_dump() for scenario in payload.scenarios]
+        return compare_scenarios(
+            user_id,
+            scenarios,
+            payload.metric,
+            payload.days,
+            payload.layout,
+            mode=payload.mode,
+            paths=payload.paths,
+            seed=payload.seed,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
@@ -5,7 +5,14 @@ from pydantic import BaseModel, Field
 
 from db.supabase import get_supabase_client
 from models.events import EventCategory, EventCreate, EventMetadata, EventOut, EventScores, EventType
-from services.event_service import create_event, get_event_stats, get_events, rescore_events
+from services.event_service import (
+    CountMode,
+    create_event,
+    create_events_bulk,
+    get_event_stats,
+    get_events_async,
+    rescore_events,
+)
 
 router = APIRouter()
 
@@ -30,10 +37,20 @@ class EventStatsOut(BaseModel):
     by_category: dict[str, EventAggregateOut]
 
 
+class EventBulkIn(BaseModel):
+    events: list[EventCreateIn] = Field(..., min_length=1, max_length=500)
+
+
+class EventBulkOut(BaseModel):
+    created: int
+    events: list[EventOut]
+
+
 class EventListOut(BaseModel):
     events: list[EventOut]
-    total: int
+    total: int | None = None
     has_more: bool
+    next_cursor: str | None = None
 
 
 class EventRescoreOut(BaseModel):
@@ -97,8 +114,34 @@ def create_event_route(
         ) from exc
 
 
+@router.post("/events/bulk", response_model=EventBulkOut)
+def create_events_bulk_route(
+    payload: EventBulkIn, user_id: str = Depends(get_authenticated_user_id)
+):
+    events = [
+        EventCreate(
+            user_id=user_id,
+            event_type=item.event_type,
+            category=item.category,
+            title=item.title,
+            timestamp=item.timestamp or datetime.utcnow(),
+            amount=item.amount,
+            metadata=item.metadata,
+            scores=item.scores,
+        )
+        for item in payload.events
+    ]
+    try:
+        created = create_events_bulk(events)
+        return {"created": len(created), "events": created}
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+
+
 @router.get("/events", response_model=EventListOut)
-def list_events(
+async def list_events(
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
     types: str | None = Query(None),
@@ -106,12 +149,14 @@ def list_events(
     categories: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    count: CountMode | None = Query(None),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
         parsed_types = _parse_csv(types or event_types)
         parsed_categories = _parse_csv(categories)
-        return get_events(
+        return await get_events_async(
             user_id,
             start_date,
             end_date,
@@ -119,7 +164,11 @@ def list_events(
             parsed_categories,
             limit,
             offset,
+            cursor,
+            count,
         )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -4,7 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from api.events import get_authenticated_user_id
-from services.mosaic_service import generate_daily_mosaic, generate_week_mosaic
+from services.mosaic_service import (
+    generate_daily_mosaic_async,
+    generate_month_mosaic_async,
+    generate_week_mosaic_async,
+)
+from services.response_cache import cached_response_async
 
 router = APIRouter()
 
@@ -25,12 +30,14 @@ class DailyMosaic(BaseModel):
 
 
 @router.get("/mosaic/daily", response_model=DailyMosaic)
-def mosaic_daily(
+async def mosaic_daily(
     date: date = Query(...),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return generate_daily_mosaic(user_id, date)
+        return await cached_response_async(
+            user_id, "mosaic.daily", {"date": date}, lambda: generate_daily_mosaic_async(user_id, date)
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -38,12 +45,31 @@ def mosaic_daily(
 
 
 @router.get("/mosaic/week", response_model=list[DailyMosaic])
-def mosaic_week(
+async def mosaic_week(
     start: date = Query(...),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return generate_week_mosaic(user_id, start)
+        return await cached_response_async(
+            user_id, "mosaic.week", {"start": start}, lambda: generate_week_mosaic_async(user_id, start)
+        )
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+
+
+@router.get("/mosaic/month", response_model=list[DailyMosaic])
+async def mosaic_month(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    user_id: str = Depends(get_authenticated_user_id),
+):
+    try:
+        return await cached_response_async(
+            user_id, "mosaic.month", {"month": month}, lambda: generate_month_mosaic_async(user_id, month)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -6,6 +6,7 @@ from pydantic import BaseModel
 
 from api.events import get_authenticated_user_id
 from db.supabase import get_supabase_client
+from services.post_insert_queue import enqueue_post_insert
 from services.habit_negotiator import (
     analyze_cost_impact,
     analyze_health_impact,
@@ -218,7 +219,8 @@ def log_decision(payload: DecisionLogRequest, user_id: str = Depends(get_authent
         },
         "scores": scores,
     }
-    supabase.table("events").insert(event_payload).execute()
+    event_rows = supabase.table("events").insert(event_payload).execute().data or []
+    enqueue_post_insert({**event_payload, "id": event_rows[0].get("id") if event_rows else None})
     return {
         "id": response.data[0].get("id"),
         "message": "Decision logged! Updating your stats...",
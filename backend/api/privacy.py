@@ -8,6 +8,7 @@ from pydantic import BaseModel
 
 from api.events import get_authenticated_user_id
 from db.supabase import get_supabase_client
+from services.social_timeline import refresh_timeline_privacy
 
 router = APIRouter()
 
@@ -64,6 +65,15 @@ def update_privacy_settings(
     payload: PrivacySettingsIn, user_id: str = Depends(get_authenticated_user_id)
 ):
     supabase = _require_supabase()
+    previous = (
+        supabase.table(TABLE_NAME)
+        .select("profile_visibility,activity_sharing")
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+        .data
+        or []
+    )
     update_payload = {
         "user_id": user_id,
         "profile_visibility": payload.profile_visibility,
@@ -71,9 +81,8 @@ def update_privacy_settings(
         "data_analytics_consent": payload.data_analytics_consent,
         "updated_at": datetime.utcnow().isoformat(),
     }
-    response = supabase.table(TABLE_NAME).upsert(update_payload, on_conflict="user_id").execute()
-    if response.error:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(response.error))
+    supabase.table(TABLE_NAME).upsert(update_payload, on_conflict="user_id").execute()
+    refresh_timeline_privacy(user_id, previous[0] if previous else None, update_payload)
     return PrivacySettingsOut(
         profile_visibility=payload.profile_visibility,
         activity_sharing=payload.activity_sharing,
@@ -2,13 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from api.events import get_authenticated_user_id
-from services.risk_scoring import (
-    calculate_burnout_risk,
-    calculate_financial_risk,
-    calculate_injury_risk,
-    calculate_isolation_risk,
-    get_risk_history,
-)
+from services.response_cache import cached_response_async
+from services.risk_scoring import calculate_risk_async, get_risk_history
 
 router = APIRouter()
 
@@ -36,12 +31,14 @@ class RiskHistoryPoint(BaseModel):
 
 
 @router.get("/risk/burnout", response_model=RiskResponse)
-def risk_burnout(
+async def risk_burnout(
     days: int = Query(7, ge=1, le=60),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return calculate_burnout_risk(user_id, days)
+        return await cached_response_async(
+            user_id, "risk.burnout", {"days": days}, lambda: calculate_risk_async(user_id, "burnout", days)
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -49,12 +46,14 @@ def risk_burnout(
 
 
 @router.get("/risk/injury", response_model=RiskResponse)
-def risk_injury(
+async def risk_injury(
     days: int = Query(7, ge=1, le=60),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return calculate_injury_risk(user_id, days)
+        return await cached_response_async(
+            user_id, "risk.injury", {"days": days}, lambda: calculate_risk_async(user_id, "injury", days)
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -62,12 +61,14 @@ def risk_injury(
 
 
 @router.get("/risk/isolation", response_model=RiskResponse)
-def risk_isolation(
+async def risk_isolation(
     days: int = Query(7, ge=1, le=60),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return calculate_isolation_risk(user_id, days)
+        return await cached_response_async(
+            user_id, "risk.isolation", {"days": days}, lambda: calculate_risk_async(user_id, "isolation", days)
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
@@ -75,12 +76,14 @@ def risk_isolation(
 
 
 @router.get("/risk/financial", response_model=RiskResponse)
-def risk_financial(
+async def risk_financial(
     days: int = Query(30, ge=1, le=120),
     user_id: str = Depends(get_authenticated_user_id),
 ):
     try:
-        return calculate_financial_risk(user_id, days)
+        return await cached_response_async(
+            user_id, "risk.financial", {"days": days}, lambda: calculate_risk_async(user_id, "financial", days)
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
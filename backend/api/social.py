@@ -1,14 +1,17 @@
 from datetime import datetime
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 
 from api.events import get_authenticated_user_id
-from db.supabase import get_supabase_client
+from db.supabase import get_async_supabase_client, get_supabase_client
 from services.achievements import get_badge_progress
 from services.alert_service import create_alert
+from services.friend_graph import friend_ids
+from services.post_insert_queue import enqueue_post_insert
 from services.push_service import notify_friend_challenge, notify_goal_milestone
+from services.social_timeline import fan_out_activity, get_social_timeline_async
 
 router = APIRouter()
 
@@ -166,6 +169,16 @@ def _require_supabase():
     return supabase
 
 
+def _require_async_supabase():
+    client = get_async_supabase_client()
+    if client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Supabase client is not configured",
+        )
+    return client
+
+
 def _coerce_list(value: Any) -> list[str]:
     if isinstance(value, list):
         return [str(item) for item in value if item is not None]
@@ -174,38 +187,6 @@ def _coerce_list(value: Any) -> list[str]:
     return [str(value)]
 
 
-def _friend_ids(user_id: str) -> set[str]:
-    supabase = _require_supabase()
-    friends: set[str] = set()
-    direct = (
-        supabase.table("friendships")
-        .select("friend_id")
-        .eq("user_id", user_id)
-        .eq("status", "accepted")
-        .execute()
-        .data
-        or []
-    )
-    reverse = (
-        supabase.table("friendships")
-        .select("user_id")
-        .eq("friend_id", user_id)
-        .eq("status", "accepted")
-        .execute()
-        .data
-        or []
-    )
-    for row in direct:
-        fid = row.get("friend_id")
-        if fid:
-            friends.add(str(fid))
-    for row in reverse:
-        fid = row.get("user_id")
-        if fid:
-            friends.add(str(fid))
-    return friends
-
-
 def _latest_scores(user_id: str) -> dict[str, float]:
     supabase = _require_supabase()
     response = (
@@ -359,16 +340,26 @@ def share_progress(payload: ShareProgressIn, user_id: str = Depends(get_authenti
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to share progress"
         )
     row = response.data[0]
-    supabase.table("user_activities").insert(
-        {
-            "user_id": user_id,
-            "activity_type": "milestone",
-            "title": payload.achievement,
-            "description": payload.message,
-            "metadata": {"goal_id": payload.goal_id, "image": payload.image},
-            "visibility": "friends",
-        }
-    ).execute()
+    enqueue_post_insert({**insert_payload, "id": row.get("id")})
+    friends = friend_ids(user_id)
+    activity = (
+        supabase.table("user_activities")
+        .insert(
+            {
+                "user_id": user_id,
+                "activity_type": "milestone",
+                "title": payload.achievement,
+                "description": payload.message,
+                "metadata": {"goal_id": payload.goal_id, "image": payload.image},
+                "visibility": "friends",
+            }
+        )
+        .execute()
+        .data
+        or []
+    )
+    if activity:
+        fan_out_activity(activity[0], friends)
     if payload.goal_id:
         participant = (
             supabase.table("goal_participants")
@@ -403,7 +394,6 @@ def share_progress(payload: ShareProgressIn, user_id: str = Depends(get_authenti
                     "/social",
                 )
                 notify_goal_milestone(user_id, title, pct)
-    friends = _friend_ids(user_id)
     if friends:
         profile = (
             supabase.table("profiles")
@@ -526,48 +516,30 @@ def challenge_leaderboard(challenge_id: str, user_id: str = Depends(get_authenti
 
 
 @router.get("/social/feed", response_model=list[ActivityFeedEntry])
-def social_feed(limit: int = Query(20, ge=1, le=100), user_id: str = Depends(get_authenticated_user_id)):
-    supabase = _require_supabase()
-    friend_ids = _friend_ids(user_id)
-    if not friend_ids:
-        return []
-    privacy_rows = (
-        supabase.table("privacy_settings")
-        .select("user_id,profile_visibility,activity_sharing")
-        .in_("user_id", list(friend_ids))
-        .execute()
-        .data
-        or []
-    )
-    privacy_map = {str(row.get("user_id")): row for row in privacy_rows}
-    allowed_ids: list[str] = []
-    for fid in friend_ids:
-        settings = privacy_map.get(str(fid))
-        if settings:
-            if settings.get("activity_sharing") is False:
-                continue
-            if settings.get("profile_visibility") == "private":
-                continue
-        allowed_ids.append(str(fid))
-    if not allowed_ids:
-        return []
-    response = (
-        supabase.table("user_activities")
-        .select("user_id,activity_type,title,description,metadata,created_at,visibility")
-        .in_("user_id", allowed_ids)
-        .in_("visibility", ["public", "friends"])
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    rows = response.data or []
+async def social_feed(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    user_id: str = Depends(get_authenticated_user_id),
+):
+    _require_async_supabase()
+    try:
+        page = await get_social_timeline_async(user_id, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        ) from exc
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
     payload: list[ActivityFeedEntry] = []
-    for row in rows:
+    for row in page["entries"]:
         metadata = row.get("metadata") or {}
         reactions = metadata.get("reactions")
         payload.append(
             ActivityFeedEntry(
-                user=row.get("user_id"),
+                user=row.get("actor_id"),
                 activity_type=row.get("activity_type"),
                 title=row.get("title") or "",
                 description=row.get("description"),
@@ -603,6 +575,7 @@ def create_activity(payload: ActivityCreateIn, user_id: str = Depends(get_authen
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create activity"
         )
     row = response.data[0]
+    fan_out_activity(row)
     return ActivityCreateOut(id=row.get("id"), created_at=row.get("created_at"))
 
 
@@ -611,7 +584,7 @@ def achievements_for_user(
     target_user_id: str, user_id: str = Depends(get_authenticated_user_id)
 ):
     if target_user_id != user_id:
-        friends = _friend_ids(user_id)
+        friends = friend_ids(user_id)
         if target_user_id not in friends:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     progress = get_badge_progress(target_user_id)
@@ -620,7 +593,7 @@ def achievements_for_user(
 
 @router.get("/social/compare", response_model=ComparisonOut)
 def compare_friend(friend_id: str, user_id: str = Depends(get_authenticated_user_id)):
-    friends = _friend_ids(user_id)
+    friends = friend_ids(user_id)
     if friend_id not in friends:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Friend not found")
     me = _latest_scores(user_id)
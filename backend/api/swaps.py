@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from api.events import get_authenticated_user_id
 from db.supabase import get_supabase_client
 from models.events import EventCreate
+from services.achievements import record_swap
 from services.event_service import create_event
 from services.food_analyzer import analyze_food_photo
 from services.swap_engine import suggest_all_alternatives
@@ -148,6 +149,7 @@ def accept_swap(payload: SwapAcceptIn, user_id: str = Depends(get_authenticated_
     response = supabase.table("swap_history").insert(insert_payload).execute()
     if not response.data:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to log swap")
+    record_swap(user_id)
 
     alternative = payload.alternative_data or {}
     calories = alternative.get("calories")
@@ -1,11 +1,19 @@
 from datetime import datetime
+from typing import AsyncIterator, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from middleware.api_auth import ApiKeyContext, require_api_key, require_scope
 from models.events import EventCategory, EventCreate, EventMetadata, EventOut, EventScores, EventType
-from services.event_service import create_event, get_events
+from services.event_service import (
+    CountMode,
+    create_event,
+    create_events_bulk,
+    get_events_async,
+    stream_events_async,
+)
 
 router = APIRouter(prefix="/v1")
 
@@ -20,27 +28,59 @@ class EventCreateIn(BaseModel):
     scores: EventScores | dict | None = None
 
 
+class EventBulkIn(BaseModel):
+    events: list[EventCreateIn] = Field(..., min_length=1, max_length=500)
+
+
+class EventBulkOut(BaseModel):
+    created: int
+    events: list[EventOut]
+
+
 class EventListOut(BaseModel):
     events: list[EventOut]
-    total: int
+    total: int | None = None
     has_more: bool
+    next_cursor: str | None = None
+
+
+async def _ndjson_lines(first: EventOut | None, events) -> AsyncIterator[str]:
+    if first is None:
+        return
+    yield first.model_dump_json() + "\n"
+    async for event in events:
+        yield event.model_dump_json() + "\n"
 
 
 @router.get("/events", response_model=EventListOut)
-def list_events(
+async def list_events(
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
     types: str | None = Query(None),
     categories: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    count: CountMode | None = Query(None),
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
     context: ApiKeyContext = Depends(require_api_key),
 ):
     try:
         require_scope(context, "events")
         parsed_types = [item.strip() for item in (types or "").split(",") if item.strip()] or None
         parsed_categories = [item.strip() for item in (categories or "").split(",") if item.strip()] or None
-        return get_events(
+        if output_format == "ndjson":
+            events = stream_events_async(
+                context.user_id,
+                start_date,
+                end_date,
+                parsed_types,
+                parsed_categories,
+                cursor,
+            )
+            first = await anext(events, None)
+            return StreamingResponse(_ndjson_lines(first, events), media_type="application/x-ndjson")
+        return await get_events_async(
             context.user_id,
             start_date,
             end_date,
@@ -48,9 +88,13 @@ def list_events(
             parsed_categories,
             limit,
             offset,
+            cursor,
+            count,
         )
     except HTTPException:
         raise
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
 
@@ -74,3 +118,28 @@ def create_event_v1(payload: EventCreateIn, context: ApiKeyContext = Depends(req
         raise
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+
+
+@router.post("/events/bulk", response_model=EventBulkOut)
+def create_events_bulk_v1(payload: EventBulkIn, context: ApiKeyContext = Depends(require_api_key)):
+    try:
+        require_scope(context, "events")
+        events = [
+            EventCreate(
+                user_id=context.user_id,
+                event_type=item.event_type,
+                category=item.category,
+                title=item.title,
+                timestamp=item.timestamp or datetime.utcnow(),
+                amount=item.amount,
+                metadata=item.metadata,
+                scores=item.scores,
+            )
+            for item in payload.events
+        ]
+        created = create_events_bulk(events)
+        return {"created": len(created), "events": created}
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+BENCH_USER_ID = "00000000-0000-0000-0000-000000000001"
+BENCH_SERVICE_KEY = "bench.bench.bench"
+ENDPOINTS = {
+    "events": ("/bench/sync/events", "/api/events?limit=50"),
+    "dashboard": ("/bench/sync/dashboard", "/api/analytics/dashboard-stats?period=week"),
+    "mosaic_week": ("/bench/sync/mosaic-week", f"/api/mosaic/week?start={datetime.utcnow().date().isoformat()}"),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _mock_rows(table: str, limit: int, select: str) -> list[dict[str, Any]]:
+    now = datetime.utcnow()
+    aliases = [part.split(":", 1)[0] for part in select.split(",") if ":" in part]
+    rows = []
+    for index in range(limit):
+        row: dict[str, Any] = {
+            "id": f"00000000-0000-0000-0000-{index:012d}",
+            "user_id": BENCH_USER_ID,
+            "timestamp": (now - timedelta(minutes=index * 7)).isoformat(),
+            "created_at": now.isoformat(),
+            "event_type": ("spending", "food", "social", "sleep")[index % 4],
+            "category": "finance",
+            "title": f"Bench event {index}",
+            "amount": float(index % 40),
+            "metadata": {"duration_minutes": 30},
+            "scores": {"wellness_impact": 1.5},
+            "date": now.date().isoformat(),
+            "steps": 4000,
+            "workout_count": 1,
+            "active_minutes": 30,
+            "total_movement_score": 60,
+            "duration_minutes": 45,
+        }
+        row.update({alias: None for alias in aliases})
+        rows.append(row)
+    return rows
+
+
+def build_mock_postgrest(latency: float, rows: int) -> Starlette:
+    pages: dict[tuple[str, int, str], list[dict[str, Any]]] = {}
+
+    async def table(request: Request) -> JSONResponse:
+        await asyncio.sleep(latency)
+        limit = min(rows, int(request.query_params.get("limit") or rows))
+        key = (request.path_params["table"], limit, request.query_params.get("select", "*"))
+        if key not in pages:
+            pages[key] = _mock_rows(*key)
+        return JSONResponse(pages[key])
+
+    return Starlette(routes=[Route("/rest/v1/{table}", table)])
+
+
+def _run_mock_postgrest(latency: float, rows: int, port: int) -> None:
+    uvicorn.run(build_mock_postgrest(latency, rows), host="127.0.0.1", port=port, log_level="warning")
+
+
+def _start_mock_postgrest(latency: float, rows: int) -> tuple[multiprocessing.Process, int]:
+    port = _free_port()
+    process = multiprocessing.Process(target=_run_mock_postgrest, args=(latency, rows, port), daemon=True)
+    process.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("Mock PostgREST server did not start")
+
+
+def build_bench_app():
+    from fastapi import Header
+
+    from main import app
+    from services.analytics_service import get_dashboard_stats
+    from services.event_service import get_events
+    from services.mosaic_service import generate_week_mosaic
+
+    @app.get("/bench/sync/events")
+    def sync_events(x_user_id: str = Header(...)):
+        return get_events(x_user_id, limit=50)
+
+    @app.get("/bench/sync/dashboard")
+    def sync_dashboard(x_user_id: str = Header(...)):
+        return get_dashboard_stats(x_user_id, "week")
+
+    @app.get("/bench/sync/mosaic-week")
+    def sync_mosaic_week(x_user_id: str = Header(...)):
+        return generate_week_mosaic(x_user_id, datetime.utcnow().date())
+
+    return app
+
+
+def _serve(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", loop="asyncio"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def _load(base_url: str, path: str, requests: int, concurrency: int) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+    slots = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def _one() -> None:
+            nonlocal errors
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(path, headers={"X-User-Id": BENCH_USER_ID})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def run_load_test(
+    latency: float = 0.05,
+    rows: int = 50,
+    requests: int = 400,
+    concurrency: int = 200,
+) -> list[dict[str, Any]]:
+    mock, mock_port = _start_mock_postgrest(latency, rows)
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{mock_port}"
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = BENCH_SERVICE_KEY
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    app_port = _free_port()
+    _serve(build_bench_app(), app_port)
+    base_url = f"http://127.0.0.1:{app_port}"
+    results = []
+    try:
+        for name, (sync_path, async_path) in ENDPOINTS.items():
+            for mode, path in (("sync", sync_path), ("async", async_path)):
+                result = asyncio.run(_load(base_url, path, requests, concurrency))
+                results.append({"endpoint": name, "mode": mode, **result})
+    finally:
+        mock.terminate()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async routes against a mock PostgREST server.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock PostgREST latency per query in seconds.")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'endpoint':<14}{'mode':<7}{'req':>6}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for item in run_load_test(args.latency, args.rows, args.requests, args.concurrency):
+        print(
+            f"{item['endpoint']:<14}{item['mode']:<7}{item['requests']:>6}{item['errors']:>5}"
+            f"{item['rps']:>9}{item['p50_ms']:>9}{item['p95_ms']:>9}"
+        )
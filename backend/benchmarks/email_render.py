@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from services import email_service
+from services.email_templates import get_template
+
+SUMMARIES = 10_000
+
+
+def build_summaries(count: int = SUMMARIES, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    summaries = []
+    for index in range(count):
+        summaries.append(
+            {
+                "week_start": "2026-10-12",
+                "week_end": "2026-10-18",
+                "savings_total": round(rng.uniform(0, 120), 2),
+                "spending_total": round(rng.uniform(50, 900), 2),
+                "spending_vs_budget": round(rng.uniform(-30, 30), 2),
+                "wellness_change": round(rng.uniform(-10, 10), 2),
+                "sustainability_total": round(rng.uniform(0, 25), 2),
+                "insights": [
+                    {"title": f"Insight {item}", "message": f"User {index} did <better> & more"}
+                    for item in range(rng.randint(0, 3))
+                ],
+                "goals": [
+                    {"title": f"Goal {item}", "pct": rng.randint(0, 100), "current": rng.randint(0, 50), "target": 50}
+                    for item in range(rng.randint(0, 4))
+                ],
+                "friends": [
+                    {"title": f"Friend {item}", "description": "Earned a badge"} for item in range(rng.randint(0, 3))
+                ],
+            }
+        )
+    return summaries
+
+
+def _render_all(summaries: list[dict[str, Any]]) -> tuple[float, int]:
+    started = time.perf_counter()
+    size = 0
+    for summary in summaries:
+        size += len(email_service._render_template(summary))
+    return time.perf_counter() - started, size
+
+
+def run_render_benchmark(count: int = SUMMARIES) -> list[dict[str, Any]]:
+    summaries = build_summaries(count)
+    results = []
+    for mode in ("uncached", "cached"):
+        if mode == "uncached":
+            get_template.cache_clear()
+            email_service.get_template = get_template.__wrapped__
+        else:
+            email_service.get_template = get_template
+        try:
+            elapsed, size = _render_all(summaries)
+        finally:
+            email_service.get_template = get_template
+        results.append(
+            {
+                "mode": mode,
+                "summaries": count,
+                "seconds": round(elapsed, 3),
+                "us_per_summary": round(elapsed / count * 1_000_000, 1),
+                "per_second": round(count / elapsed),
+                "avg_bytes": size // count,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time weekly summary rendering with and without the template cache.")
+    parser.add_argument("--summaries", type=int, default=SUMMARIES)
+    args = parser.parse_args()
+    print(f"{'mode':<10}{'count':>8}{'secs':>9}{'us/each':>10}{'per sec':>10}{'bytes':>8}")
+    for item in run_render_benchmark(args.summaries):
+        print(
+            f"{item['mode']:<10}{item['summaries']:>8}{item['seconds']:>9}{item['us_per_summary']:>10}"
+            f"{item['per_second']:>10}{item['avg_bytes']:>8}"
+        )
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+from db.supabase import get_supabase_client
+from services.analytics_service import ANALYTICS_EVENT_PROJECTION, SNAPSHOT_EVENT_PROJECTION
+from services.daily_rollups import ROLLUP_EVENT_PROJECTION
+from services.email_service import WEEKLY_EVENT_PROJECTION
+from services.event_query import EVENTS_TABLE, FULL_EVENT, EventProjection
+from services.pattern_detection import PATTERN_EVENT_PROJECTION
+from services.risk_scoring import RISK_EVENT_PROJECTION
+
+SEED_EVENTS = 50_000
+SEED_BATCH = 500
+PAGE_SIZE = 1000
+PROJECTIONS = {
+    "select *": FULL_EVENT,
+    "analytics": ANALYTICS_EVENT_PROJECTION,
+    "snapshot": SNAPSHOT_EVENT_PROJECTION,
+    "rollup": ROLLUP_EVENT_PROJECTION,
+    "risk": RISK_EVENT_PROJECTION,
+    "patterns": PATTERN_EVENT_PROJECTION,
+    "weekly_email": WEEKLY_EVENT_PROJECTION,
+}
+EVENT_TYPES = ("spending", "food", "movement", "sleep", "mood", "social", "habit", "work")
+
+
+def seed_events(user_id: str, count: int = SEED_EVENTS, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for index in range(count):
+        event_type = rng.choice(EVENT_TYPES)
+        metadata: dict[str, Any] = {
+            "source": rng.choice(["manual", "plaid", "calendar", "voice"]),
+            "notes": " ".join(rng.choice(["coffee", "lunch", "walk", "gym", "bus", "call"]) for _ in range(12)),
+            "location": rng.choice(["home", "office", "cafe", "gym"]),
+            "duration_minutes": rng.randint(5, 120),
+        }
+        if event_type == "spending":
+            metadata.update(
+                category=rng.choice(["Food", "Transport", "Rent", "Fun"]),
+                merchant=f"Merchant {rng.randint(1, 400)}",
+                items=[{"name": f"item-{rng.randint(1, 99)}", "price": round(rng.uniform(1, 30), 2)} for _ in range(4)],
+                current_balance=round(rng.uniform(-200, 5000), 2),
+            )
+        if event_type == "food":
+            metadata.update(
+                nutrition_quality_score=round(rng.uniform(1, 10), 1),
+                ingredients=[f"ingredient-{rng.randint(1, 300)}" for _ in range(8)],
+            )
+        rows.append(
+            {
+                "id": str(uuid4()),
+                "user_id": user_id,
+                "timestamp": (now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))).isoformat(),
+                "created_at": now.isoformat(),
+                "event_type": event_type,
+                "category": rng.choice(["finance", "health", "social", "productivity"]),
+                "title": f"{event_type.title()} entry {index}",
+                "amount": round(rng.uniform(0, 150), 2),
+                "metadata": metadata,
+                "scores": {
+                    "wallet_impact": round(rng.uniform(-10, 10), 2),
+                    "wellness_impact": round(rng.uniform(-10, 10), 2),
+                    "sustainability_impact": round(rng.uniform(-10, 10), 2),
+                    "explanation": "Scored by ruleset v1 using category, amount and keywords.",
+                },
+            }
+        )
+    return rows
+
+
+def _server_project(row: dict[str, Any], projection: EventProjection) -> dict[str, Any]:
+    projected = {column: row.get(column) for column in projection.columns}
+    for column, keys in (("metadata", projection.metadata_keys), ("scores", projection.scores_keys)):
+        source = row.get(column) or {}
+        for key in keys:
+            projected[f"{column}__{key}"] = source.get(key)
+    return projected
+
+
+def run_offline(rows: list[dict[str, Any]], repeats: int = 3) -> list[dict[str, Any]]:
+    results = []
+    for name, projection in PROJECTIONS.items():
+        body = json.dumps([_server_project(row, projection) for row in rows]).encode("utf-8")
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            shaped = [projection.shape(row) for row in json.loads(body)]
+            timings.append(time.perf_counter() - started)
+        results.append({"projection": name, "bytes": len(body), "seconds": min(timings), "rows": len(shaped)})
+    return results
+
+
+def run_live(user_id: str, repeats: int = 3) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    results = []
+    for name, projection in PROJECTIONS.items():
+        paged = projection.with_columns("id")
+        timings = []
+        size = 0
+        count = 0
+        for _ in range(repeats):
+            started = time.perf_counter()
+            size = 0
+            count = 0
+            after = None
+            while True:
+                query = supabase.table(EVENTS_TABLE).select(paged.select_clause()).eq("user_id", user_id)
+                if after:
+                    query = query.gt("id", after)
+                rows = query.order("id", desc=False).limit(PAGE_SIZE).execute().data or []
+                size += len(json.dumps(rows).encode("utf-8"))
+                count += len([paged.shape(row) for row in rows])
+                if len(rows) < PAGE_SIZE:
+                    break
+                after = rows[-1]["id"]
+            timings.append(time.perf_counter() - started)
+        results.append({"projection": name, "bytes": size, "seconds": min(timings), "rows": count})
+    return results
+
+
+def seed_live(user_id: str, count: int) -> None:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    rows = seed_events(user_id, count)
+    for row in rows:
+        row.pop("created_at")
+    for start in range(0, len(rows), SEED_BATCH):
+        supabase.table(EVENTS_TABLE).insert(rows[start : start + SEED_BATCH]).execute()
+
+
+def _report(results: list[dict[str, Any]]) -> None:
+    baseline = results[0]
+    print(f"{'projection':<14}{'rows':>8}{'payload MB':>12}{'vs *':>8}{'seconds':>10}{'vs *':>8}")
+    for item in results:
+        print(
+            f"{item['projection']:<14}{item['rows']:>8}{item['bytes'] / 1_000_000:>12.2f}"
+            f"{item['bytes'] / baseline['bytes']:>8.0%}{item['seconds']:>10.3f}"
+            f"{item['seconds'] / max(baseline['seconds'], 1e-9):>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare events payload size and latency per projection.")
+    parser.add_argument("--events", type=int, default=SEED_EVENTS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--live-user", help="Benchmark against Supabase for this user id instead of offline.")
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic events for --live-user first.")
+    args = parser.parse_args()
+    if args.live_user:
+        if args.seed:
+            seed_live(args.live_user, args.events)
+        _report(run_live(args.live_user, args.repeats))
+    else:
+        _report(run_offline(seed_events("benchmark-user", args.events), args.repeats))
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+BENCH_SERVICE_KEY = "bench.bench.bench"
+KEYSET_AFTER = re.compile(r'timestamp\.gt\."([^"]+)",and\(timestamp\.eq\."[^"]+",id\.gt\.([^)]+)\)')
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _bench_user_id(index: int) -> str:
+    return f"00000000-0000-0000-0000-{index:012d}"
+
+
+def _filter_values(request: Request, column: str) -> list[str] | None:
+    raw = request.query_params.get(column)
+    if not raw:
+        return None
+    operator, _, value = raw.partition(".")
+    if operator == "eq":
+        return [value]
+    if operator == "in":
+        return [item.strip('"') for item in value.strip("()").split(",") if item]
+    return None
+
+
+def _mock_rows(table: str, owner: str, rows: int, now: datetime) -> list[dict[str, Any]]:
+    result = []
+    for index in range(rows):
+        timestamp = now - timedelta(hours=index * 5)
+        result.append(
+            {
+                "id": f"{owner}-{table}-{index}",
+                "user_id": owner,
+                "friend_id": owner,
+                "goal_id": f"goal-{index % 3}",
+                "status": "accepted",
+                "timestamp": timestamp.isoformat(),
+                "created_at": timestamp.isoformat(),
+                "date": timestamp.date().isoformat(),
+                "event_type": ("spending", "food", "social", "sleep")[index % 4],
+                "category": "finance",
+                "title": f"Bench row {index}",
+                "message": "Bench message",
+                "description": "Bench activity",
+                "activity_type": "achievement",
+                "amount": float(index % 40),
+                "metadata": {"money_saved_via_swaps": 1.5},
+                "scores": {"wellness_impact": 1.5, "sustainability_impact": 0.4},
+                "steps": 4000,
+                "active_minutes": 30,
+                "contribution": 5,
+                "target_value": 100,
+                "current_value": 40,
+                "email_enabled": True,
+                "frequency": "weekly",
+            }
+        )
+    return result
+
+
+def build_mock_backend(latency: float, users: int, rows: int) -> Starlette:
+    recipients = [_bench_user_id(index) for index in range(users)]
+
+    async def table(request: Request) -> JSONResponse:
+        await asyncio.sleep(latency)
+        name = request.path_params["table"]
+        now = datetime.utcnow()
+        if name == "notification_preferences":
+            after = (request.query_params.get("user_id") or "").removeprefix("gt.")
+            owners = [user_id for user_id in recipients if user_id > after]
+            data = [{"user_id": user_id} for user_id in owners]
+        elif name == "shared_goals":
+            data = [
+                {"id": goal_id, "title": goal_id, "target_value": 100, "current_value": 40, "end_date": None}
+                for goal_id in _filter_values(request, "id") or []
+            ]
+        else:
+            owners = _filter_values(request, "user_id") or _filter_values(request, "friend_id") or []
+            data = [row for owner in owners for row in _mock_rows(name, owner, rows, now)]
+            cursor = KEYSET_AFTER.search(request.query_params.get("or") or "")
+            if cursor:
+                data = sorted(data, key=lambda row: (row["timestamp"], row["id"]))
+                data = [row for row in data if (row["timestamp"], row["id"]) > cursor.groups()]
+        offset = int(request.query_params.get("offset") or 0)
+        limit = request.query_params.get("limit")
+        data = data[offset : offset + int(limit)] if limit else data[offset:]
+        return JSONResponse(data)
+
+    async def admin_user(request: Request) -> JSONResponse:
+        await asyncio.sleep(latency)
+        user_id = request.path_params["user_id"]
+        return JSONResponse(
+            {
+                "id": user_id,
+                "aud": "authenticated",
+                "email": f"{user_id}@bench.local",
+                "app_metadata": {},
+                "user_metadata": {},
+                "created_at": datetime.utcnow().isoformat(),
+            }
+        )
+
+    return Starlette(
+        routes=[
+            Route("/rest/v1/{table}", table),
+            Route("/auth/v1/admin/users/{user_id}", admin_user),
+        ]
+    )
+
+
+def _run_mock_backend(latency: float, users: int, rows: int, port: int) -> None:
+    uvicorn.run(build_mock_backend(latency, users, rows), host="127.0.0.1", port=port, log_level="warning")
+
+
+def _start_mock_backend(latency: float, users: int, rows: int) -> tuple[multiprocessing.Process, int]:
+    port = _free_port()
+    process = multiprocessing.Process(target=_run_mock_backend, args=(latency, users, rows, port), daemon=True)
+    process.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("Mock backend did not start")
+
+
+class SMTPSink:
+    def __init__(self, connect_latency: float) -> None:
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.messages = 0
+        self.port = _free_port()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_latency)
+        writer.write(b"220 bench ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode("utf-8", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250-bench\r\n250 8BITMIME\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                self.messages += 1
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    def start(self) -> "SMTPSink":
+        async def _serve() -> None:
+            server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+            self._ready.set()
+            async with server:
+                await server.serve_forever()
+
+        threading.Thread(target=self._loop.run_until_complete, args=(_serve(),), daemon=True).start()
+        self._ready.wait(10)
+        return self
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.messages = 0
+
+
+def _legacy(users: int) -> dict[str, Any]:
+    from services.email_service import send_weekly_email
+
+    statuses: dict[str, int] = {}
+    for index in range(users):
+        status = send_weekly_email(_bench_user_id(index)).get("status", "skipped")
+        statuses[status] = statuses.get(status, 0) + 1
+    return {"sent": statuses.get("sent", 0)}
+
+
+def _pipeline(workers: int, batch_size: int) -> dict[str, Any]:
+    from jobs.weekly_email_cron import run_weekly_emails
+
+    result = run_weekly_emails(workers=workers, batch_size=batch_size, checkpoint_path=None)
+    return {"sent": result["sent"]}
+
+
+def run_pipeline_benchmark(
+    users: int = 200,
+    rows: int = 20,
+    latency: float = 0.02,
+    smtp_connect_latency: float = 0.05,
+    workers: int = 4,
+    batch_size: int = 50,
+) -> list[dict[str, Any]]:
+    mock, mock_port = _start_mock_backend(latency, users, rows)
+    sink = SMTPSink(smtp_connect_latency).start()
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{mock_port}"
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = BENCH_SERVICE_KEY
+    os.environ["SMTP_HOST"] = "127.0.0.1"
+    os.environ["SMTP_PORT"] = str(sink.port)
+    os.environ["SMTP_USE_TLS"] = "false"
+    os.environ.pop("SMTP_USERNAME", None)
+    os.environ.pop("SMTP_PASSWORD", None)
+    results = []
+    try:
+        for mode, run in (("legacy", lambda: _legacy(users)), ("pipeline", lambda: _pipeline(workers, batch_size))):
+            sink.reset()
+            started = time.perf_counter()
+            outcome = run()
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "mode": mode,
+                    "users": users,
+                    "sent": outcome["sent"],
+                    "smtp_connections": sink.connections,
+                    "smtp_messages": sink.messages,
+                    "seconds": round(elapsed, 2),
+                    "per_second": round(users / elapsed, 1),
+                }
+            )
+    finally:
+        mock.terminate()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the per-user weekly email loop with the batched pipeline.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=20, help="Mock rows returned per user per table.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock backend latency per request in seconds.")
+    parser.add_argument("--smtp-connect-latency", type=float, default=0.05, help="SMTP greeting delay in seconds.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    print(f"{'mode':<10}{'users':>7}{'sent':>7}{'conns':>7}{'msgs':>7}{'secs':>8}{'users/s':>9}")
+    for item in run_pipeline_benchmark(
+        args.users, args.rows, args.latency, args.smtp_connect_latency, args.workers, args.batch_size
+    ):
+        print(
+            f"{item['mode']:<10}{item['users']:>7}{item['sent']:>7}{item['smtp_connections']:>7}"
+            f"{item['smtp_messages']:>7}{item['seconds']:>8}{item['per_second']:>9}"
+        )
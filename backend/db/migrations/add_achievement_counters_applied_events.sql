@@ -0,0 +1,2 @@
+alter table public.achievement_counters
+  add column if not exists applied_event_ids jsonb not null default '[]'::jsonb;
@@ -0,0 +1,11 @@
+create table if not exists public.achievement_counters (
+  user_id uuid primary key references auth.users(id) on delete cascade,
+  savings_total numeric not null default 0,
+  co2_total numeric not null default 0,
+  swap_count integer not null default 0,
+  streak_days integer not null default 0,
+  last_active_date date,
+  wellness_recent jsonb not null default '{}'::jsonb,
+  earned_badges jsonb not null default '{}'::jsonb,
+  updated_at timestamptz not null default now()
+);
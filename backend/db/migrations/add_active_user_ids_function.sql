@@ -0,0 +1,18 @@
+create index if not exists events_user_timestamp_idx on public.events(user_id, timestamp);
+
+create or replace function public.active_user_ids(
+  since timestamptz,
+  after_id uuid default null,
+  page_size int default 1000
+)
+returns table (user_id uuid)
+language sql
+stable
+as $$
+  select distinct e.user_id
+  from public.events e
+  where e.timestamp >= since
+    and (after_id is null or e.user_id > after_id)
+  order by e.user_id
+  limit page_size;
+$$;
@@ -0,0 +1,21 @@
+create table if not exists public.daily_rollups (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users(id) on delete cascade,
+  date date not null,
+  event_count integer not null default 0,
+  spending_total numeric not null default 0,
+  spending_count integer not null default 0,
+  wellness_sum numeric not null default 0,
+  wellness_count integer not null default 0,
+  sustainability_sum numeric not null default 0,
+  sustainability_count integer not null default 0,
+  movement_minutes numeric not null default 0,
+  movement_count integer not null default 0,
+  spending_by_category jsonb not null default '{}'::jsonb,
+  food_quality jsonb not null default '{}'::jsonb,
+  activity_minutes jsonb not null default '{}'::jsonb,
+  updated_at timestamptz not null default now(),
+  unique (user_id, date)
+);
+
+create index if not exists daily_rollups_user_date_idx on public.daily_rollups(user_id, date);
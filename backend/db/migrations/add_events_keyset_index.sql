@@ -0,0 +1 @@
+create index if not exists events_user_timestamp_id_idx on public.events(user_id, timestamp desc, id desc);
@@ -0,0 +1,3 @@
+alter table public.mosaic_snapshots
+  add column if not exists stale boolean not null default false,
+  add column if not exists invalidation_id text;
@@ -0,0 +1,13 @@
+create table if not exists public.mosaic_snapshots (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users(id) on delete cascade,
+  date date not null,
+  version integer not null default 1,
+  overall_score numeric not null default 0,
+  story text not null default '',
+  tiles jsonb not null default '[]'::jsonb,
+  updated_at timestamptz not null default now(),
+  unique (user_id, date)
+);
+
+create index if not exists mosaic_snapshots_user_date_idx on public.mosaic_snapshots(user_id, date);
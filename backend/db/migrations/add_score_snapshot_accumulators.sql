@@ -0,0 +1,9 @@
+alter table public.score_snapshots
+  add column if not exists spend_total numeric,
+  add column if not exists income_total numeric,
+  add column if not exists wellness_sum numeric,
+  add column if not exists wellness_count integer,
+  add column if not exists sustainability_sum numeric,
+  add column if not exists sustainability_count integer;
+
+create index if not exists score_snapshots_date_idx on public.score_snapshots(date);
@@ -0,0 +1,5 @@
+create table if not exists public.social_timeline_sources (
+  owner_id uuid primary key references auth.users(id) on delete cascade,
+  actor_ids jsonb not null default '[]'::jsonb,
+  synced_at timestamptz not null default now()
+);
@@ -0,0 +1,15 @@
+create table if not exists public.social_timelines (
+  owner_id uuid not null references auth.users(id) on delete cascade,
+  activity_id uuid not null references public.user_activities(id) on delete cascade,
+  actor_id uuid not null references auth.users(id) on delete cascade,
+  activity_type text not null,
+  title text not null default '',
+  description text,
+  metadata jsonb not null default '{}'::jsonb,
+  created_at timestamptz not null,
+  primary key (owner_id, activity_id)
+);
+
+create index if not exists social_timelines_owner_time_idx
+  on public.social_timelines(owner_id, created_at desc, activity_id desc);
+create index if not exists social_timelines_actor_idx on public.social_timelines(actor_id);
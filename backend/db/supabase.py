@@ -1,9 +1,90 @@
+import asyncio
 import os
 from functools import lru_cache
 from typing import Optional
 
+import httpx
+from postgrest import DEFAULT_POSTGREST_CLIENT_HEADERS, AsyncPostgrestClient
 from supabase import Client, create_client
 
+ASYNC_POOL_SIZE = max(1, int(os.getenv("SUPABASE_ASYNC_POOL_SIZE", "40")))
+ASYNC_POOL_SHARD_SIZE = max(1, int(os.getenv("SUPABASE_ASYNC_POOL_SHARD_SIZE", "10")))
+ASYNC_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_ASYNC_TIMEOUT_SECONDS", "30"))
+
+_async_clients: dict[asyncio.AbstractEventLoop, AsyncPostgrestClient] = {}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class ShardedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, pool_size: int, shard_size: int, http2: bool = False, verify: bool = True) -> None:
+        shard_size = min(shard_size, pool_size)
+        shards = max(1, pool_size // shard_size)
+        limits = httpx.Limits(max_connections=shard_size, max_keepalive_connections=shard_size)
+        self._shards = [httpx.AsyncHTTPTransport(limits=limits, http2=http2, verify=verify) for _ in range(shards)]
+        self._slots = [asyncio.Semaphore(shard_size) for _ in range(shards)]
+        self._in_flight = [0] * shards
+
+    def _release(self, index: int) -> None:
+        self._in_flight[index] -= 1
+        self._slots[index].release()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        index = min(range(len(self._shards)), key=self._in_flight.__getitem__)
+        self._in_flight[index] += 1
+        try:
+            await self._slots[index].acquire()
+        except BaseException:
+            self._in_flight[index] -= 1
+            raise
+        try:
+            response = await self._shards[index].handle_async_request(request)
+        except BaseException:
+            self._release(index)
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, lambda: self._release(index)),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        for shard in self._shards:
+            await shard.aclose()
+
+
+class PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout, verify=True) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=ShardedAsyncTransport(
+                ASYNC_POOL_SIZE,
+                ASYNC_POOL_SHARD_SIZE,
+                http2=base_url.startswith("https://"),
+                verify=verify,
+            ),
+        )
+
 
 @lru_cache(maxsize=1)
 def get_supabase_client() -> Optional[Client]:
@@ -12,3 +93,32 @@ def get_supabase_client() -> Optional[Client]:
     if not supabase_url or not supabase_key:
         return None
     return create_client(supabase_url, supabase_key)
+
+
+def get_async_supabase_client() -> Optional[AsyncPostgrestClient]:
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not supabase_url or not supabase_key:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        for stale in [item for item in _async_clients if item.is_closed()]:
+            _async_clients.pop(stale, None)
+        client = PooledAsyncPostgrestClient(
+            f"{supabase_url.rstrip('/')}/rest/v1",
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apikey": supabase_key,
+                "Authorization": f"Bearer {supabase_key}",
+            },
+            timeout=ASYNC_TIMEOUT_SECONDS,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_supabase_client() -> None:
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date
+from typing import Any
+
+from jobs.job_runtime import JobCheckpoint, log_job_summary, map_users, require_supabase, run_user_batches
+from services.analytics_service import iter_active_user_ids
+from services.daily_rollups import rebuild_daily_rollups
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 100
+DEFAULT_CHECKPOINT_PATH = os.getenv("ROLLUP_BACKFILL_CHECKPOINT_PATH", "/tmp/lifemosaic_rollup_checkpoint.json")
+
+
+def run_rollup_backfill(
+    since: date | None = None,
+    workers: int = 4,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+) -> dict[str, Any]:
+    require_supabase()
+    checkpoint = JobCheckpoint(checkpoint_path)
+    since_key = since.isoformat() if since else None
+    if checkpoint.state.get("since") != since_key:
+        checkpoint.state = {"since": since_key}
+    days = 0
+
+    def _process(pool, batch: list[str]) -> list[dict[str, Any]]:
+        nonlocal days
+        results = map_users(pool, lambda user_id: {"days": rebuild_daily_rollups(user_id, since)}, batch)
+        days += sum(item.get("days", 0) for item in results)
+        return results
+
+    result = run_user_batches(
+        "rollup_backfill",
+        checkpoint,
+        lambda after: iter_active_user_ids(since or date(1970, 1, 1), after=after),
+        _process,
+        workers=workers,
+        batch_size=batch_size,
+    )
+    result = {**result, "days": days}
+    log_job_summary(logger, "rollup_backfill", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    since_value = os.getenv("ROLLUP_BACKFILL_SINCE")
+    run_rollup_backfill(
+        since=date.fromisoformat(since_value) if since_value else None,
+        workers=int(os.getenv("ROLLUP_BACKFILL_WORKERS", "4")),
+    )
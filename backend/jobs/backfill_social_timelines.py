@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date
+from typing import Any
+
+from jobs.job_runtime import JobCheckpoint, log_job_summary, map_users, require_supabase, run_user_batches
+from services.analytics_service import iter_active_user_ids
+from services.friend_graph import friend_ids_for_users
+from services.social_timeline import rebuild_social_timeline
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 100
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "SOCIAL_TIMELINE_BACKFILL_CHECKPOINT_PATH", "/tmp/lifemosaic_social_timeline_checkpoint.json"
+)
+
+
+def run_timeline_backfill(
+    workers: int = 4,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+) -> dict[str, Any]:
+    require_supabase()
+    entries = 0
+
+    def _process(pool, batch: list[str]) -> list[dict[str, Any]]:
+        nonlocal entries
+        friend_ids_for_users(batch)
+        results = map_users(pool, lambda user_id: {"entries": rebuild_social_timeline(user_id)}, batch)
+        entries += sum(item.get("entries", 0) for item in results)
+        return results
+
+    result = run_user_batches(
+        "social_timeline_backfill",
+        JobCheckpoint(checkpoint_path),
+        lambda after: iter_active_user_ids(date(1970, 1, 1), after=after),
+        _process,
+        workers=workers,
+        batch_size=batch_size,
+    )
+    result = {**result, "entries": entries}
+    log_job_summary(logger, "social_timeline_backfill", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_timeline_backfill(workers=int(os.getenv("SOCIAL_TIMELINE_BACKFILL_WORKERS", "4")))
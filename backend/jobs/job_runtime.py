@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from db.supabase import get_supabase_client
+from services.batch_fetch import chunked
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FIELDS = frozenset(
+    {"done", "total", "users", "failed", "timings", "user_cursor", "elapsed_seconds", "per_second", "eta_seconds"}
+)
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float | None, burst: float | None = None) -> None:
+        self.rate = rate_per_second if rate_per_second and rate_per_second > 0 else None
+        self.capacity = burst or (self.rate or 0.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        if self.rate is None or amount <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class JobCheckpoint:
+    def __init__(self, path: str | Path | None, flush_interval: float = 5.0) -> None:
+        self.path = Path(path) if path else None
+        self.flush_interval = flush_interval
+        self.state: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._flushed = 0.0
+        if self.path is not None and self.path.exists():
+            with self.path.open("r", encoding="utf-8") as file:
+                self.state = json.load(file)
+
+    def update(self, force: bool = False, **values: Any) -> None:
+        with self._lock:
+            self.state.update(values)
+            if force or time.monotonic() - self._flushed >= self.flush_interval:
+                self._write()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        self._flushed = time.monotonic()
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            json.dump(self.state, file, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ProgressMeter:
+    def __init__(self, name: str, total: int | None = None, report_interval: float = 10.0) -> None:
+        self.name = name
+        self.total = total
+        self.report_interval = report_interval
+        self.done = 0
+        self.started = time.monotonic()
+        self._reported = self.started
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.done += count
+            now = time.monotonic()
+            if now - self._reported < self.report_interval:
+                return
+            self._reported = now
+        snapshot = self.snapshot()
+        logger.info(
+            "%s: %d/%s done, %.1f/s, eta %s",
+            self.name,
+            snapshot["done"],
+            snapshot["total"] if snapshot["total"] is not None else "?",
+            snapshot["per_second"],
+            f"{snapshot['eta_seconds']}s" if snapshot["eta_seconds"] is not None else "n/a",
+            extra=snapshot,
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        rate = self.done / elapsed
+        remaining = None
+        if self.total is not None and rate > 0:
+            remaining = max(0.0, (self.total - self.done) / rate)
+        return {
+            "done": self.done,
+            "total": self.total,
+            "elapsed_seconds": round(elapsed, 2),
+            "per_second": round(rate, 2),
+            "eta_seconds": round(remaining, 1) if remaining is not None else None,
+        }
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()) or "n/a"
+
+
+def log_job_summary(job_logger: logging.Logger, name: str, result: dict[str, Any]) -> None:
+    details = " ".join(
+        f"{key}={value}"
+        for key, value in result.items()
+        if key not in SUMMARY_FIELDS and not isinstance(value, (dict, list))
+    )
+    job_logger.info(
+        "%s complete: %d done, %d failed, %.1f/s over %.1fs%s; timings: %s",
+        name,
+        result.get("done", 0),
+        len(result.get("failed") or []),
+        result.get("per_second", 0.0),
+        result.get("elapsed_seconds", 0.0),
+        f" ({details})" if details else "",
+        format_timings(result.get("timings") or {}),
+        extra={key: value for key, value in result.items() if key != "failed"},
+    )
+
+
+def run_phase(timings: dict[str, float], name: str, func, *args, **kwargs):
+    started = time.monotonic()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[name] = round(timings.get(name, 0.0) + time.monotonic() - started, 3)
+
+
+def require_supabase():
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    return supabase
+
+
+def map_users(
+    pool: ThreadPoolExecutor, func: Callable[[str], dict[str, Any] | None], batch: list[str]
+) -> list[dict[str, Any]]:
+    def _call(user_id: str) -> dict[str, Any]:
+        try:
+            return {"user_id": user_id, **(func(user_id) or {})}
+        except Exception as exc:
+            return {"user_id": user_id, "error": str(exc)}
+
+    return list(pool.map(_call, batch))
+
+
+def run_user_batches(
+    name: str,
+    checkpoint: JobCheckpoint,
+    users: Callable[[str | None], Iterable[str]],
+    process_batch: Callable[[ThreadPoolExecutor, list[str]], list[dict[str, Any]]],
+    workers: int = 4,
+    batch_size: int = 100,
+    timings: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    user_cursor = checkpoint.state.get("user_cursor")
+    retry = frozenset(checkpoint.state.get("failed") or [])
+    pending_retry = set(retry)
+    failed: list[dict[str, Any]] = []
+    meter = ProgressMeter(name)
+    timings = {} if timings is None else timings
+
+    def _run() -> None:
+        nonlocal user_cursor
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            fresh_users = (user_id for user_id in users(user_cursor) if user_id not in retry)
+            for batch in chunked(chain(sorted(retry), fresh_users), max(1, batch_size)):
+                results = process_batch(pool, batch)
+                failed.extend(item for item in results if "error" in item)
+                meter.add(len(batch))
+                fresh = [user_id for user_id in batch if user_id not in retry]
+                pending_retry.difference_update(batch)
+                if fresh:
+                    user_cursor = fresh[-1]
+                checkpoint.update(
+                    force=True,
+                    user_cursor=user_cursor,
+                    failed=sorted(pending_retry | {item["user_id"] for item in failed}),
+                )
+
+    run_phase(timings, "total", _run)
+    return {
+        "users": meter.done,
+        "failed": failed,
+        "user_cursor": user_cursor,
+        "timings": timings,
+        **meter.snapshot(),
+    }
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date
+from typing import Any
+
+from jobs.job_runtime import JobCheckpoint, log_job_summary, map_users, require_supabase, run_user_batches
+from services.achievements import rebuild_achievement_counters
+from services.analytics_service import iter_active_user_ids
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 100
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "ACHIEVEMENT_REBUILD_CHECKPOINT_PATH", "/tmp/lifemosaic_achievement_counters_checkpoint.json"
+)
+
+
+def _rebuild(user_id: str) -> None:
+    rebuild_achievement_counters(user_id)
+
+
+def run_counter_rebuild(
+    workers: int = 4,
+    batch_size: int = REBUILD_BATCH_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+) -> dict[str, Any]:
+    require_supabase()
+    result = run_user_batches(
+        "achievement_counter_rebuild",
+        JobCheckpoint(checkpoint_path),
+        lambda after: iter_active_user_ids(date(1970, 1, 1), after=after),
+        lambda pool, batch: map_users(pool, _rebuild, batch),
+        workers=workers,
+        batch_size=batch_size,
+    )
+    log_job_summary(logger, "achievement_counter_rebuild", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_counter_rebuild(workers=int(os.getenv("ACHIEVEMENT_REBUILD_WORKERS", "4")))
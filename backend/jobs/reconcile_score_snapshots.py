@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from db.supabase import get_supabase_client
+from services.analytics_service import reconcile_daily_snapshot
+
+SCORE_SNAPSHOTS_TABLE = "score_snapshots"
+
+
+def _require_supabase():
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    return supabase
+
+
+def run_reconciliation(lookback_days: int = 7) -> list[dict[str, Any]]:
+    supabase = _require_supabase()
+    since = (datetime.utcnow().date() - timedelta(days=max(1, lookback_days))).isoformat()
+    response = (
+        supabase.table(SCORE_SNAPSHOTS_TABLE)
+        .select("user_id,date")
+        .gte("date", since)
+        .execute()
+    )
+    results: list[dict[str, Any]] = []
+    for row in response.data or []:
+        user_id = row.get("user_id")
+        day = row.get("date")
+        if not user_id or not day:
+            continue
+        try:
+            drifted = reconcile_daily_snapshot(str(user_id), datetime.fromisoformat(str(day)))
+            results.append(
+                {"user_id": str(user_id), "date": str(day), "status": "repaired" if drifted else "ok"}
+            )
+        except Exception as exc:
+            results.append({"user_id": str(user_id), "date": str(day), "status": "failed", "error": str(exc)})
+    return results
+
+
+if __name__ == "__main__":
+    run_reconciliation()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from jobs.job_runtime import JobCheckpoint, ProgressMeter, RateLimiter, log_job_summary, require_supabase
+from services.event_service import RESCORE_PAGE_SIZE, rescore_events
+
+logger = logging.getLogger(__name__)
+
+PROFILES_TABLE = "profiles"
+EVENTS_TABLE = "events"
+USER_PAGE_SIZE = 1000
+DEFAULT_CHECKPOINT_PATH = os.getenv("RESCORE_CHECKPOINT_PATH", "/tmp/lifemosaic_rescore_checkpoint.json")
+
+
+def _iter_user_ids(supabase, after: str | None):
+    while True:
+        query = supabase.table(PROFILES_TABLE).select("id").order("id", desc=False).limit(USER_PAGE_SIZE)
+        if after:
+            query = query.gt("id", after)
+        rows = query.execute().data or []
+        for row in rows:
+            if row.get("id"):
+                yield str(row["id"])
+        if len(rows) < USER_PAGE_SIZE:
+            return
+        after = str(rows[-1].get("id"))
+
+
+def _count_events(supabase) -> int | None:
+    response = supabase.table(EVENTS_TABLE).select("id", count="exact").limit(1).execute()
+    return int(response.count) if response.count is not None else None
+
+
+def run_fleet_rescore(
+    workers: int = 4,
+    writes_per_second: float | None = None,
+    page_size: int = RESCORE_PAGE_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+) -> dict[str, Any]:
+    supabase = require_supabase()
+    checkpoint = JobCheckpoint(checkpoint_path)
+    user_cursor = checkpoint.state.get("user_cursor")
+    in_progress: dict[str, dict[str, str]] = dict(checkpoint.state.get("in_progress") or {})
+    completed = set(checkpoint.state.get("completed_after_cursor") or [])
+    retrying = frozenset(checkpoint.state.get("failed") or [])
+    retry = set(retrying)
+    limiter = RateLimiter(writes_per_second, burst=page_size)
+    meter = ProgressMeter("fleet_rescore", total=_count_events(supabase))
+    lock = threading.Lock()
+    submitted: deque[str] = deque()
+    slots = threading.BoundedSemaphore(max(1, workers) * 2)
+    results: list[dict[str, Any]] = []
+    failed: dict[str, dict[str, Any]] = {}
+
+    def _save(force: bool = False) -> None:
+        checkpoint.update(
+            force=force,
+            user_cursor=user_cursor,
+            in_progress=dict(in_progress),
+            completed_after_cursor=sorted(completed),
+            failed=sorted(retry | set(failed)),
+        )
+
+    def _finish(user_id: str, result: dict[str, Any]) -> None:
+        nonlocal user_cursor
+        with lock:
+            results.append(result)
+            if result["status"] == "failed":
+                failed[user_id] = result
+            else:
+                in_progress.pop(user_id, None)
+            if user_id in retrying:
+                retry.discard(user_id)
+                _save()
+                return
+            completed.add(user_id)
+            while submitted and submitted[0] in completed:
+                user_cursor = submitted.popleft()
+                completed.discard(user_cursor)
+            _save()
+
+    def _rescore_user(user_id: str) -> None:
+        seen = {"scanned": 0, "written": 0}
+
+        def _progress(state: dict[str, Any]) -> None:
+            limiter.acquire(state["written"] - seen["written"])
+            meter.add(state["scanned"] - seen["scanned"])
+            seen.update(scanned=state["scanned"], written=state["written"])
+            with lock:
+                in_progress[user_id] = state["checkpoint"]
+                _save()
+
+        try:
+            scanned = rescore_events(
+                user_id,
+                page_size=page_size,
+                checkpoint=in_progress.get(user_id),
+                on_progress=_progress,
+            )
+            result = {"user_id": user_id, "status": "rescored", "events": scanned, "written": seen["written"]}
+        except Exception as exc:
+            result = {"user_id": user_id, "status": "failed", "error": str(exc)}
+        finally:
+            slots.release()
+        _finish(user_id, result)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for user_id in sorted(retrying):
+            slots.acquire()
+            pool.submit(_rescore_user, user_id)
+        for user_id in _iter_user_ids(supabase, user_cursor):
+            if user_id in completed or user_id in retrying:
+                continue
+            slots.acquire()
+            with lock:
+                submitted.append(user_id)
+            pool.submit(_rescore_user, user_id)
+    _save(force=True)
+
+    result = {
+        "users": len(results),
+        "failed": list(failed.values()),
+        "user_cursor": user_cursor,
+        **meter.snapshot(),
+    }
+    log_job_summary(logger, "fleet_rescore", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_fleet_rescore(
+        workers=int(os.getenv("RESCORE_WORKERS", "4")),
+        writes_per_second=float(os.getenv("RESCORE_WRITES_PER_SECOND", "0")) or None,
+    )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date, datetime
+from typing import Any
+
+from db.supabase import get_supabase_client
+from jobs.job_runtime import ProgressMeter, log_job_summary, run_phase
+from services.analytics_service import SNAPSHOT_BATCH_SIZE, snapshot_active_users
+
+logger = logging.getLogger(__name__)
+
+
+def _require_supabase():
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    return supabase
+
+
+def run_nightly_snapshots(
+    target_date: date | None = None,
+    lookback_days: int = 30,
+    workers: int = 4,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+) -> dict[str, Any]:
+    _require_supabase()
+    target = target_date or datetime.utcnow().date()
+    meter = ProgressMeter("nightly_snapshots")
+    timings: dict[str, float] = {}
+    phases: dict[str, float] = {}
+    users = run_phase(
+        timings,
+        "total",
+        lambda: snapshot_active_users(
+            target,
+            lookback_days,
+            workers=workers,
+            batch_size=batch_size,
+            timings=phases,
+            on_batch=meter.add,
+        ),
+    )
+    result = {
+        "date": target.isoformat(),
+        "users": users,
+        "timings": {**phases, **timings},
+        **meter.snapshot(),
+    }
+    log_job_summary(logger, "nightly_snapshots", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_nightly_snapshots(
+        workers=int(os.getenv("SNAPSHOT_WORKERS", "4")),
+        batch_size=int(os.getenv("SNAPSHOT_BATCH_SIZE", str(SNAPSHOT_BATCH_SIZE))),
+    )
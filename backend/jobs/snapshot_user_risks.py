@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from jobs.job_runtime import (
+    JobCheckpoint,
+    log_job_summary,
+    map_users,
+    require_supabase,
+    run_phase,
+    run_user_batches,
+)
+from services.analytics_service import iter_active_user_ids
+from services.risk_scoring import build_risk_snapshot, save_risk_snapshots
+
+logger = logging.getLogger(__name__)
+
+RISK_BATCH_SIZE = 200
+DEFAULT_CHECKPOINT_PATH = os.getenv("RISK_SNAPSHOT_CHECKPOINT_PATH", "/tmp/lifemosaic_risk_checkpoint.json")
+
+
+def run_risk_snapshots(
+    target_date: date | None = None,
+    lookback_days: int = 30,
+    workers: int = 4,
+    batch_size: int = RISK_BATCH_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+) -> dict[str, Any]:
+    require_supabase()
+    target = target_date or datetime.utcnow().date()
+    since = target - timedelta(days=max(1, lookback_days))
+    checkpoint = JobCheckpoint(checkpoint_path)
+    if checkpoint.state.get("date") != target.isoformat():
+        checkpoint.state = {"date": target.isoformat()}
+    timings: dict[str, float] = {}
+    written = 0
+
+    def _process(pool, batch: list[str]) -> list[dict[str, Any]]:
+        nonlocal written
+        results = run_phase(
+            timings, "compute", map_users, pool, lambda user_id: build_risk_snapshot(user_id, target), batch
+        )
+        payloads = [item for item in results if "error" not in item]
+        written += run_phase(timings, "write", save_risk_snapshots, payloads)
+        return results
+
+    result = run_user_batches(
+        "risk_snapshots",
+        checkpoint,
+        lambda after: iter_active_user_ids(since, after=after),
+        _process,
+        workers=workers,
+        batch_size=batch_size,
+        timings=timings,
+    )
+    result = {"date": target.isoformat(), **result, "written": written}
+    log_job_summary(logger, "risk_snapshots", result)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_risk_snapshots(
+        workers=int(os.getenv("RISK_SNAPSHOT_WORKERS", "4")),
+        batch_size=int(os.getenv("RISK_SNAPSHOT_BATCH_SIZE", str(RISK_BATCH_SIZE))),
+    )
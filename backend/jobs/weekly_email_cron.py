@@ -1,38 +1,169 @@
 from __future__ import annotations
 
-from typing import Any
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain
+from typing import Any, Iterator
 
-from db.supabase import get_supabase_client
-from services.email_service import send_weekly_email
+from jobs.job_runtime import JobCheckpoint, ProgressMeter, log_job_summary, require_supabase, run_phase
+from services.batch_fetch import chunked
+from services.email_service import SMTPSession, generate_weekly_summaries, send_weekly_email
+
+logger = logging.getLogger(__name__)
 
 PREFERENCES_TABLE = "notification_preferences"
+RECIPIENT_PAGE_SIZE = 1000
+WEEKLY_EMAIL_BATCH_SIZE = 50
+PREFETCH_DEPTH = 2
+DEFAULT_CHECKPOINT_PATH = os.getenv("WEEKLY_EMAIL_CHECKPOINT_PATH", "/tmp/lifemosaic_weekly_email_checkpoint.json")
 
 
-def _require_supabase():
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    return supabase
+def _week_key() -> str:
+    year, week, _ = datetime.utcnow().date().isocalendar()
+    return f"{year}-W{week:02d}"
 
 
-def run_weekly_emails() -> list[dict[str, Any]]:
-    supabase = _require_supabase()
-    response = (
-        supabase.table(PREFERENCES_TABLE)
-        .select("user_id,email_enabled,frequency")
-        .eq("email_enabled", True)
-        .eq("frequency", "weekly")
-        .execute()
-    )
-    results: list[dict[str, Any]] = []
-    for row in response.data or []:
-        user_id = row.get("user_id")
-        if not user_id:
-            continue
-        result = send_weekly_email(str(user_id))
-        results.append({"user_id": str(user_id), **result})
-    return results
+def _iter_recipients(supabase, after: str | None) -> Iterator[str]:
+    while True:
+        query = (
+            supabase.table(PREFERENCES_TABLE)
+            .select("user_id")
+            .eq("email_enabled", True)
+            .eq("frequency", "weekly")
+            .order("user_id", desc=False)
+            .limit(RECIPIENT_PAGE_SIZE)
+        )
+        if after:
+            query = query.gt("user_id", after)
+        rows = query.execute().data or []
+        for row in rows:
+            if row.get("user_id"):
+                yield str(row["user_id"])
+        if len(rows) < RECIPIENT_PAGE_SIZE:
+            return
+        after = str(rows[-1].get("user_id"))
+
+
+def run_weekly_emails(
+    workers: int = 4,
+    batch_size: int = WEEKLY_EMAIL_BATCH_SIZE,
+    checkpoint_path: str | None = DEFAULT_CHECKPOINT_PATH,
+    prefetch_depth: int = PREFETCH_DEPTH,
+) -> dict[str, Any]:
+    supabase = require_supabase()
+    week = _week_key()
+    checkpoint = JobCheckpoint(checkpoint_path)
+    if checkpoint.state.get("week") != week:
+        checkpoint.state = {"week": week}
+    user_cursor = checkpoint.state.get("user_cursor")
+    retry = frozenset(checkpoint.state.get("failed") or [])
+    pending_retry = set(retry)
+    sent_ahead = set(checkpoint.state.get("sent") or [])
+    failed: list[dict[str, Any]] = []
+    counts = {"sent": 0, "skipped": 0}
+    meter = ProgressMeter("weekly_email")
+    timings: dict[str, float] = {}
+    lock = threading.Lock()
+    local = threading.local()
+    sessions: list[SMTPSession] = []
+
+    def _session() -> SMTPSession | None:
+        if not hasattr(local, "session"):
+            local.session = SMTPSession.from_env()
+            if local.session is not None:
+                with lock:
+                    sessions.append(local.session)
+        return local.session
+
+    def _send(user_id: str, summary: dict[str, Any]) -> dict[str, Any]:
+        try:
+            result = {"user_id": user_id, **send_weekly_email(user_id, summary, _session())}
+        except Exception as exc:
+            return {"user_id": user_id, "status": "failed", "error": str(exc)}
+        if result.get("status") == "sent":
+            with lock:
+                sent_ahead.add(user_id)
+                checkpoint.update(force=True, sent=sorted(sent_ahead))
+        return result
+
+    def _prefetch(batch: list[str]) -> dict[str, dict[str, Any]]:
+        return run_phase(timings, "prefetch", generate_weekly_summaries, batch)
+
+    def _run() -> None:
+        nonlocal user_cursor
+        recipients = (
+            user_id
+            for user_id in _iter_recipients(supabase, user_cursor)
+            if user_id not in sent_ahead and user_id not in retry
+        )
+        batches = chunked(chain(sorted(retry), recipients), max(1, batch_size))
+        pending: deque[tuple[list[str], Future]] = deque()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="weekly-email-prefetch") as prefetcher, \
+                ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="weekly-email") as pool:
+
+            def _queue_next() -> None:
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append((batch, prefetcher.submit(_prefetch, batch)))
+
+            for _ in range(max(1, prefetch_depth)):
+                _queue_next()
+            while pending:
+                batch, future = pending.popleft()
+                _queue_next()
+                try:
+                    summaries = future.result()
+                except Exception as exc:
+                    results = [{"user_id": user_id, "status": "failed", "error": str(exc)} for user_id in batch]
+                else:
+                    results = run_phase(
+                        timings, "send", lambda: list(pool.map(lambda user_id: _send(user_id, summaries[user_id]), batch))
+                    )
+                for item in results:
+                    if item.get("status") == "failed":
+                        failed.append(item)
+                    else:
+                        counts[item.get("status", "skipped")] = counts.get(item.get("status", "skipped"), 0) + 1
+                meter.add(len(batch))
+                fresh = [user_id for user_id in batch if user_id not in retry]
+                with lock:
+                    if fresh:
+                        user_cursor = fresh[-1]
+                    pending_retry.difference_update(batch)
+                    sent_ahead.difference_update(batch)
+                    sent_ahead.intersection_update(user_id for user_id in sent_ahead if user_id > (user_cursor or ""))
+                    checkpoint.update(
+                        force=True,
+                        user_cursor=user_cursor,
+                        sent=sorted(sent_ahead),
+                        failed=sorted(pending_retry | {item["user_id"] for item in failed}),
+                    )
+
+    try:
+        run_phase(timings, "total", _run)
+    finally:
+        for session in sessions:
+            session.close()
+    result = {
+        "week": week,
+        **counts,
+        "failed": failed,
+        "smtp_connections": sum(session.connections for session in sessions),
+        "user_cursor": user_cursor,
+        "timings": timings,
+        **meter.snapshot(),
+    }
+    log_job_summary(logger, "weekly_email", result)
+    return result
 
 
 if __name__ == "__main__":
-    run_weekly_emails()
+    logging.basicConfig(level=logging.INFO)
+    run_weekly_emails(
+        workers=int(os.getenv("WEEKLY_EMAIL_WORKERS", "4")),
+        batch_size=int(os.getenv("WEEKLY_EMAIL_BATCH_SIZE", str(WEEKLY_EMAIL_BATCH_SIZE))),
+    )
@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.router import api_router
+from db.supabase import close_async_supabase_client
+from services.post_insert_queue import shutdown as shutdown_post_insert_queue
 
 app = FastAPI(title="LifeMosaic API")
 
@@ -19,6 +21,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix="/api")
+app.add_event_handler("shutdown", shutdown_post_insert_queue)
+app.add_event_handler("shutdown", close_async_supabase_client)
@@ -1,15 +1,31 @@
-from datetime import datetime, timedelta
-from typing import Any
+import heapq
+from datetime import date as date_type, datetime, timedelta
+from threading import Lock
+from typing import Any, Iterable
 
 from db.supabase import get_supabase_client
 from services.alert_service import create_alert
+from services.event_query import EventProjection, iter_events
+from services.lock_stripes import LockStripes
 from services.push_service import notify_badge_earned
+from services.query_gather import gather_queries
+from services.social_timeline import fan_out_activity
 
-EVENTS_TABLE = "events"
 SWAP_HISTORY_TABLE = "swap_history"
 SCORE_SNAPSHOTS_TABLE = "score_snapshots"
 ACHIEVEMENTS_TABLE = "achievements"
 USER_ACTIVITIES_TABLE = "user_activities"
+ACHIEVEMENT_COUNTERS_TABLE = "achievement_counters"
+SAVINGS_KEYS = ("money_saved_via_swaps", "swap_savings", "money_saved")
+CO2_KEYS = ("co2_saved", "co2e_saved", "co2e_kg", "co2e_kg_saved", "co2_reduced")
+ACHIEVEMENT_EVENT_PROJECTION = EventProjection(
+    ("id", "timestamp", "created_at"), metadata_keys=SAVINGS_KEYS + CO2_KEYS
+)
+STREAK_EVENT_PROJECTION = EventProjection(("timestamp",))
+STREAK_LOOKBACK_DAYS = 365
+WELLNESS_WINDOW = 7
+APPLIED_EVENT_WINDOW = 500
+COUNTER_LOCK_STRIPES = 256
 
 BADGE_DEFINITIONS = [
     {"badge_type": "savings_master", "badge_name": "Penny Pincher", "target": 100, "metric": "savings"},
@@ -20,6 +36,8 @@ BADGE_DEFINITIONS = [
     {"badge_type": "wellness_warrior", "badge_name": "Wellness Warrior", "target": 80, "metric": "wellness_avg"},
 ]
 
+_counter_locks = LockStripes(COUNTER_LOCK_STRIPES)
+
 
 def _safe_float(value: Any) -> float:
     if value is None:
@@ -30,61 +48,117 @@ def _safe_float(value: Any) -> float:
         return 0.0
 
 
-def _fetch_recent_events(user_id: str, days: int = 365) -> list[dict[str, Any]]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    since = datetime.utcnow() - timedelta(days=days)
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("timestamp,metadata")
-        .eq("user_id", user_id)
-        .gte("timestamp", since.isoformat())
-        .execute()
-    )
-    return response.data or []
+def _counter_lock(user_id: str) -> Lock:
+    return _counter_locks.lock_for(user_id)
 
 
-def _compute_savings_and_co2(events: list[dict[str, Any]]) -> tuple[float, float]:
-    savings_total = 0.0
-    co2_total = 0.0
-    for row in events:
-        metadata = row.get("metadata") or {}
-        savings_total += _safe_float(
-            metadata.get("money_saved_via_swaps")
-            or metadata.get("swap_savings")
-            or metadata.get("money_saved")
-        )
-        co2_total += _safe_float(
-            metadata.get("co2_saved")
-            or metadata.get("co2e_saved")
-            or metadata.get("co2e_kg")
-            or metadata.get("co2e_kg_saved")
-            or metadata.get("co2_reduced")
-        )
-    return round(savings_total, 2), round(co2_total, 2)
+def _first_amount(metadata: dict[str, Any], keys: tuple[str, ...]) -> float:
+    for key in keys:
+        value = metadata.get(key)
+        if value:
+            return _safe_float(value)
+    return 0.0
 
 
-def _compute_streak(events: list[dict[str, Any]]) -> int:
-    dates = set()
-    for row in events:
-        ts = row.get("timestamp")
-        if not ts:
-            continue
-        try:
-            date_value = datetime.fromisoformat(ts.replace("Z", "+00:00")).date()
-        except Exception:
-            continue
-        dates.add(date_value)
+def _event_day(value: Any) -> date_type | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except Exception:
+        return None
+
+
+def _streak_ending(days: set[date_type], end: date_type) -> int:
     streak = 0
-    cursor = datetime.utcnow().date()
-    while cursor in dates:
+    cursor = end
+    while cursor in days:
         streak += 1
         cursor = cursor - timedelta(days=1)
     return streak
 
 
-def _compute_wellness_avg(user_id: str) -> float:
+def _streak_from_history(user_id: str, end: date_type) -> int:
+    start = datetime.combine(end - timedelta(days=STREAK_LOOKBACK_DAYS), datetime.min.time())
+    rows = iter_events(user_id, STREAK_EVENT_PROJECTION, start, datetime.combine(end, datetime.max.time()))
+    return _streak_ending({_event_day(row.get("timestamp")) for row in rows}, end)
+
+
+def _empty_counters() -> dict[str, Any]:
+    return {
+        "savings_total": 0.0,
+        "co2_total": 0.0,
+        "swap_count": 0,
+        "streak_days": 0,
+        "last_active_date": None,
+        "wellness_recent": {},
+        "earned_badges": {},
+        "applied_event_ids": [],
+    }
+
+
+def _counters_from_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "savings_total": _safe_float(row.get("savings_total")),
+        "co2_total": _safe_float(row.get("co2_total")),
+        "swap_count": int(row.get("swap_count") or 0),
+        "streak_days": int(row.get("streak_days") or 0),
+        "last_active_date": _event_day(row.get("last_active_date")),
+        "wellness_recent": {
+            str(day): _safe_float(score) for day, score in (row.get("wellness_recent") or {}).items()
+        },
+        "earned_badges": dict(row.get("earned_badges") or {}),
+        "applied_event_ids": [str(event_id) for event_id in row.get("applied_event_ids") or []],
+    }
+
+
+def _counters_payload(user_id: str, counters: dict[str, Any]) -> dict[str, Any]:
+    last_active = counters["last_active_date"]
+    return {
+        "user_id": user_id,
+        "savings_total": round(counters["savings_total"], 4),
+        "co2_total": round(counters["co2_total"], 4),
+        "swap_count": counters["swap_count"],
+        "streak_days": counters["streak_days"],
+        "last_active_date": last_active.isoformat() if last_active else None,
+        "wellness_recent": counters["wellness_recent"],
+        "earned_badges": counters["earned_badges"],
+        "applied_event_ids": counters["applied_event_ids"][-APPLIED_EVENT_WINDOW:],
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+
+
+def _load_counters(supabase, user_id: str) -> dict[str, Any] | None:
+    response = (
+        supabase.table(ACHIEVEMENT_COUNTERS_TABLE).select("*").eq("user_id", user_id).limit(1).execute()
+    )
+    rows = response.data or []
+    return _counters_from_row(rows[0]) if rows else None
+
+
+def _save_counters(supabase, user_id: str, counters: dict[str, Any]) -> None:
+    supabase.table(ACHIEVEMENT_COUNTERS_TABLE).upsert(
+        _counters_payload(user_id, counters), on_conflict="user_id"
+    ).execute()
+
+
+def _unapplied_events(counters: dict[str, Any], events: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    applied = set(counters["applied_event_ids"])
+    fresh = []
+    for event in events:
+        event_id = str(event.get("id") or "")
+        if event_id and event_id in applied:
+            continue
+        if event_id:
+            applied.add(event_id)
+            counters["applied_event_ids"].append(event_id)
+        fresh.append(event)
+    return fresh
+
+
+def _recent_wellness(user_id: str) -> dict[str, float]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
@@ -93,15 +167,10 @@ def _compute_wellness_avg(user_id: str) -> float:
         .select("wellness_score,date")
         .eq("user_id", user_id)
         .order("date", desc=True)
-        .limit(7)
+        .limit(WELLNESS_WINDOW)
         .execute()
     )
-    rows = response.data or []
-    if not rows:
-        return 0.0
-    scores = [_safe_float(row.get("wellness_score")) for row in rows]
-    avg = sum(scores) / max(1, len(scores))
-    return round(avg, 2)
+    return {str(row.get("date")): _safe_float(row.get("wellness_score")) for row in response.data or []}
 
 
 def _count_swaps(user_id: str) -> int:
@@ -112,70 +181,144 @@ def _count_swaps(user_id: str) -> int:
     return int(response.count or 0)
 
 
-def _existing_badges(user_id: str) -> dict[str, dict[str, Any]]:
+def _existing_badges(user_id: str) -> dict[str, str | None]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    response = supabase.table(ACHIEVEMENTS_TABLE).select("*").eq("user_id", user_id).execute()
+    response = supabase.table(ACHIEVEMENTS_TABLE).select("badge_name,earned_at").eq("user_id", user_id).execute()
     rows = response.data or []
-    return {str(row.get("badge_name")): row for row in rows if row.get("badge_name")}
-
-
-def _progress_for_metric(metric: str, savings: float, co2: float, swaps: int, streak: int, wellness_avg: float) -> float:
-    if metric == "savings":
-        return savings
-    if metric == "co2":
-        return co2
-    if metric == "swaps":
-        return float(swaps)
-    if metric == "streak":
-        return float(streak)
-    if metric == "wellness_avg":
-        return wellness_avg
-    return 0.0
+    return {str(row.get("badge_name")): row.get("earned_at") for row in rows if row.get("badge_name")}
 
 
-def check_and_award_achievements(user_id: str) -> list[dict[str, Any]]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        return []
-    events = _fetch_recent_events(user_id, days=365)
-    savings_total, co2_total = _compute_savings_and_co2(events)
-    streak = _compute_streak(events)
-    swaps = _count_swaps(user_id)
-    wellness_avg = _compute_wellness_avg(user_id)
-    existing = _existing_badges(user_id)
+def _event_totals(user_id: str) -> dict[str, Any]:
+    savings_total = 0.0
+    co2_total = 0.0
+    days: set[date_type] = set()
+    recent: list[tuple[str, str]] = []
+    for row in iter_events(user_id, ACHIEVEMENT_EVENT_PROJECTION):
+        metadata = row.get("metadata") or {}
+        savings_total += _first_amount(metadata, SAVINGS_KEYS)
+        co2_total += _first_amount(metadata, CO2_KEYS)
+        day = _event_day(row.get("timestamp"))
+        if day is not None:
+            days.add(day)
+        if row.get("id"):
+            entry = (str(row.get("created_at") or ""), str(row["id"]))
+            if len(recent) < APPLIED_EVENT_WINDOW:
+                heapq.heappush(recent, entry)
+            else:
+                heapq.heappushpop(recent, entry)
+    today = datetime.utcnow().date()
+    last_active = max((day for day in days if day <= today), default=None)
+    return {
+        "savings_total": savings_total,
+        "co2_total": co2_total,
+        "last_active_date": last_active,
+        "streak_days": _streak_ending(days, last_active) if last_active else 0,
+        "applied_event_ids": [event_id for _, event_id in sorted(recent)],
+    }
+
+
+def _compute_counters(user_id: str) -> dict[str, Any]:
+    results = gather_queries(
+        {
+            "events": lambda: _event_totals(user_id),
+            "swaps": lambda: _count_swaps(user_id),
+            "wellness": lambda: _recent_wellness(user_id),
+            "badges": lambda: _existing_badges(user_id),
+        }
+    )
+    return {
+        **_empty_counters(),
+        **results["events"],
+        "swap_count": results["swaps"],
+        "wellness_recent": results["wellness"],
+        "earned_badges": results["badges"],
+    }
+
+
+def _apply_event(counters: dict[str, Any], event: dict[str, Any], today: date_type) -> bool:
+    metadata = event.get("metadata") or {}
+    counters["savings_total"] += _first_amount(metadata, SAVINGS_KEYS)
+    counters["co2_total"] += _first_amount(metadata, CO2_KEYS)
+    day = _event_day(event.get("timestamp"))
+    if day is None or day > today:
+        return False
+    last_active = counters["last_active_date"]
+    streak = counters["streak_days"]
+    if last_active is None or day > last_active + timedelta(days=1):
+        counters["streak_days"] = 1
+        counters["last_active_date"] = day
+    elif day == last_active + timedelta(days=1):
+        counters["streak_days"] = streak + 1
+        counters["last_active_date"] = day
+    elif day == last_active - timedelta(days=streak):
+        return True
+    return False
+
+
+def _record_wellness(counters: dict[str, Any], day: date_type, score: float) -> None:
+    recent = {**counters["wellness_recent"], day.isoformat(): round(float(score), 2)}
+    counters["wellness_recent"] = dict(sorted(recent.items(), reverse=True)[:WELLNESS_WINDOW])
+
+
+def _badge_progress(counters: dict[str, Any], today: date_type) -> dict[str, float]:
+    wellness = list(counters["wellness_recent"].values())
+    return {
+        "savings": round(counters["savings_total"], 2),
+        "co2": round(counters["co2_total"], 2),
+        "swaps": float(counters["swap_count"]),
+        "streak": float(counters["streak_days"] if counters["last_active_date"] == today else 0),
+        "wellness_avg": round(sum(wellness) / len(wellness), 2) if wellness else 0.0,
+    }
+
+
+def _award_badges(supabase, user_id: str, counters: dict[str, Any]) -> list[dict[str, Any]]:
+    progress_by_metric = _badge_progress(counters, datetime.utcnow().date())
+    earned_badges = counters["earned_badges"]
     awarded: list[dict[str, Any]] = []
     for badge in BADGE_DEFINITIONS:
-        progress = _progress_for_metric(
-            badge["metric"], savings_total, co2_total, swaps, streak, wellness_avg
-        )
+        progress = progress_by_metric.get(badge["metric"], 0.0)
         if progress < badge["target"]:
             continue
-        if badge["badge_name"] in existing:
+        if badge["badge_name"] in earned_badges:
             continue
+        earned_at = datetime.utcnow().isoformat()
         payload = {
             "user_id": user_id,
             "badge_type": badge["badge_type"],
             "badge_name": badge["badge_name"],
-            "earned_at": datetime.utcnow().isoformat(),
+            "earned_at": earned_at,
             "progress_current": progress,
             "progress_target": badge["target"],
         }
-        response = supabase.table(ACHIEVEMENTS_TABLE).insert(payload).execute()
+        response = (
+            supabase.table(ACHIEVEMENTS_TABLE)
+            .upsert(payload, on_conflict="user_id,badge_name", ignore_duplicates=True)
+            .execute()
+        )
+        earned_badges[badge["badge_name"]] = earned_at
         if response.data:
             row = response.data[0]
             awarded.append(row)
-            supabase.table(USER_ACTIVITIES_TABLE).insert(
-                {
-                    "user_id": user_id,
-                    "activity_type": "milestone",
-                    "title": f"Achievement unlocked: {badge['badge_name']}",
-                    "description": f"Earned {badge['badge_name']}",
-                    "metadata": {"badge_type": badge["badge_type"], "badge_name": badge["badge_name"]},
-                    "visibility": "friends",
-                }
-            ).execute()
+            activity = (
+                supabase.table(USER_ACTIVITIES_TABLE)
+                .insert(
+                    {
+                        "user_id": user_id,
+                        "activity_type": "milestone",
+                        "title": f"Achievement unlocked: {badge['badge_name']}",
+                        "description": f"Earned {badge['badge_name']}",
+                        "metadata": {"badge_type": badge["badge_type"], "badge_name": badge["badge_name"]},
+                        "visibility": "friends",
+                    }
+                )
+                .execute()
+                .data
+                or []
+            )
+            if activity:
+                fan_out_activity(activity[0])
             create_alert(
                 user_id,
                 "goals",
@@ -187,24 +330,79 @@ def check_and_award_achievements(user_id: str) -> list[dict[str, Any]]:
     return awarded
 
 
+def rebuild_achievement_counters(user_id: str) -> dict[str, Any]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    with _counter_lock(user_id):
+        counters = _compute_counters(user_id)
+        _save_counters(supabase, user_id, counters)
+    return counters
+
+
+def record_achievement_events(
+    user_id: str,
+    events: Iterable[dict[str, Any]],
+    day: date_type | None = None,
+    wellness_score: float | None = None,
+) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        return []
+    today = datetime.utcnow().date()
+    with _counter_lock(user_id):
+        counters = _load_counters(supabase, user_id)
+        if counters is None:
+            counters = _compute_counters(user_id)
+            _unapplied_events(counters, events)
+        else:
+            fresh = _unapplied_events(counters, events)
+            ordered = sorted(fresh, key=lambda event: _event_day(event.get("timestamp")) or today)
+            extends_streak = [_apply_event(counters, event, today) for event in ordered]
+            if any(extends_streak) and counters["last_active_date"] is not None:
+                counters["streak_days"] = _streak_from_history(user_id, counters["last_active_date"])
+            if day is not None and wellness_score is not None:
+                _record_wellness(counters, day, wellness_score)
+        awarded = _award_badges(supabase, user_id, counters)
+        _save_counters(supabase, user_id, counters)
+    return awarded
+
+
+def record_swap(user_id: str) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        return []
+    with _counter_lock(user_id):
+        counters = _load_counters(supabase, user_id)
+        if counters is None:
+            counters = _compute_counters(user_id)
+        else:
+            counters["swap_count"] += 1
+        awarded = _award_badges(supabase, user_id, counters)
+        _save_counters(supabase, user_id, counters)
+    return awarded
+
+
+def check_and_award_achievements(user_id: str) -> list[dict[str, Any]]:
+    return record_achievement_events(user_id, [])
+
+
 def get_badge_progress(user_id: str) -> list[dict[str, Any]]:
-    events = _fetch_recent_events(user_id, days=365)
-    savings_total, co2_total = _compute_savings_and_co2(events)
-    streak = _compute_streak(events)
-    swaps = _count_swaps(user_id)
-    wellness_avg = _compute_wellness_avg(user_id)
-    existing = _existing_badges(user_id)
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    counters = _load_counters(supabase, user_id)
+    if counters is None:
+        counters = rebuild_achievement_counters(user_id)
+    progress_by_metric = _badge_progress(counters, datetime.utcnow().date())
     results: list[dict[str, Any]] = []
     for badge in BADGE_DEFINITIONS:
-        progress = _progress_for_metric(
-            badge["metric"], savings_total, co2_total, swaps, streak, wellness_avg
-        )
-        earned = existing.get(badge["badge_name"])
+        progress = progress_by_metric.get(badge["metric"], 0.0)
         results.append(
             {
                 "badge_type": badge["badge_type"],
                 "badge_name": badge["badge_name"],
-                "earned_at": earned.get("earned_at") if earned else None,
+                "earned_at": counters["earned_badges"].get(badge["badge_name"]),
                 "progress_current": round(progress, 2),
                 "progress_target": badge["target"],
             }
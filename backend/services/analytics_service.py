@@ -1,11 +1,45 @@
-from datetime import date as date_type, datetime, timedelta
-from typing import Any
-
-from db.supabase import get_supabase_client
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date as date_type, datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Callable, Iterator
+
+from db.supabase import get_async_supabase_client, get_supabase_client
+from services.daily_rollups import fetch_daily_rollups, fetch_daily_rollups_async
+from services.batch_fetch import chunked, fetch_rows_in
+from services.event_query import EventProjection, fetch_events, fetch_events_async, iter_events
+from services.lock_stripes import LockStripes
+from services.query_gather import gather_queries, gather_queries_async
 
 EVENTS_TABLE = "events"
 MOVEMENT_TABLE = "movement_patterns"
 SCORE_SNAPSHOTS_TABLE = "score_snapshots"
+ACTIVE_USERS_RPC = "active_user_ids"
+ACTIVE_USER_PAGE_SIZE = 1000
+SNAPSHOT_BATCH_SIZE = 200
+SNAPSHOT_EVENT_PAGE_SIZE = 1000
+TREND_ROLLUP_FIELDS = {
+    "spending": ("spending_total", "spending_count"),
+    "wellness": ("wellness_sum", "wellness_count"),
+    "sustainability": ("sustainability_sum", "sustainability_count"),
+    "movement_minutes": ("movement_minutes", "movement_count"),
+}
+ANALYTICS_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "amount", "timestamp"),
+    metadata_keys=("duration_minutes", "swap_accepted", "swap_savings", "money_saved"),
+    scores_keys=("wellness_impact",),
+)
+SNAPSHOT_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "amount"),
+    scores_keys=("wellness_impact", "sustainability_impact"),
+)
+BREAKDOWN_ROLLUP_FIELDS = {
+    "spending_by_category": "spending_by_category",
+    "food_by_quality": "food_quality",
+    "time_by_activity": "activity_minutes",
+}
 
 
 def _safe_float(value: Any) -> float | None:
@@ -47,59 +81,26 @@ def _fetch_events(
     end_date: datetime,
     event_types: list[str] | None = None,
 ) -> list[dict[str, Any]]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    query = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start_date.isoformat())
-        .lte("timestamp", end_date.isoformat())
-    )
-    if event_types:
-        query = query.in_("event_type", event_types)
-    response = query.execute()
-    return response.data or []
+    return fetch_events(user_id, ANALYTICS_EVENT_PROJECTION, start_date, end_date, event_types)
 
 
-def _trend_from_events(
+def _trend_from_rollups(
     rows: list[dict[str, Any]],
     granularity: str,
     metric: str,
 ) -> list[dict[str, Any]]:
+    sum_field, count_field = TREND_ROLLUP_FIELDS.get(metric, (None, None))
     buckets: dict[str, dict[str, float]] = {}
     for row in rows:
-        ts = _parse_timestamp(row.get("timestamp"))
-        if ts is None:
+        try:
+            day = date_type.fromisoformat(str(row.get("date")))
+        except Exception:
             continue
-        key = _bucket_key(ts, granularity)
+        key = _bucket_key(datetime.combine(day, datetime.min.time()), granularity)
         bucket = buckets.setdefault(key, {"sum": 0.0, "count": 0.0})
-        event_type = (row.get("event_type") or "").lower()
-        amount = _safe_float(row.get("amount"))
-        scores = row.get("scores") or {}
-        metadata = row.get("metadata") or {}
-
-        if metric == "spending":
-            if event_type == "spending" and amount is not None:
-                bucket["sum"] += abs(amount)
-                bucket["count"] += 1
-        elif metric == "wellness":
-            value = _safe_float(scores.get("wellness_impact"))
-            if value is not None:
-                bucket["sum"] += value
-                bucket["count"] += 1
-        elif metric == "sustainability":
-            value = _safe_float(scores.get("sustainability_impact"))
-            if value is not None:
-                bucket["sum"] += value
-                bucket["count"] += 1
-        elif metric == "movement_minutes":
-            if event_type == "movement":
-                minutes = _safe_float(metadata.get("duration_minutes")) or amount
-                if minutes is not None:
-                    bucket["sum"] += minutes
-                    bucket["count"] += 1
+        if sum_field is not None:
+            bucket["sum"] += _safe_float(row.get(sum_field)) or 0.0
+            bucket["count"] += _safe_float(row.get(count_field)) or 0.0
     results: list[dict[str, Any]] = []
     for key, value in buckets.items():
         if metric in {"wellness", "sustainability"}:
@@ -111,26 +112,17 @@ def _trend_from_events(
     return results
 
 
-def _trend_from_movement(
-    user_id: str,
-    start_date: datetime,
-    end_date: datetime,
-    granularity: str,
-) -> list[dict[str, Any]]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    start = start_date.date().isoformat()
-    end = end_date.date().isoformat()
-    response = (
-        supabase.table(MOVEMENT_TABLE)
-        .select("date,active_minutes")
+def _movement_query(client, user_id: str, start_date: datetime, end_date: datetime, fields: str):
+    return (
+        client.table(MOVEMENT_TABLE)
+        .select(fields)
         .eq("user_id", user_id)
-        .gte("date", start)
-        .lte("date", end)
-        .execute()
+        .gte("date", start_date.date().isoformat())
+        .lte("date", end_date.date().isoformat())
     )
-    rows = response.data or []
+
+
+def _movement_buckets(rows: list[dict[str, Any]], granularity: str) -> list[dict[str, Any]]:
     buckets: dict[str, float] = {}
     for row in rows:
         date_value = row.get("date")
@@ -152,6 +144,32 @@ def _trend_from_movement(
     return results
 
 
+def _trend_from_movement(
+    user_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    granularity: str,
+) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    response = _movement_query(supabase, user_id, start_date, end_date, "date,active_minutes").execute()
+    return _movement_buckets(response.data or [], granularity)
+
+
+async def _trend_from_movement_async(
+    user_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    granularity: str,
+) -> list[dict[str, Any]]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    response = await _movement_query(client, user_id, start_date, end_date, "date,active_minutes").execute()
+    return _movement_buckets(response.data or [], granularity)
+
+
 def get_trend_data(
     user_id: str,
     metric: str,
@@ -163,171 +181,152 @@ def get_trend_data(
         data = _trend_from_movement(user_id, start_date, end_date, granularity)
         if data:
             return data
-    rows = _fetch_events(user_id, start_date, end_date, None)
-    return _trend_from_events(rows, granularity, metric)
+    fields = ",".join(TREND_ROLLUP_FIELDS.get(metric, ("event_count",)))
+    rows = fetch_daily_rollups(user_id, start_date.date(), end_date.date(), fields)
+    return _trend_from_rollups(rows, granularity, metric)
 
 
-def get_breakdown_data(
+async def get_trend_data_async(
     user_id: str,
-    breakdown_type: str,
+    metric: str,
     start_date: datetime,
     end_date: datetime,
+    granularity: str = "day",
 ) -> list[dict[str, Any]]:
-    if breakdown_type == "spending_by_category":
-        rows = _fetch_events(user_id, start_date, end_date, ["spending"])
-        totals: dict[str, float] = {}
-        for row in rows:
-            metadata = row.get("metadata") or {}
-            category = metadata.get("category") or "Other"
-            amount = _safe_float(row.get("amount")) or 0.0
-            totals[str(category)] = totals.get(str(category), 0.0) + abs(amount)
-        total_value = sum(totals.values())
-        results = [
-            {
-                "name": key,
-                "value": round(value, 2),
-                "percentage": round((value / total_value * 100) if total_value > 0 else 0.0, 2),
-            }
-            for key, value in totals.items()
-        ]
-        results.sort(key=lambda item: item["value"], reverse=True)
-        return results
+    if metric == "movement_minutes":
+        data = await _trend_from_movement_async(user_id, start_date, end_date, granularity)
+        if data:
+            return data
+    fields = ",".join(TREND_ROLLUP_FIELDS.get(metric, ("event_count",)))
+    rows = await fetch_daily_rollups_async(user_id, start_date.date(), end_date.date(), fields)
+    return _trend_from_rollups(rows, granularity, metric)
+
+
+def _merge_rollup_maps(rows: list[dict[str, Any]], field: str) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for row in rows:
+        for key, value in (row.get(field) or {}).items():
+            totals[str(key)] = totals.get(str(key), 0.0) + (_safe_float(value) or 0.0)
+    return totals
 
+
+def _breakdown_from_rollups(rows: list[dict[str, Any]], breakdown_type: str, field: str) -> list[dict[str, Any]]:
+    totals = _merge_rollup_maps(rows, field)
     if breakdown_type == "food_by_quality":
-        rows = _fetch_events(user_id, start_date, end_date, ["food"])
-        buckets = {"Excellent": 0, "Good": 0, "Fair": 0, "Poor": 0}
-        for row in rows:
-            metadata = row.get("metadata") or {}
-            scores = row.get("scores") or {}
-            quality = _safe_float(metadata.get("nutrition_quality_score"))
-            if quality is None:
-                quality = _safe_float(scores.get("wellness_impact"))
-            if quality is None:
-                continue
-            if quality >= 8:
-                buckets["Excellent"] += 1
-            elif quality >= 6:
-                buckets["Good"] += 1
-            elif quality >= 4:
-                buckets["Fair"] += 1
-            else:
-                buckets["Poor"] += 1
-        total_value = sum(buckets.values())
-        results = [
-            {
-                "name": key,
-                "value": float(value),
-                "percentage": round((value / total_value * 100) if total_value > 0 else 0.0, 2),
-            }
-            for key, value in buckets.items()
-            if value > 0
-        ]
-        results.sort(key=lambda item: item["value"], reverse=True)
-        return results
-
-    if breakdown_type == "time_by_activity":
-        event_types = ["movement", "work", "study", "social", "sleep", "habit", "break"]
-        rows = _fetch_events(user_id, start_date, end_date, event_types)
-        totals: dict[str, float] = {}
-        label_map = {
-            "movement": "Movement",
-            "work": "Work",
-            "study": "Study",
-            "social": "Social",
-            "sleep": "Sleep",
-            "habit": "Habits",
-            "break": "Break",
+        totals = {key: totals[key] for key in ("Excellent", "Good", "Fair", "Poor") if totals.get(key, 0) > 0}
+    total_value = sum(totals.values())
+    results = [
+        {
+            "name": key,
+            "value": round(value, 2),
+            "percentage": round((value / total_value * 100) if total_value > 0 else 0.0, 2),
         }
-        for row in rows:
-            event_type = (row.get("event_type") or "").lower()
-            metadata = row.get("metadata") or {}
-            minutes = _safe_float(metadata.get("duration_minutes"))
-            amount = _safe_float(row.get("amount"))
-            if minutes is None and amount is not None:
-                if event_type == "sleep" and amount <= 24:
-                    minutes = amount * 60
-                else:
-                    minutes = amount
-            if minutes is None:
-                continue
-            label = label_map.get(event_type, "Other")
-            totals[label] = totals.get(label, 0.0) + minutes
-        total_value = sum(totals.values())
-        results = [
-            {
-                "name": key,
-                "value": round(value, 2),
-                "percentage": round((value / total_value * 100) if total_value > 0 else 0.0, 2),
-            }
-            for key, value in totals.items()
-        ]
-        results.sort(key=lambda item: item["value"], reverse=True)
-        return results
+        for key, value in totals.items()
+    ]
+    results.sort(key=lambda item: item["value"], reverse=True)
+    return results
+
+
+def _breakdown_field(breakdown_type: str) -> str:
+    field = BREAKDOWN_ROLLUP_FIELDS.get(breakdown_type)
+    if field is None:
+        raise ValueError("Unsupported breakdown type")
+    return field
+
+
+def get_breakdown_data(
+    user_id: str,
+    breakdown_type: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> list[dict[str, Any]]:
+    field = _breakdown_field(breakdown_type)
+    rows = fetch_daily_rollups(user_id, start_date.date(), end_date.date(), field)
+    return _breakdown_from_rollups(rows, breakdown_type, field)
+
+
+async def get_breakdown_data_async(
+    user_id: str,
+    breakdown_type: str,
+    start_date: datetime,
+    end_date: datetime,
+) -> list[dict[str, Any]]:
+    field = _breakdown_field(breakdown_type)
+    rows = await fetch_daily_rollups_async(user_id, start_date.date(), end_date.date(), field)
+    return _breakdown_from_rollups(rows, breakdown_type, field)
 
-    raise ValueError("Unsupported breakdown type")
 
 def _day_bounds(d: datetime) -> tuple[datetime, datetime]:
     start = datetime(d.year, d.month, d.day)
     end = start + timedelta(days=1) - timedelta(seconds=1)
     return start, end
 
-def _compute_daily_scores(user_id: str, day: datetime) -> dict[str, float]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    start, end = _day_bounds(day)
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = events_resp.data or []
-    movement_resp = (
-        supabase.table(MOVEMENT_TABLE)
-        .select("total_movement_score")
-        .eq("user_id", user_id)
-        .eq("date", day.date().isoformat())
-        .maybe_single()
-        .execute()
-    )
-    movement_row = movement_resp.data if isinstance(movement_resp.data, dict) else None
-
-    spend_total = 0.0
-    income_total = 0.0
-    wellness_scores: list[float] = []
-    sustainability_scores: list[float] = []
-
-    for row in rows:
-        etype = (row.get("event_type") or "").lower()
-        category = (row.get("category") or "").lower()
-        amount = _safe_float(row.get("amount")) or 0.0
-        scores = row.get("scores") or {}
-        wellness_impact = _safe_float(scores.get("wellness_impact"))
-        sustainability_impact = _safe_float(scores.get("sustainability_impact"))
-
-        if etype == "spending":
-            spend_total += abs(amount)
-        if category == "finance" or etype == "income":
-            income_total += amount
-        if wellness_impact is not None:
-            wellness_scores.append(50.0 + float(wellness_impact) / 2.0)
-        if sustainability_impact is not None:
-            sustainability_scores.append(50.0 + float(sustainability_impact) / 2.0)
-
+SNAPSHOT_SCORE_FIELDS = ("wallet_score", "wellness_score", "sustainability_score", "movement_score")
+ACCUMULATOR_FIELDS = (
+    "spend_total",
+    "income_total",
+    "wellness_sum",
+    "wellness_count",
+    "sustainability_sum",
+    "sustainability_count",
+)
+
+SNAPSHOT_LOCK_STRIPES = 256
+
+_snapshot_locks = LockStripes(SNAPSHOT_LOCK_STRIPES)
+
+
+def _snapshot_lock(user_id: str, day_key: str) -> Lock:
+    return _snapshot_locks.lock_for((user_id, day_key))
+
+
+def _empty_totals() -> dict[str, float]:
+    return {field: 0.0 for field in ACCUMULATOR_FIELDS}
+
+
+def _accumulate_event(
+    totals: dict[str, float],
+    event_type: str | None,
+    category: str | None,
+    amount: Any,
+    scores: dict[str, Any] | None,
+) -> None:
+    etype = (event_type or "").lower()
+    category_key = (category or "").lower()
+    value = _safe_float(amount) or 0.0
+    scores = scores or {}
+    wellness_impact = _safe_float(scores.get("wellness_impact"))
+    sustainability_impact = _safe_float(scores.get("sustainability_impact"))
+
+    if etype == "spending":
+        totals["spend_total"] += abs(value)
+    if category_key == "finance" or etype == "income":
+        totals["income_total"] += value
+    if wellness_impact is not None:
+        totals["wellness_sum"] += 50.0 + float(wellness_impact) / 2.0
+        totals["wellness_count"] += 1
+    if sustainability_impact is not None:
+        totals["sustainability_sum"] += 50.0 + float(sustainability_impact) / 2.0
+        totals["sustainability_count"] += 1
+
+
+def _scores_from_totals(totals: dict[str, float], movement_score: float) -> dict[str, float]:
+    spend_total = totals["spend_total"]
+    income_total = totals["income_total"]
     if income_total + spend_total > 0:
         net = income_total - spend_total
         wallet_score = 50.0 + (net / float(income_total + spend_total)) * 50.0
     else:
         wallet_score = 50.0
 
-    wellness_score = sum(wellness_scores) / float(len(wellness_scores)) if wellness_scores else 50.0
+    wellness_score = (
+        totals["wellness_sum"] / totals["wellness_count"] if totals["wellness_count"] else 50.0
+    )
     sustainability_score = (
-        sum(sustainability_scores) / float(len(sustainability_scores)) if sustainability_scores else 50.0
+        totals["sustainability_sum"] / totals["sustainability_count"]
+        if totals["sustainability_count"]
+        else 50.0
     )
-    movement_score = _safe_float((movement_row or {}).get("total_movement_score")) or 0.0
     movement_score = max(0.0, min(100.0, movement_score))
 
     return {
@@ -337,25 +336,129 @@ def _compute_daily_scores(user_id: str, day: datetime) -> dict[str, float]:
         "movement_score": round(movement_score, 2),
     }
 
-def save_daily_snapshot(user_id: str, day: datetime) -> dict[str, float]:
+
+def _fetch_movement_score(user_id: str, day: datetime) -> float:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    scores = _compute_daily_scores(user_id, day)
-    payload = {
+    movement_resp = (
+        supabase.table(MOVEMENT_TABLE)
+        .select("total_movement_score")
+        .eq("user_id", user_id)
+        .eq("date", day.date().isoformat())
+        .maybe_single()
+        .execute()
+    )
+    movement_row = movement_resp.data if movement_resp is not None and isinstance(movement_resp.data, dict) else None
+    return _safe_float((movement_row or {}).get("total_movement_score")) or 0.0
+
+
+def _compute_daily_totals(user_id: str, day: datetime) -> tuple[dict[str, float], float]:
+    start, end = _day_bounds(day)
+    totals = _empty_totals()
+    for row in fetch_events(user_id, SNAPSHOT_EVENT_PROJECTION, start, end):
+        _accumulate_event(
+            totals, row.get("event_type"), row.get("category"), row.get("amount"), row.get("scores")
+        )
+    return totals, _fetch_movement_score(user_id, day)
+
+
+def _compute_daily_scores(user_id: str, day: datetime) -> dict[str, float]:
+    totals, movement_score = _compute_daily_totals(user_id, day)
+    return _scores_from_totals(totals, movement_score)
+
+
+def _snapshot_payload(
+    user_id: str, day: datetime, totals: dict[str, float], scores: dict[str, float]
+) -> dict[str, Any]:
+    return {
         "user_id": user_id,
         "date": day.date().isoformat(),
         **scores,
+        **{
+            field: int(totals[field]) if field.endswith("_count") else round(totals[field], 4)
+            for field in ACCUMULATOR_FIELDS
+        },
     }
-    response = (
-        supabase.table(SCORE_SNAPSHOTS_TABLE)
-        .upsert(payload, on_conflict="user_id,date")
-        .execute()
-    )
-    if response.error:
-        raise RuntimeError(str(response.error))
+
+
+def _upsert_snapshot(user_id: str, day: datetime, totals: dict[str, float], scores: dict[str, float]) -> None:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    payload = _snapshot_payload(user_id, day, totals, scores)
+    supabase.table(SCORE_SNAPSHOTS_TABLE).upsert(payload, on_conflict="user_id,date").execute()
+
+
+def save_daily_snapshot(user_id: str, day: datetime) -> dict[str, float]:
+    with _snapshot_lock(user_id, day.date().isoformat()):
+        totals, movement_score = _compute_daily_totals(user_id, day)
+        scores = _scores_from_totals(totals, movement_score)
+        _upsert_snapshot(user_id, day, totals, scores)
     return scores
 
+
+def apply_event_to_snapshot(
+    user_id: str,
+    day: datetime,
+    event_type: str | None,
+    category: str | None,
+    amount: Any,
+    scores: dict[str, Any] | None,
+) -> dict[str, float] | None:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    day_key = day.date().isoformat()
+    with _snapshot_lock(user_id, day_key):
+        response = (
+            supabase.table(SCORE_SNAPSHOTS_TABLE)
+            .select(",".join(("movement_score", *ACCUMULATOR_FIELDS)))
+            .eq("user_id", user_id)
+            .eq("date", day_key)
+            .maybe_single()
+            .execute()
+        )
+        row = response.data if response is not None and isinstance(response.data, dict) else None
+        if row is None or any(row.get(field) is None for field in ACCUMULATOR_FIELDS):
+            return None
+        totals = {field: float(row[field]) for field in ACCUMULATOR_FIELDS}
+        _accumulate_event(totals, event_type, category, amount, scores)
+        if (event_type or "").lower() == "movement":
+            movement_score = _fetch_movement_score(user_id, day)
+        else:
+            movement_score = _safe_float(row.get("movement_score")) or 0.0
+        snapshot_scores = _scores_from_totals(totals, movement_score)
+        _upsert_snapshot(user_id, day, totals, snapshot_scores)
+    return snapshot_scores
+
+
+def reconcile_daily_snapshot(user_id: str, day: datetime, tolerance: float = 0.01) -> bool:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    day_key = day.date().isoformat()
+    with _snapshot_lock(user_id, day_key):
+        response = (
+            supabase.table(SCORE_SNAPSHOTS_TABLE)
+            .select(",".join((*SNAPSHOT_SCORE_FIELDS, *ACCUMULATOR_FIELDS)))
+            .eq("user_id", user_id)
+            .eq("date", day_key)
+            .maybe_single()
+            .execute()
+        )
+        row = response.data if response is not None and isinstance(response.data, dict) else {}
+        totals, movement_score = _compute_daily_totals(user_id, day)
+        scores = _scores_from_totals(totals, movement_score)
+        current = {**scores, **totals}
+        drifted = any(
+            _safe_float(row.get(field)) is None or abs(float(row[field]) - value) > tolerance
+            for field, value in current.items()
+        )
+        if drifted:
+            _upsert_snapshot(user_id, day, totals, scores)
+    return drifted
+
 def get_score_history(user_id: str, start_date: datetime, end_date: datetime) -> list[dict[str, float | str]]:
     supabase = get_supabase_client()
     if supabase is None:
@@ -373,24 +476,163 @@ def get_score_history(user_id: str, start_date: datetime, end_date: datetime) ->
     return rows
 
 
-def snapshot_active_users(target_date: date_type | None = None, lookback_days: int = 30) -> int:
+def _iter_active_user_ids_fallback(supabase, since: str, after: str | None) -> Iterator[str]:
+    while True:
+        query = (
+            supabase.table(EVENTS_TABLE)
+            .select("user_id")
+            .gte("timestamp", since)
+            .order("user_id", desc=False)
+            .limit(1)
+        )
+        if after:
+            query = query.gt("user_id", after)
+        rows = query.execute().data or []
+        if not rows or not rows[0].get("user_id"):
+            return
+        after = str(rows[0]["user_id"])
+        yield after
+
+
+def iter_active_user_ids(
+    since: date_type, page_size: int = ACTIVE_USER_PAGE_SIZE, after: str | None = None
+) -> Iterator[str]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    target = target_date or datetime.utcnow().date()
-    since = (target - timedelta(days=max(1, lookback_days))).isoformat()
-    resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("user_id")
-        .gte("timestamp", since)
+    since_key = since.isoformat()
+    while True:
+        try:
+            response = supabase.rpc(
+                ACTIVE_USERS_RPC, {"since": since_key, "after_id": after, "page_size": page_size}
+            ).execute()
+        except Exception:
+            yield from _iter_active_user_ids_fallback(supabase, since_key, after)
+            return
+        rows = response.data or []
+        for row in rows:
+            if row.get("user_id"):
+                after = str(row["user_id"])
+                yield after
+        if len(rows) < page_size:
+            return
+
+
+def _compute_batch_totals(
+    user_ids: list[str], day: datetime
+) -> dict[str, tuple[dict[str, float], float]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    start, end = _day_bounds(day)
+    totals = {user_id: _empty_totals() for user_id in user_ids}
+    projection = SNAPSHOT_EVENT_PROJECTION.with_columns("id", "user_id")
+    after: str | None = None
+    while True:
+        query = (
+            supabase.table(EVENTS_TABLE)
+            .select(projection.select_clause())
+            .in_("user_id", user_ids)
+            .gte("timestamp", start.isoformat())
+            .lte("timestamp", end.isoformat())
+            .order("id", desc=False)
+            .limit(SNAPSHOT_EVENT_PAGE_SIZE)
+        )
+        if after:
+            query = query.gt("id", after)
+        rows = [projection.shape(row) for row in query.execute().data or []]
+        for row in rows:
+            user_totals = totals.get(str(row.get("user_id")))
+            if user_totals is not None:
+                _accumulate_event(
+                    user_totals, row.get("event_type"), row.get("category"), row.get("amount"), row.get("scores")
+                )
+        if len(rows) < SNAPSHOT_EVENT_PAGE_SIZE:
+            break
+        after = str(rows[-1].get("id"))
+    movement_resp = (
+        supabase.table(MOVEMENT_TABLE)
+        .select("user_id,total_movement_score")
+        .in_("user_id", user_ids)
+        .eq("date", day.date().isoformat())
         .execute()
     )
-    rows = resp.data or []
-    user_ids = {row.get("user_id") for row in rows if row.get("user_id")}
+    movement = {
+        str(row.get("user_id")): _safe_float(row.get("total_movement_score")) or 0.0
+        for row in movement_resp.data or []
+    }
+    return {user_id: (totals[user_id], movement.get(user_id, 0.0)) for user_id in user_ids}
+
+
+def save_daily_snapshots(
+    user_ids: list[str], day: datetime, timings: dict[str, float] | None = None
+) -> int:
+    if not user_ids:
+        return 0
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    day_key = day.date().isoformat()
+    with ExitStack() as stack:
+        for lock in _snapshot_locks.locks_for((user_id, day_key) for user_id in user_ids):
+            stack.enter_context(lock)
+        started = time.monotonic()
+        batch = _compute_batch_totals(user_ids, day)
+        payloads = [
+            _snapshot_payload(user_id, day, totals, _scores_from_totals(totals, movement_score))
+            for user_id, (totals, movement_score) in batch.items()
+        ]
+        computed = time.monotonic()
+        supabase.table(SCORE_SNAPSHOTS_TABLE).upsert(payloads, on_conflict="user_id,date").execute()
+        written = time.monotonic()
+    if timings is not None:
+        timings["compute"] = timings.get("compute", 0.0) + computed - started
+        timings["write"] = timings.get("write", 0.0) + written - computed
+    return len(payloads)
+
+
+def snapshot_active_users(
+    target_date: date_type | None = None,
+    lookback_days: int = 30,
+    workers: int = 4,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+    timings: dict[str, float] | None = None,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    target = target_date or datetime.utcnow().date()
+    since = target - timedelta(days=max(1, lookback_days))
+    day = datetime.combine(target, datetime.min.time())
+    batch_size = max(1, int(batch_size))
+    phase_timings: dict[str, float] = {"discover": 0.0, "compute": 0.0, "write": 0.0}
+    timings_lock = Lock()
+
+    def _run(user_ids: list[str]) -> int:
+        batch_timings: dict[str, float] = {}
+        count = save_daily_snapshots(user_ids, day, batch_timings)
+        with timings_lock:
+            for name, value in batch_timings.items():
+                phase_timings[name] += value
+        if on_batch is not None:
+            on_batch(count)
+        return count
+
+    users = iter_active_user_ids(since)
+    in_flight: deque[Future] = deque()
+    max_in_flight = max(1, workers) * 2
     count = 0
-    for user_id in user_ids:
-        save_daily_snapshot(str(user_id), datetime.combine(target, datetime.min.time()))
-        count += 1
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            started = time.monotonic()
+            user_ids = [user_id for _, user_id in zip(range(batch_size), users)]
+            phase_timings["discover"] += time.monotonic() - started
+            if not user_ids:
+                break
+            if len(in_flight) >= max_in_flight:
+                count += in_flight.popleft().result()
+            in_flight.append(pool.submit(_run, user_ids))
+        count += sum(future.result() for future in in_flight)
+    if timings is not None:
+        timings.update({name: round(value, 3) for name, value in phase_timings.items()})
     return count
 
 
@@ -415,26 +657,30 @@ def _pct_change(current: float, previous: float) -> float:
     return round(((current - previous) / previous) * 100.0, 2)
 
 
+def _sum_movement(rows: list[dict[str, Any]]) -> tuple[float, float]:
+    steps = sum(float(row.get("steps") or 0) for row in rows)
+    workouts = sum(float(row.get("workout_count") or 0) for row in rows)
+    return steps, workouts
+
+
 def _movement_totals(
     user_id: str, start_date: datetime, end_date: datetime
 ) -> tuple[float, float]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    start = start_date.date().isoformat()
-    end = end_date.date().isoformat()
-    response = (
-        supabase.table(MOVEMENT_TABLE)
-        .select("steps,workout_count")
-        .eq("user_id", user_id)
-        .gte("date", start)
-        .lte("date", end)
-        .execute()
-    )
-    rows = response.data or []
-    steps = sum(float(row.get("steps") or 0) for row in rows)
-    workouts = sum(float(row.get("workout_count") or 0) for row in rows)
-    return steps, workouts
+    response = _movement_query(supabase, user_id, start_date, end_date, "steps,workout_count").execute()
+    return _sum_movement(response.data or [])
+
+
+async def _movement_totals_async(
+    user_id: str, start_date: datetime, end_date: datetime
+) -> tuple[float, float]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    response = await _movement_query(client, user_id, start_date, end_date, "steps,workout_count").execute()
+    return _sum_movement(response.data or [])
 
 
 def _wellness_avg(rows: list[dict[str, Any]]) -> float:
@@ -464,12 +710,13 @@ def _swaps_from_rows(rows: list[dict[str, Any]]) -> tuple[int, float]:
     return swaps, round(savings, 2)
 
 
-def get_dashboard_stats(user_id: str, period: str = "week") -> dict[str, Any]:
-    current_start, current_end, previous_start, previous_end = _period_bounds(period)
-
-    current_rows = _fetch_events(user_id, current_start, current_end, None)
-    previous_rows = _fetch_events(user_id, previous_start, previous_end, None)
-
+def _dashboard_stats(
+    period: str,
+    current_rows: list[dict[str, Any]],
+    previous_rows: list[dict[str, Any]],
+    current_movement: tuple[float, float],
+    previous_movement: tuple[float, float],
+) -> dict[str, Any]:
     def spending_total(rows: list[dict[str, Any]]) -> float:
         return round(
             sum(
@@ -491,8 +738,8 @@ def get_dashboard_stats(user_id: str, period: str = "week") -> dict[str, Any]:
     current_meals = meals_logged(current_rows)
     previous_meals = meals_logged(previous_rows)
 
-    current_steps, current_workouts = _movement_totals(user_id, current_start, current_end)
-    previous_steps, previous_workouts = _movement_totals(user_id, previous_start, previous_end)
+    current_steps, current_workouts = current_movement
+    previous_steps, previous_workouts = previous_movement
 
     current_wellness = _wellness_avg(current_rows)
     previous_wellness = _wellness_avg(previous_rows)
@@ -542,6 +789,104 @@ def get_dashboard_stats(user_id: str, period: str = "week") -> dict[str, Any]:
     }
 
 
+def get_dashboard_stats(user_id: str, period: str = "week") -> dict[str, Any]:
+    current_start, current_end, previous_start, previous_end = _period_bounds(period)
+    results = gather_queries(
+        {
+            "current_events": lambda: _fetch_events(user_id, current_start, current_end, None),
+            "previous_events": lambda: _fetch_events(user_id, previous_start, previous_end, None),
+            "current_movement": lambda: _movement_totals(user_id, current_start, current_end),
+            "previous_movement": lambda: _movement_totals(user_id, previous_start, previous_end),
+        }
+    )
+    return _dashboard_stats(
+        period,
+        results["current_events"],
+        results["previous_events"],
+        results["current_movement"],
+        results["previous_movement"],
+    )
+
+
+def _utc_naive(value: Any) -> datetime | None:
+    parsed = _parse_timestamp(value)
+    if parsed is not None and parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def get_dashboard_stats_for_users(user_ids: list[str], period: str = "week") -> dict[str, dict[str, Any]]:
+    current_start, current_end, previous_start, previous_end = _period_bounds(period)
+    current_from = current_start.date().isoformat()
+    events: dict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = {
+        user_id: ([], []) for user_id in user_ids
+    }
+    movement = {user_id: ([], []) for user_id in user_ids}
+
+    def _load_events() -> None:
+        for chunk in chunked(user_ids):
+            for row in iter_events(chunk, ANALYTICS_EVENT_PROJECTION, previous_start, current_end):
+                buckets = events.get(str(row.get("user_id")))
+                timestamp = _utc_naive(row.get("timestamp"))
+                if buckets is None or timestamp is None:
+                    continue
+                if timestamp >= current_start:
+                    buckets[0].append(row)
+                elif timestamp <= previous_end:
+                    buckets[1].append(row)
+
+    def _load_movement() -> None:
+        rows = fetch_rows_in(
+            MOVEMENT_TABLE,
+            "user_id,date,steps,workout_count",
+            "user_id",
+            user_ids,
+            lambda query: query.gte("date", previous_start.date().isoformat()).lte(
+                "date", current_end.date().isoformat()
+            ),
+            order=("user_id", "date"),
+        )
+        for row in rows:
+            buckets = movement.get(str(row.get("user_id")))
+            if buckets is not None:
+                buckets[0 if str(row.get("date")) >= current_from else 1].append(row)
+
+    gather_queries({"events": _load_events, "movement": _load_movement})
+    return {
+        user_id: _dashboard_stats(
+            period,
+            events[user_id][0],
+            events[user_id][1],
+            _sum_movement(movement[user_id][0]),
+            _sum_movement(movement[user_id][1]),
+        )
+        for user_id in user_ids
+    }
+
+
+async def get_dashboard_stats_async(user_id: str, period: str = "week") -> dict[str, Any]:
+    current_start, current_end, previous_start, previous_end = _period_bounds(period)
+    results = await gather_queries_async(
+        {
+            "current_events": lambda: fetch_events_async(
+                user_id, ANALYTICS_EVENT_PROJECTION, current_start, current_end
+            ),
+            "previous_events": lambda: fetch_events_async(
+                user_id, ANALYTICS_EVENT_PROJECTION, previous_start, previous_end
+            ),
+            "current_movement": lambda: _movement_totals_async(user_id, current_start, current_end),
+            "previous_movement": lambda: _movement_totals_async(user_id, previous_start, previous_end),
+        }
+    )
+    return _dashboard_stats(
+        period,
+        results["current_events"],
+        results["previous_events"],
+        results["current_movement"],
+        results["previous_movement"],
+    )
+
+
 def _date_series(start_date: datetime, end_date: datetime) -> list[date_type]:
     days = (end_date.date() - start_date.date()).days + 1
     return [start_date.date() + timedelta(days=i) for i in range(days)]
@@ -0,0 +1,45 @@
+from typing import Any, Callable, Iterable, Iterator
+
+from db.supabase import get_supabase_client
+
+IN_FILTER_CHUNK = 100
+BATCH_PAGE_SIZE = 1000
+
+
+def chunked(values: Iterable[str], size: int = IN_FILTER_CHUNK) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fetch_rows_in(
+    table: str,
+    fields: str,
+    column: str,
+    values: Iterable[str],
+    filters: Callable[[Any], Any] | None = None,
+    order: tuple[str, ...] = ("id",),
+) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    rows: list[dict[str, Any]] = []
+    for chunk in chunked(sorted({str(value) for value in values if value})):
+        offset = 0
+        while True:
+            query = supabase.table(table).select(fields).in_(column, chunk)
+            if filters is not None:
+                query = filters(query)
+            for field in order:
+                query = query.order(field, desc=False)
+            page = query.range(offset, offset + BATCH_PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < BATCH_PAGE_SIZE:
+                break
+            offset += BATCH_PAGE_SIZE
+    return rows
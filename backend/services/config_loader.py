@@ -3,6 +3,8 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from services.scoring_ruleset import ScoringRuleset, compile_ruleset
+
 
 def _config_path() -> Path:
     return Path(__file__).resolve().parents[1] / "config" / "scoring_rules.json"
@@ -17,10 +19,16 @@ def get_scoring_rules() -> dict[str, Any]:
         return json.load(file)
 
 
+@lru_cache(maxsize=1)
+def get_scoring_ruleset() -> ScoringRuleset:
+    return compile_ruleset(get_scoring_rules())
+
+
 def update_scoring_rules(payload: dict[str, Any]) -> dict[str, Any]:
     path = _config_path()
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as file:
         json.dump(payload, file, indent=2, sort_keys=True)
     get_scoring_rules.cache_clear()
+    get_scoring_ruleset.cache_clear()
     return payload
@@ -0,0 +1,288 @@
+from datetime import date as date_type, datetime
+from typing import Any, Iterable
+
+from db.supabase import get_async_supabase_client, get_supabase_client
+from services.batch_fetch import chunked
+from services.event_query import EventProjection, fetch_events, iter_events
+from services.lock_stripes import LockStripes
+
+DAILY_ROLLUPS_TABLE = "daily_rollups"
+ROLLUP_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "amount", "timestamp"),
+    metadata_keys=("category", "duration_minutes", "nutrition_quality_score"),
+    scores_keys=("wellness_impact", "sustainability_impact"),
+)
+ROLLUP_PAGE_SIZE = 1000
+ROLLUP_LOCK_STRIPES = 256
+ROLLUP_COUNTER_FIELDS = (
+    "event_count",
+    "spending_total",
+    "spending_count",
+    "wellness_sum",
+    "wellness_count",
+    "sustainability_sum",
+    "sustainability_count",
+    "movement_minutes",
+    "movement_count",
+)
+ROLLUP_MAP_FIELDS = ("spending_by_category", "food_quality", "activity_minutes")
+ACTIVITY_LABELS = {
+    "movement": "Movement",
+    "work": "Work",
+    "study": "Study",
+    "social": "Social",
+    "sleep": "Sleep",
+    "habit": "Habits",
+    "break": "Break",
+}
+
+_rollup_locks = LockStripes(ROLLUP_LOCK_STRIPES)
+
+
+def _safe_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except Exception:
+            return None
+    return None
+
+
+def _quality_bucket(quality: float) -> str:
+    if quality >= 8:
+        return "Excellent"
+    if quality >= 6:
+        return "Good"
+    if quality >= 4:
+        return "Fair"
+    return "Poor"
+
+
+def _counter_value(field: str, value: float) -> int | float:
+    return int(value) if field.endswith("_count") else round(float(value), 4)
+
+
+def empty_rollup() -> dict[str, Any]:
+    return {
+        **{field: 0 if field.endswith("_count") else 0.0 for field in ROLLUP_COUNTER_FIELDS},
+        **{field: {} for field in ROLLUP_MAP_FIELDS},
+    }
+
+
+def _add_to_map(values: dict[str, Any], key: str, amount: float, sign: int) -> None:
+    total = values.get(key, 0) + sign * amount
+    if sign < 0 and abs(total) < 1e-9:
+        values.pop(key, None)
+    else:
+        values[key] = total
+
+
+def accumulate_rollup(rollup: dict[str, Any], row: dict[str, Any], sign: int = 1) -> None:
+    raw_type = row.get("event_type") or ""
+    event_type = raw_type.lower()
+    amount = _safe_float(row.get("amount"))
+    scores = row.get("scores") or {}
+    metadata = row.get("metadata") or {}
+    rollup["event_count"] += sign
+
+    if event_type == "spending" and amount is not None:
+        rollup["spending_total"] += sign * abs(amount)
+        rollup["spending_count"] += sign
+    wellness = _safe_float(scores.get("wellness_impact"))
+    if wellness is not None:
+        rollup["wellness_sum"] += sign * wellness
+        rollup["wellness_count"] += sign
+    sustainability = _safe_float(scores.get("sustainability_impact"))
+    if sustainability is not None:
+        rollup["sustainability_sum"] += sign * sustainability
+        rollup["sustainability_count"] += sign
+    if event_type == "movement":
+        minutes = _safe_float(metadata.get("duration_minutes")) or amount
+        if minutes is not None:
+            rollup["movement_minutes"] += sign * minutes
+            rollup["movement_count"] += sign
+
+    if raw_type == "spending":
+        category = str(metadata.get("category") or "Other")
+        _add_to_map(rollup["spending_by_category"], category, abs(amount or 0.0), sign)
+    if raw_type == "food":
+        quality = _safe_float(metadata.get("nutrition_quality_score"))
+        if quality is None:
+            quality = wellness
+        if quality is not None:
+            _add_to_map(rollup["food_quality"], _quality_bucket(quality), 1, sign)
+    if raw_type in ACTIVITY_LABELS:
+        minutes = _safe_float(metadata.get("duration_minutes"))
+        if minutes is None and amount is not None:
+            minutes = amount * 60 if raw_type == "sleep" and amount <= 24 else amount
+        if minutes is not None:
+            _add_to_map(rollup["activity_minutes"], ACTIVITY_LABELS[raw_type], minutes, sign)
+
+
+def build_daily_rollups(rows: Iterable[dict[str, Any]]) -> dict[date_type, dict[str, Any]]:
+    rollups: dict[date_type, dict[str, Any]] = {}
+    for row in rows:
+        ts = _parse_timestamp(row.get("timestamp"))
+        if ts is None:
+            continue
+        accumulate_rollup(rollups.setdefault(ts.date(), empty_rollup()), row)
+    return rollups
+
+
+def rollup_payload(user_id: str, day: date_type, rollup: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "date": day.isoformat(),
+        **{field: _counter_value(field, rollup[field]) for field in ROLLUP_COUNTER_FIELDS},
+        **{field: rollup[field] for field in ROLLUP_MAP_FIELDS},
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+
+
+def upsert_daily_rollups(payloads: list[dict[str, Any]]) -> int:
+    if not payloads:
+        return 0
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    supabase.table(DAILY_ROLLUPS_TABLE).upsert(payloads, on_conflict="user_id,date").execute()
+    return len(payloads)
+
+
+def _store_rollup(supabase, user_id: str, day: date_type, rollup: dict[str, Any] | None) -> dict[str, Any] | None:
+    if rollup is None or rollup["event_count"] <= 0:
+        supabase.table(DAILY_ROLLUPS_TABLE).delete().eq("user_id", user_id).eq("date", day.isoformat()).execute()
+        return None
+    payload = rollup_payload(user_id, day, rollup)
+    upsert_daily_rollups([payload])
+    return payload
+
+
+def _rollup_from_row(row: dict[str, Any]) -> dict[str, Any]:
+    rollup = empty_rollup()
+    for field in ROLLUP_COUNTER_FIELDS:
+        value = _safe_float(row.get(field))
+        if value is not None:
+            rollup[field] = int(value) if field.endswith("_count") else value
+    for field in ROLLUP_MAP_FIELDS:
+        rollup[field] = dict(row.get(field) or {})
+    return rollup
+
+
+def refresh_daily_rollup(user_id: str, day: date_type) -> dict[str, Any] | None:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    start = datetime.combine(day, datetime.min.time())
+    end = datetime.combine(day, datetime.max.time())
+    with _rollup_locks.lock_for((user_id, day.isoformat())):
+        rows = fetch_events(user_id, ROLLUP_EVENT_PROJECTION, start, end)
+        return _store_rollup(supabase, user_id, day, build_daily_rollups(rows).get(day))
+
+
+def apply_rollup_deltas(
+    user_id: str,
+    day: date_type,
+    added: Iterable[dict[str, Any]] = (),
+    removed: Iterable[dict[str, Any]] = (),
+) -> bool:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    with _rollup_locks.lock_for((user_id, day.isoformat())):
+        rows = (
+            supabase.table(DAILY_ROLLUPS_TABLE)
+            .select("*")
+            .eq("user_id", user_id)
+            .eq("date", day.isoformat())
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+        if not rows:
+            return False
+        rollup = _rollup_from_row(rows[0])
+        for row in removed:
+            accumulate_rollup(rollup, row, -1)
+        for row in added:
+            accumulate_rollup(rollup, row)
+        _store_rollup(supabase, user_id, day, rollup)
+    return True
+
+
+def _rollups_page_query(
+    client, user_id: str, start_date: date_type, end_date: date_type, fields: str, after: str | None
+):
+    query = (
+        client.table(DAILY_ROLLUPS_TABLE)
+        .select(fields if fields == "*" else f"date,{fields}")
+        .eq("user_id", user_id)
+        .gte("date", start_date.isoformat())
+        .lte("date", end_date.isoformat())
+        .order("date", desc=False)
+        .limit(ROLLUP_PAGE_SIZE)
+    )
+    if after:
+        query = query.gt("date", after)
+    return query
+
+
+def fetch_daily_rollups(
+    user_id: str, start_date: date_type, end_date: date_type, fields: str = "*"
+) -> list[dict[str, Any]]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    rows: list[dict[str, Any]] = []
+    after: str | None = None
+    while True:
+        page = _rollups_page_query(supabase, user_id, start_date, end_date, fields, after).execute().data or []
+        rows.extend(page)
+        if len(page) < ROLLUP_PAGE_SIZE:
+            return rows
+        after = str(page[-1].get("date"))
+
+
+async def fetch_daily_rollups_async(
+    user_id: str, start_date: date_type, end_date: date_type, fields: str = "*"
+) -> list[dict[str, Any]]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    rows: list[dict[str, Any]] = []
+    after: str | None = None
+    while True:
+        response = await _rollups_page_query(client, user_id, start_date, end_date, fields, after).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < ROLLUP_PAGE_SIZE:
+            return rows
+        after = str(page[-1].get("date"))
+
+
+def rebuild_daily_rollups(user_id: str, since: date_type | None = None) -> int:
+    start = datetime.combine(since, datetime.min.time()) if since is not None else None
+    rollups = build_daily_rollups(iter_events(user_id, ROLLUP_EVENT_PROJECTION, start))
+    payloads = [rollup_payload(user_id, day, rollup) for day, rollup in sorted(rollups.items())]
+    for offset in range(0, len(payloads), ROLLUP_PAGE_SIZE):
+        upsert_daily_rollups(payloads[offset : offset + ROLLUP_PAGE_SIZE])
+    rebuilt = {payload["date"] for payload in payloads}
+    existing = fetch_daily_rollups(user_id, since or date_type(1970, 1, 1), date_type.max, "user_id")
+    stale = sorted({str(row.get("date")) for row in existing} - rebuilt)
+    if stale:
+        supabase = get_supabase_client()
+        for chunk in chunked(stale):
+            supabase.table(DAILY_ROLLUPS_TABLE).delete().eq("user_id", user_id).in_("date", chunk).execute()
+    return len(payloads)
@@ -7,6 +7,7 @@ from typing import Any
 
 from db.supabase import get_supabase_client
 from services.email_service import send_account_deletion_email
+from services.friend_graph import friend_ids, invalidate_friend_graph
 
 PROFILES_TABLE = "profiles"
 PRIVACY_TABLE = "privacy_settings"
@@ -118,6 +119,7 @@ def delete_user_account(user_id: str, confirm_token: str) -> datetime:
         "updated_at": datetime.utcnow().isoformat(),
     }
     supabase.table(PRIVACY_TABLE).upsert(privacy_payload, on_conflict="user_id").execute()
+    _safe_delete("social_timelines", "actor_id", user_id)
     _safe_delete("user_activities", "user_id", user_id)
     return scheduled_for
 
@@ -186,21 +188,29 @@ def permanently_delete_user(user_id: str) -> None:
     _safe_delete("movement_test_insights", "user_id", user_id)
     _safe_delete("activity_logs", "user_id", user_id)
     _safe_delete("score_snapshots", "user_id", user_id)
+    _safe_delete("daily_rollups", "user_id", user_id)
+    _safe_delete("mosaic_snapshots", "user_id", user_id)
     _safe_delete("risk_history", "user_id", user_id)
     _safe_delete("decisions", "user_id", user_id)
     _safe_delete("swap_history", "user_id", user_id)
     _safe_delete("swap_feedback", "user_id", user_id)
     _safe_delete("goal_participants", "user_id", user_id)
     _safe_delete("shared_goals", "creator_id", user_id)
+    _safe_delete("social_timelines", "owner_id", user_id)
+    _safe_delete("social_timeline_sources", "owner_id", user_id)
+    _safe_delete("social_timelines", "actor_id", user_id)
     _safe_delete("user_activities", "user_id", user_id)
     _safe_delete("achievements", "user_id", user_id)
+    _safe_delete("achievement_counters", "user_id", user_id)
     _safe_delete("notification_preferences", "user_id", user_id)
     _safe_delete("alerts", "user_id", user_id)
     _safe_delete("privacy_settings", "user_id", user_id)
     _safe_delete("user_settings", "user_id", user_id)
     _safe_delete("data_export_jobs", "user_id", user_id)
+    friends = friend_ids(user_id)
     _safe_delete("friendships", "user_id", user_id)
     _safe_delete("friendships", "friend_id", user_id)
+    invalidate_friend_graph([user_id, *friends])
     checkins = _require_supabase().table("voice_checkins").select("id").eq("user_id", user_id).execute()
     checkin_ids = [str(row.get("id")) for row in (checkins.data or []) if row.get("id")]
     _safe_delete_in("voice_checkin_insights", "checkin_id", checkin_ids)
@@ -9,6 +9,8 @@ from typing import Any
 from uuid import uuid4
 
 from db.supabase import get_supabase_client
+from services.event_query import FULL_EVENT, iter_events
+from services.query_gather import gather_queries
 
 EXPORTS_TABLE = "data_export_jobs"
 
@@ -51,34 +53,72 @@ def _fetch_contains(table: str, field: str, values: list[str], fields: str = "*"
     return _safe_select(supabase.table(table).select(fields).contains(field, values))
 
 
+def _fetch_events(user_id: str) -> list[dict[str, Any]]:
+    try:
+        return list(iter_events(user_id, FULL_EVENT))
+    except Exception:
+        return []
+
+
 def _export_payload(user_id: str) -> dict[str, Any]:
-    profile = _fetch_by_field("profiles", "id", user_id, "id,display_name,profile_type,created_at,updated_at")
-    privacy = _fetch_by_user(
-        "privacy_settings",
-        user_id,
-        "profile_visibility,activity_sharing,data_analytics_consent,updated_at,created_at",
+    results = gather_queries(
+        {
+            "profile": lambda: _fetch_by_field(
+                "profiles", "id", user_id, "id,display_name,profile_type,created_at,updated_at"
+            ),
+            "privacy": lambda: _fetch_by_user(
+                "privacy_settings",
+                user_id,
+                "profile_visibility,activity_sharing,data_analytics_consent,updated_at,created_at",
+            ),
+            "settings": lambda: _fetch_by_user("user_settings", user_id, "*"),
+            "events": lambda: _fetch_events(user_id),
+            "movement": lambda: _fetch_by_user("movement_patterns", user_id, "*"),
+            "movement_tests": lambda: _fetch_by_user("movement_tests", user_id, "*"),
+            "movement_test_insights": lambda: _fetch_by_user("movement_test_insights", user_id, "*"),
+            "activity_logs": lambda: _fetch_by_user("activity_logs", user_id, "*"),
+            "score_snapshots": lambda: _fetch_by_user("score_snapshots", user_id, "*"),
+            "daily_rollups": lambda: _fetch_by_user("daily_rollups", user_id, "*"),
+            "risk_history": lambda: _fetch_by_user("risk_history", user_id, "*"),
+            "decisions": lambda: _fetch_by_user("decisions", user_id, "*"),
+            "swap_history": lambda: _fetch_by_user("swap_history", user_id, "*"),
+            "swap_feedback": lambda: _fetch_by_user("swap_feedback", user_id, "*"),
+            "shared_goals": lambda: _fetch_by_field("shared_goals", "creator_id", user_id, "*"),
+            "goal_participants": lambda: _fetch_by_user("goal_participants", user_id, "*"),
+            "group_challenges": lambda: _fetch_contains("group_challenges", "participants", [user_id], "*"),
+            "friendships": lambda: _fetch_by_user("friendships", user_id, "*"),
+            "friendships_reverse": lambda: _fetch_by_field("friendships", "friend_id", user_id, "*"),
+            "user_activities": lambda: _fetch_by_user("user_activities", user_id, "*"),
+            "achievements": lambda: _fetch_by_user("achievements", user_id, "*"),
+            "notification_preferences": lambda: _fetch_by_user("notification_preferences", user_id, "*"),
+            "alerts": lambda: _fetch_by_user("alerts", user_id, "*"),
+            "voice_checkins": lambda: _fetch_by_user("voice_checkins", user_id, "*"),
+        }
     )
-    settings = _fetch_by_user("user_settings", user_id, "*")
-    events = _fetch_by_user("events", user_id, "*")
-    movement = _fetch_by_user("movement_patterns", user_id, "*")
-    movement_tests = _fetch_by_user("movement_tests", user_id, "*")
-    movement_test_insights = _fetch_by_user("movement_test_insights", user_id, "*")
-    activity_logs = _fetch_by_user("activity_logs", user_id, "*")
-    score_snapshots = _fetch_by_user("score_snapshots", user_id, "*")
-    risk_history = _fetch_by_user("risk_history", user_id, "*")
-    decisions = _fetch_by_user("decisions", user_id, "*")
-    swap_history = _fetch_by_user("swap_history", user_id, "*")
-    swap_feedback = _fetch_by_user("swap_feedback", user_id, "*")
-    shared_goals = _fetch_by_field("shared_goals", "creator_id", user_id, "*")
-    goal_participants = _fetch_by_user("goal_participants", user_id, "*")
-    group_challenges = _fetch_contains("group_challenges", "participants", [user_id], "*")
-    friendships = _fetch_by_user("friendships", user_id, "*")
-    friendships_reverse = _fetch_by_field("friendships", "friend_id", user_id, "*")
-    user_activities = _fetch_by_user("user_activities", user_id, "*")
-    achievements = _fetch_by_user("achievements", user_id, "*")
-    notification_preferences = _fetch_by_user("notification_preferences", user_id, "*")
-    alerts = _fetch_by_user("alerts", user_id, "*")
-    voice_checkins = _fetch_by_user("voice_checkins", user_id, "*")
+    profile = results["profile"]
+    privacy = results["privacy"]
+    settings = results["settings"]
+    events = results["events"]
+    movement = results["movement"]
+    movement_tests = results["movement_tests"]
+    movement_test_insights = results["movement_test_insights"]
+    activity_logs = results["activity_logs"]
+    score_snapshots = results["score_snapshots"]
+    daily_rollups = results["daily_rollups"]
+    risk_history = results["risk_history"]
+    decisions = results["decisions"]
+    swap_history = results["swap_history"]
+    swap_feedback = results["swap_feedback"]
+    shared_goals = results["shared_goals"]
+    goal_participants = results["goal_participants"]
+    group_challenges = results["group_challenges"]
+    friendships = results["friendships"]
+    friendships_reverse = results["friendships_reverse"]
+    user_activities = results["user_activities"]
+    achievements = results["achievements"]
+    notification_preferences = results["notification_preferences"]
+    alerts = results["alerts"]
+    voice_checkins = results["voice_checkins"]
     checkin_ids = [str(row.get("id")) for row in voice_checkins if row.get("id")]
     voice_insights = _fetch_in("voice_checkin_insights", "checkin_id", checkin_ids, "*")
 
@@ -121,6 +161,7 @@ def _export_payload(user_id: str) -> dict[str, Any]:
         },
         "insights_and_patterns": {
             "score_snapshots": score_snapshots,
+            "daily_rollups": daily_rollups,
             "risk_history": risk_history,
             "movement_patterns": movement,
         },
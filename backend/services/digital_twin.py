@@ -1,11 +1,32 @@
 from datetime import date as date_type, datetime, timedelta
 import calendar
-import math
 from typing import Any
 
-from db.supabase import get_supabase_client
-
-EVENTS_TABLE = "events"
+import numpy as np
+
+from services.event_window import EventWindow, EventWindowLoader, load_event_window
+from services.projection_engine import (
+    Layout,
+    band_columns,
+    daily_counts,
+    daily_sums,
+    date_labels,
+    day_indices,
+    day_offsets,
+    interpolate,
+    linear_path,
+    render,
+    sqrt_band,
+)
+from services.scenario_simulation import DEFAULT_PATHS, simulate_scenarios
+
+HISTORY_DAYS = 90
+LONGTERM_HISTORY_DAYS = 180
+MAX_HORIZON_DAYS = 365
+MAX_HORIZON_MONTHS = 12
+WELLNESS_WEIGHTS = {"sleep": 0.3, "movement": 0.3, "diet": 0.2, "stress": 0.2}
+MEAT_KEYWORDS = {"beef", "pork", "lamb", "chicken", "turkey", "meat", "steak"}
+PLANT_KEYWORDS = {"tofu", "bean", "beans", "lentil", "vegetable", "veggie", "salad"}
 
 
 def _safe_float(value: Any) -> float | None:
@@ -17,24 +38,6 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
-def _parse_ts(value: Any) -> datetime | None:
-    if isinstance(value, datetime):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
-        except Exception:
-            return None
-    return None
-
-
-def _date_key(value: Any) -> str | None:
-    ts = _parse_ts(value)
-    if ts is None:
-        return None
-    return ts.date().isoformat()
-
-
 def _clamp(value: float, minimum: float = 0.0, maximum: float = 100.0) -> float:
     return max(minimum, min(maximum, value))
 
@@ -47,45 +50,23 @@ def _add_months(source: date_type, months: int) -> date_type:
     return date_type(year, month, day)
 
 
-def _safe_avg(values: list[float]) -> float:
-    return sum(values) / float(len(values)) if values else 0.0
-
+def _history_window(
+    user_id: str, start: date_type, end: date_type, window: EventWindow | None
+) -> EventWindow:
+    if window is not None and window.covers(start, end):
+        return window.slice(start, end)
+    return load_event_window(user_id, start, end)
 
 
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    horizon = max(1, int(days))
-    today = datetime.utcnow().date()
-    history_start = today - timedelta(days=90)
-    history_end = today
-
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,timestamp,title")
-        .eq("user_id", user_id)
-        .gte("timestamp", datetime.combine(history_start, datetime.min.time()).isoformat())
-        .lte("timestamp", datetime.combine(history_end, datetime.max.time()).isoformat())
-        .execute()
-    )
-    rows = response.data or []
-
+def _wallet_metadata(events: EventWindow) -> tuple[float | None, float, dict[str, dict[str, Any]]]:
     latest_balance = None
     latest_balance_ts = None
-    net_by_day: dict[str, float] = {}
     swap_savings_total = 0.0
     recurring: dict[str, dict[str, Any]] = {}
 
-    for row in rows:
-        metadata = row.get("metadata") or {}
-        timestamp = row.get("timestamp")
-        ts = _parse_ts(timestamp)
-        if ts is None:
-            continue
-        date_key = ts.date().isoformat()
-        amount = _safe_float(row.get("amount")) or 0.0
-        event_type = (row.get("event_type") or "").lower()
-        category = (row.get("category") or "").lower()
+    for event in events:
+        metadata = event.metadata
+        ts = event.timestamp
 
         current_balance = _safe_float(metadata.get("current_balance"))
         if current_balance is not None:
@@ -93,77 +74,99 @@ def _safe_avg(values: list[float]) -> float:
                 latest_balance_ts = ts
                 latest_balance = current_balance
 
-        if event_type == "spending":
-            net_by_day[date_key] = net_by_day.get(date_key, 0.0) - abs(amount)
-        elif category == "finance":
-            net_by_day[date_key] = net_by_day.get(date_key, 0.0) + amount
-
         savings = _safe_float(metadata.get("money_saved_via_swaps"))
         if savings is None:
             savings = _safe_float(metadata.get("swap_savings"))
         if savings is not None:
             swap_savings_total += max(0.0, savings)
 
-        if event_type == "spending":
+        if event.event_type == "spending":
             recurring_flag = metadata.get("recurring") or metadata.get("is_recurring")
             if recurring_flag:
-                key = str(metadata.get("merchant") or row.get("title") or metadata.get("category") or "Recurring")
+                key = str(metadata.get("merchant") or event.title or metadata.get("category") or "Recurring")
                 cadence_days = int(_safe_float(metadata.get("recurring_interval_days")) or 30)
                 entry = recurring.setdefault(
                     key,
                     {
                         "name": key,
                         "amounts": [],
-                        "last_date": ts.date(),
+                        "last_date": event.day,
                         "cadence_days": cadence_days,
                         "next_due": metadata.get("next_due_date"),
                     },
                 )
-                entry["amounts"].append(abs(amount))
-                if ts.date() > entry["last_date"]:
-                    entry["last_date"] = ts.date()
+                entry["amounts"].append(abs(event.amount or 0.0))
+                if event.day > entry["last_date"]:
+                    entry["last_date"] = event.day
                 if entry["cadence_days"] != cadence_days:
                     entry["cadence_days"] = cadence_days
 
+    return latest_balance, swap_savings_total, recurring
+
+
+def _wallet_daily(
+    events: EventWindow, history_start: date_type, days: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    indices = day_indices(events.ordinals, history_start)
+    amounts = np.nan_to_num(events.amount_values)
+    spending = events.type_mask("spending")
+    finance = ~spending & events.category_mask("finance")
+    spend = daily_sums(indices[spending], np.abs(amounts[spending]), days)
+    income = daily_sums(indices[finance], amounts[finance], days)
+    active = daily_counts(indices[spending | finance], days) > 0
+    return spend, income, active
+
+
+def _wallet_shortterm_model(user_id: str, days: int, window: EventWindow | None) -> dict[str, Any]:
+    horizon = max(1, min(MAX_HORIZON_DAYS, int(days)))
+    today = datetime.utcnow().date()
+    history_start = today - timedelta(days=HISTORY_DAYS)
+    events = _history_window(user_id, history_start, today, window)
+
+    latest_balance, swap_savings_total, recurring = _wallet_metadata(events)
+    spend, income, active = _wallet_daily(events, history_start, HISTORY_DAYS + 1)
+    net = income - spend
     if latest_balance is None:
-        latest_balance = sum(net_by_day.values())
+        latest_balance = float(net.sum())
 
-    lookback_days = max(1, min(30, len(net_by_day) or 1))
-    lookback_start = today - timedelta(days=lookback_days - 1)
-    daily_nets = [
-        net_by_day.get((lookback_start + timedelta(days=offset)).isoformat(), 0.0)
-        for offset in range(lookback_days)
-    ]
-    total_net = sum(daily_nets)
-    average_daily_net = total_net / float(lookback_days)
+    lookback_days = max(1, min(30, int(np.count_nonzero(active)) or 1))
+    daily_nets = net[-lookback_days:]
+    average_daily_net = float(daily_nets.mean())
     savings_per_day = swap_savings_total / float(max(1, lookback_days))
-    mean_net = average_daily_net
-    variance = _safe_avg([(value - mean_net) ** 2 for value in daily_nets])
-    std_daily = math.sqrt(variance)
-
-    trajectories = {"current": [], "with_swaps": []}
-    for offset in range(horizon + 1):
-        date_value = today + timedelta(days=offset)
-        balance = latest_balance + average_daily_net * offset
-        with_swaps = latest_balance + (average_daily_net + savings_per_day) * offset
-        interval = std_daily * math.sqrt(max(1, offset))
-        point = {
-            "date": date_value.isoformat(),
-            "balance": round(balance, 2),
-            "lower": round(balance - interval, 2),
-            "upper": round(balance + interval, 2),
-        }
-        swap_point = {
-            "date": date_value.isoformat(),
-            "balance": round(with_swaps, 2),
-            "lower": round(with_swaps - interval, 2),
-            "upper": round(with_swaps + interval, 2),
-        }
-        trajectories["current"].append(point)
-        trajectories["with_swaps"].append(swap_point)
+
+    offsets = day_offsets(horizon)
+    return {
+        "today": today,
+        "horizon": horizon,
+        "offsets": offsets,
+        "dates": date_labels(today, offsets),
+        "latest_balance": float(latest_balance),
+        "daily_nets": daily_nets,
+        "average_daily_net": average_daily_net,
+        "savings_per_day": savings_per_day,
+        "recurring": recurring,
+        "current": linear_path(latest_balance, average_daily_net, offsets),
+        "with_swaps": linear_path(latest_balance, average_daily_net + savings_per_day, offsets),
+        "interval": sqrt_band(float(daily_nets.std()), offsets),
+    }
+
+
+def project_wallet_shortterm(
+    user_id: str,
+    days: int = 30,
+    window: EventWindow | None = None,
+    layout: Layout = "points",
+) -> dict[str, Any]:
+    model = _wallet_shortterm_model(user_id, days, window)
+    today = model["today"]
+    dates = model["dates"]
+    trajectories = {
+        "current": render(dates, band_columns(model["current"], model["interval"]), layout),
+        "with_swaps": render(dates, band_columns(model["with_swaps"], model["interval"]), layout),
+    }
 
     recurring_expenses = []
-    for entry in recurring.values():
+    for entry in model["recurring"].values():
         cadence_days = max(1, int(entry.get("cadence_days") or 30))
         last_date = entry.get("last_date") or today
         next_due = entry.get("next_due")
@@ -184,163 +187,67 @@ def _safe_avg(values: list[float]) -> float:
     recurring_expenses.sort(key=lambda item: item["next_due"])
 
     return {
-        "current_balance": round(float(latest_balance), 2),
+        "current_balance": round(model["latest_balance"], 2),
         "trajectories": trajectories,
         "recurring_expenses": recurring_expenses,
-        "savings_potential": round(savings_per_day * horizon, 2),
+        "savings_potential": round(model["savings_per_day"] * model["horizon"], 2),
     }
 
 
-def project_wallet_longterm(user_id: str, months: int = 3) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    horizon_months = max(3, min(6, int(months)))
+def project_wallet_longterm(
+    user_id: str,
+    months: int = 3,
+    window: EventWindow | None = None,
+    layout: Layout = "points",
+) -> dict[str, Any]:
+    horizon_months = max(3, min(MAX_HORIZON_MONTHS, int(months)))
     today = datetime.utcnow().date()
-    history_start = today - timedelta(days=180)
-    history_end = today
-
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,timestamp,title")
-        .eq("user_id", user_id)
-        .gte("timestamp", datetime.combine(history_start, datetime.min.time()).isoformat())
-        .lte("timestamp", datetime.combine(history_end, datetime.max.time()).isoformat())
-        .execute()
-    )
-    rows = response.data or []
-
-    latest_balance = None
-    latest_balance_ts = None
-    net_by_day: dict[str, float] = {}
-    income_by_day: dict[str, float] = {}
-    spend_by_day: dict[str, float] = {}
-    swap_savings_total = 0.0
-    recurring: dict[str, dict[str, Any]] = {}
-
-    for row in rows:
-        metadata = row.get("metadata") or {}
-        timestamp = row.get("timestamp")
-        ts = _parse_ts(timestamp)
-        if ts is None:
-            continue
-        date_key = ts.date().isoformat()
-        amount = _safe_float(row.get("amount")) or 0.0
-        event_type = (row.get("event_type") or "").lower()
-        category = (row.get("category") or "").lower()
-
-        current_balance = _safe_float(metadata.get("current_balance"))
-        if current_balance is not None:
-            if latest_balance_ts is None or ts > latest_balance_ts:
-                latest_balance_ts = ts
-                latest_balance = current_balance
-
-        if event_type == "spending":
-            net_by_day[date_key] = net_by_day.get(date_key, 0.0) - abs(amount)
-            spend_by_day[date_key] = spend_by_day.get(date_key, 0.0) + abs(amount)
-        elif category == "finance":
-            net_by_day[date_key] = net_by_day.get(date_key, 0.0) + amount
-            income_by_day[date_key] = income_by_day.get(date_key, 0.0) + amount
-
-        savings = _safe_float(metadata.get("money_saved_via_swaps"))
-        if savings is None:
-            savings = _safe_float(metadata.get("swap_savings"))
-        if savings is not None:
-            swap_savings_total += max(0.0, savings)
-
-        if event_type == "spending":
-            recurring_flag = metadata.get("recurring") or metadata.get("is_recurring")
-            if recurring_flag:
-                key = str(metadata.get("merchant") or row.get("title") or metadata.get("category") or "Recurring")
-                cadence_days = int(_safe_float(metadata.get("recurring_interval_days")) or 30)
-                entry = recurring.setdefault(
-                    key,
-                    {
-                        "name": key,
-                        "amounts": [],
-                        "last_date": ts.date(),
-                        "cadence_days": cadence_days,
-                        "next_due": metadata.get("next_due_date"),
-                    },
-                )
-                entry["amounts"].append(abs(amount))
-                if ts.date() > entry["last_date"]:
-                    entry["last_date"] = ts.date()
-                if entry["cadence_days"] != cadence_days:
-                    entry["cadence_days"] = cadence_days
+    history_start = today - timedelta(days=LONGTERM_HISTORY_DAYS)
+    events = _history_window(user_id, history_start, today, window)
 
+    latest_balance, swap_savings_total, recurring = _wallet_metadata(events)
+    spend, income, active = _wallet_daily(events, history_start, LONGTERM_HISTORY_DAYS + 1)
+    net = income - spend
     if latest_balance is None:
-        latest_balance = sum(net_by_day.values())
+        latest_balance = float(net.sum())
 
-    lookback_days = max(1, min(90, len(net_by_day) or 1))
-    lookback_start = today - timedelta(days=lookback_days - 1)
-    daily_nets = [
-        net_by_day.get((lookback_start + timedelta(days=offset)).isoformat(), 0.0)
-        for offset in range(lookback_days)
-    ]
-    daily_income = [
-        income_by_day.get((lookback_start + timedelta(days=offset)).isoformat(), 0.0)
-        for offset in range(lookback_days)
-    ]
-    daily_spend = [
-        spend_by_day.get((lookback_start + timedelta(days=offset)).isoformat(), 0.0)
-        for offset in range(lookback_days)
-    ]
-
-    average_daily_net = _safe_avg(daily_nets)
-    average_daily_income = _safe_avg(daily_income)
-    average_daily_spend = _safe_avg(daily_spend)
+    lookback_days = max(1, min(90, int(np.count_nonzero(active)) or 1))
+    average_daily_net = float(net[-lookback_days:].mean())
+    average_daily_income = float(income[-lookback_days:].mean())
+    average_daily_spend = float(spend[-lookback_days:].mean())
     savings_per_day = swap_savings_total / float(max(1, lookback_days))
-    mean_net = average_daily_net
-    variance = _safe_avg([(value - mean_net) ** 2 for value in daily_nets])
-    std_daily = math.sqrt(variance)
+    std_daily = float(net[-lookback_days:].std())
 
-    trajectories = {"current": [], "with_swaps": []}
-    monthly_breakdown = []
     current_balance = float(latest_balance)
-    current_cumulative = current_balance
-    swap_cumulative = current_balance
-    for month_offset in range(horizon_months + 1):
-        date_value = _add_months(today, month_offset)
-        days = 30 * month_offset
-        balance = current_balance + average_daily_net * days
-        with_swaps = current_balance + (average_daily_net + savings_per_day) * days
-        interval = std_daily * math.sqrt(max(1, days))
-        trajectories["current"].append(
-            {
-                "date": date_value.isoformat(),
-                "balance": round(balance, 2),
-                "lower": round(balance - interval, 2),
-                "upper": round(balance + interval, 2),
-            }
-        )
-        trajectories["with_swaps"].append(
-            {
-                "date": date_value.isoformat(),
-                "balance": round(with_swaps, 2),
-                "lower": round(with_swaps - interval, 2),
-                "upper": round(with_swaps + interval, 2),
-            }
-        )
+    month_offsets = np.arange(horizon_months + 1, dtype=np.int64)
+    month_dates = [_add_months(today, int(offset)) for offset in month_offsets]
+    dates = [value.isoformat() for value in month_dates]
+    day_counts = 30 * month_offsets
+    interval = sqrt_band(std_daily, day_counts)
+    current_path = linear_path(current_balance, average_daily_net, day_counts)
+    swaps_path = linear_path(current_balance, average_daily_net + savings_per_day, day_counts)
+    trajectories = {
+        "current": render(dates, band_columns(current_path, interval), layout),
+        "with_swaps": render(dates, band_columns(swaps_path, interval), layout),
+    }
 
-        if month_offset > 0:
-            month_income = average_daily_income * 30
-            month_spend = average_daily_spend * 30
-            net = month_income - month_spend
-            current_cumulative += net
-            swap_cumulative += net + savings_per_day * 30
-            monthly_breakdown.append(
-                {
-                    "month": date_value.strftime("%Y-%m"),
-                    "projected_income": round(month_income, 2),
-                    "projected_spend": round(month_spend, 2),
-                    "net": round(net, 2),
-                    "cumulative_balance": round(current_cumulative, 2),
-                }
-            )
+    month_income = average_daily_income * 30
+    month_spend = average_daily_spend * 30
+    month_net = month_income - month_spend
+    cumulative = np.round(current_balance + month_net * month_offsets[1:], 2).tolist()
+    monthly_breakdown = [
+        {
+            "month": month_date.strftime("%Y-%m"),
+            "projected_income": round(month_income, 2),
+            "projected_spend": round(month_spend, 2),
+            "net": round(month_net, 2),
+            "cumulative_balance": cumulative_balance,
+        }
+        for month_date, cumulative_balance in zip(month_dates[1:], cumulative)
+    ]
 
     major_expenses = []
-    horizon_date = _add_months(today, horizon_months)
+    horizon_date = month_dates[-1]
     for entry in recurring.values():
         cadence_days = max(1, int(entry.get("cadence_days") or 30))
         last_date = entry.get("last_date") or today
@@ -375,138 +282,115 @@ def project_wallet_longterm(user_id: str, months: int = 3) -> dict[str, Any]:
     }
 
 
-def project_wellness(user_id: str, days: int = 30) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    horizon_days = max(30, min(90, int(days)))
-    today = datetime.utcnow().date()
-    history_start = today - timedelta(days=90)
-    history_end = today
-
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", datetime.combine(history_start, datetime.min.time()).isoformat())
-        .lte("timestamp", datetime.combine(history_end, datetime.max.time()).isoformat())
-        .execute()
-    )
-    rows = response.data or []
-
-    daily = {}
-    for offset in range(90):
-        day = history_start + timedelta(days=offset)
-        daily[day.isoformat()] = {
-            "sleep_hours": 0.0,
-            "movement_minutes": 0.0,
-            "diet_scores": [],
-            "mood_scores": [],
-        }
+def _daily_mean(indices: np.ndarray, values: np.ndarray, days: int, default: float) -> np.ndarray:
+    present = ~np.isnan(values)
+    totals = daily_sums(indices[present], values[present], days)
+    counts = daily_counts(indices[present], days)
+    return np.where(counts > 0, totals / np.maximum(counts, 1), default)
 
-    for row in rows:
-        ts = _parse_ts(row.get("timestamp"))
-        if ts is None:
-            continue
-        date_key = ts.date().isoformat()
-        if date_key not in daily:
-            continue
-        event_type = (row.get("event_type") or "").lower()
-        metadata = row.get("metadata") or {}
-        scores = row.get("scores") or {}
-        amount = _safe_float(row.get("amount")) or 0.0
 
+def _wellness_model(user_id: str, days: int, window: EventWindow | None) -> dict[str, Any]:
+    horizon_days = max(30, min(MAX_HORIZON_DAYS, int(days)))
+    today = datetime.utcnow().date()
+    history_start = today - timedelta(days=HISTORY_DAYS)
+    events = _history_window(user_id, history_start, today, window)
+
+    sleep_hours = np.zeros(len(events))
+    movement_minutes = np.zeros(len(events))
+    diet_values = np.full(len(events), np.nan)
+    mood_values = np.full(len(events), np.nan)
+    for position, event in enumerate(events):
+        event_type = event.event_type
+        metadata = event.metadata
+        amount = event.amount or 0.0
         if event_type == "sleep":
             hours = amount or _safe_float(metadata.get("hours")) or 0.0
-            daily[date_key]["sleep_hours"] += max(0.0, hours)
-        if event_type == "movement":
+            sleep_hours[position] = max(0.0, hours)
+        elif event_type == "movement":
             minutes = _safe_float(metadata.get("duration_minutes")) or amount or 0.0
-            daily[date_key]["movement_minutes"] += max(0.0, minutes)
-        if event_type == "food":
+            movement_minutes[position] = max(0.0, minutes)
+        elif event_type == "food":
             quality = _safe_float(metadata.get("nutrition_quality_score"))
             if quality is None:
-                quality = _safe_float(scores.get("wellness_impact"))
+                quality = _safe_float(event.scores.get("wellness_impact"))
             if quality is not None:
-                if quality <= 10:
-                    daily[date_key]["diet_scores"].append(quality * 10.0)
-                else:
-                    daily[date_key]["diet_scores"].append((quality + 100.0) / 2.0)
-        if event_type == "mood":
-            mood = _safe_float(amount)
-            if mood is not None:
-                daily[date_key]["mood_scores"].append(_clamp(mood * 10.0))
+                diet_values[position] = quality * 10.0 if quality <= 10 else (quality + 100.0) / 2.0
+        elif event_type == "mood":
+            mood_values[position] = _clamp(amount * 10.0)
+
+    indices = day_indices(events.ordinals, history_start)
+    sleep_daily = daily_sums(indices, sleep_hours, HISTORY_DAYS)
+    movement_daily = daily_sums(indices, movement_minutes, HISTORY_DAYS)
+    daily_scores = {
+        "sleep": np.clip(100.0 - np.minimum(50.0, np.abs(sleep_daily - 7.5) * 12.0), 0.0, 100.0),
+        "movement": np.clip((movement_daily / 120.0) * 100.0, 0.0, 100.0),
+        "diet": np.clip(_daily_mean(indices, diet_values, HISTORY_DAYS, 0.0), 0.0, 100.0),
+        "stress": np.clip(_daily_mean(indices, mood_values, HISTORY_DAYS, 50.0), 0.0, 100.0),
+    }
+    daily_composite = sum(daily_scores[key] * weight for key, weight in WELLNESS_WEIGHTS.items())
 
     lookback_days = 14
-    lookback_start = today - timedelta(days=lookback_days - 1)
-    sleep_scores = []
-    movement_scores = []
-    diet_scores = []
-    stress_scores = []
-    for offset in range(lookback_days):
-        date_value = lookback_start + timedelta(days=offset)
-        day = daily.get(date_value.isoformat())
-        if not day:
-            continue
-        sleep_hours = day["sleep_hours"]
-        sleep_score = 100.0 - min(50.0, abs(sleep_hours - 7.5) * 12.0)
-        movement_score = min(100.0, (day["movement_minutes"] / 120.0) * 100.0)
-        diet_score = _safe_avg(day["diet_scores"]) if day["diet_scores"] else 0.0
-        mood_score = _safe_avg(day["mood_scores"]) if day["mood_scores"] else 50.0
-        sleep_scores.append(_clamp(sleep_score))
-        movement_scores.append(_clamp(movement_score))
-        diet_scores.append(_clamp(diet_score))
-        stress_scores.append(_clamp(mood_score))
-
-    sleep_base = _safe_avg(sleep_scores)
-    movement_base = _safe_avg(movement_scores)
-    diet_base = _safe_avg(diet_scores)
-    stress_base = _safe_avg(stress_scores)
-
-    weights = {"sleep": 0.3, "movement": 0.3, "diet": 0.2, "stress": 0.2}
-    current_score = (
-        sleep_base * weights["sleep"]
-        + movement_base * weights["movement"]
-        + diet_base * weights["diet"]
-        + stress_base * weights["stress"]
-    )
+    recent = slice(HISTORY_DAYS - lookback_days + 1, HISTORY_DAYS)
+    bases = {key: float(values[recent].mean()) for key, values in daily_scores.items()}
+    current_score = sum(bases[key] * weight for key, weight in WELLNESS_WEIGHTS.items())
 
     targets = {
-        "sleep": min(100.0, sleep_base + max(5.0, 80.0 - sleep_base) * 0.5),
-        "movement": min(100.0, movement_base + max(5.0, 80.0 - movement_base) * 0.6),
-        "diet": min(100.0, diet_base + max(5.0, 80.0 - diet_base) * 0.5),
-        "stress": min(100.0, stress_base + max(5.0, 75.0 - stress_base) * 0.5),
+        "sleep": min(100.0, bases["sleep"] + max(5.0, 80.0 - bases["sleep"]) * 0.5),
+        "movement": min(100.0, bases["movement"] + max(5.0, 80.0 - bases["movement"]) * 0.6),
+        "diet": min(100.0, bases["diet"] + max(5.0, 80.0 - bases["diet"]) * 0.5),
+        "stress": min(100.0, bases["stress"] + max(5.0, 75.0 - bases["stress"]) * 0.5),
     }
-    improved_score = (
-        targets["sleep"] * weights["sleep"]
-        + targets["movement"] * weights["movement"]
-        + targets["diet"] * weights["diet"]
-        + targets["stress"] * weights["stress"]
-    )
+    improved_score = sum(targets[key] * weight for key, weight in WELLNESS_WEIGHTS.items())
 
-    trajectories = {"current": [], "improved": []}
-    projected_scores = []
-    for offset in range(horizon_days + 1):
-        ratio = offset / float(horizon_days)
-        date_value = today + timedelta(days=offset)
-        current_point = {
-            "date": date_value.isoformat(),
-            "score": round(current_score, 2),
-            "sleep": round(sleep_base, 2),
-            "diet": round(diet_base, 2),
-            "movement": round(movement_base, 2),
-            "stress": round(stress_base, 2),
-        }
-        improved_point = {
-            "date": date_value.isoformat(),
-            "score": round(current_score + (improved_score - current_score) * ratio, 2),
-            "sleep": round(sleep_base + (targets["sleep"] - sleep_base) * ratio, 2),
-            "diet": round(diet_base + (targets["diet"] - diet_base) * ratio, 2),
-            "movement": round(movement_base + (targets["movement"] - movement_base) * ratio, 2),
-            "stress": round(stress_base + (targets["stress"] - stress_base) * ratio, 2),
-        }
-        trajectories["current"].append(current_point)
-        trajectories["improved"].append(improved_point)
-        projected_scores.append(current_point)
+    offsets = day_offsets(horizon_days)
+    return {
+        "today": today,
+        "horizon": horizon_days,
+        "offsets": offsets,
+        "dates": date_labels(today, offsets),
+        "bases": bases,
+        "targets": targets,
+        "current_score": current_score,
+        "improved_score": improved_score,
+        "daily_composite": daily_composite,
+    }
+
+
+def _wellness_columns(model: dict[str, Any], improved: bool = False) -> dict[str, np.ndarray]:
+    offsets = model["offsets"]
+    bases = model["bases"]
+    if improved:
+        horizon = model["horizon"]
+        targets = model["targets"]
+        columns = {"score": interpolate(model["current_score"], model["improved_score"], offsets, horizon)}
+        for key in ("sleep", "diet", "movement", "stress"):
+            columns[key] = interpolate(bases[key], targets[key], offsets, horizon)
+        return columns
+    constant = np.ones(len(offsets))
+    columns = {"score": constant * model["current_score"]}
+    for key in ("sleep", "diet", "movement", "stress"):
+        columns[key] = constant * bases[key]
+    return columns
+
+
+def project_wellness(
+    user_id: str,
+    days: int = 30,
+    window: EventWindow | None = None,
+    layout: Layout = "points",
+) -> dict[str, Any]:
+    model = _wellness_model(user_id, days, window)
+    dates = model["dates"]
+    current = render(dates, _wellness_columns(model), layout)
+    trajectories = {
+        "current": current,
+        "improved": render(dates, _wellness_columns(model, improved=True), layout),
+    }
+
+    sleep_base = model["bases"]["sleep"]
+    movement_base = model["bases"]["movement"]
+    diet_base = model["bases"]["diet"]
+    stress_base = model["bases"]["stress"]
 
     factors = []
     if sleep_base < 75:
@@ -532,38 +416,21 @@ def project_wellness(user_id: str, days: int = 30) -> dict[str, Any]:
         recommendations.append("Schedule a daily decompression ritual.")
 
     return {
-        "current_score": round(current_score, 2),
-        "projected_scores": projected_scores,
+        "current_score": round(model["current_score"], 2),
+        "projected_scores": current,
         "trajectories": trajectories,
         "factors_impacting": factors,
         "recommended_changes": recommendations,
     }
 
 
-def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    horizon_days = max(30, min(90, int(days)))
+def _sustainability_model(user_id: str, days: int, window: EventWindow | None) -> dict[str, Any]:
+    horizon_days = max(30, min(MAX_HORIZON_DAYS, int(days)))
     today = datetime.utcnow().date()
-    history_start = today - timedelta(days=90)
-    history_end = today
-
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", datetime.combine(history_start, datetime.min.time()).isoformat())
-        .lte("timestamp", datetime.combine(history_end, datetime.max.time()).isoformat())
-        .execute()
-    )
-    rows = response.data or []
-
-    daily = {}
-    for offset in range(90):
-        day = history_start + timedelta(days=offset)
-        daily[day.isoformat()] = {"co2e": 0.0, "water": 0.0, "waste": 0.0}
+    history_start = today - timedelta(days=HISTORY_DAYS)
+    events = _history_window(user_id, history_start, today, window)
 
+    footprint = np.zeros((len(events), 3))
     impact_totals = {"Food": 0.0, "Transport": 0.0, "Purchases": 0.0}
     food_meat = 0
     food_plant = 0
@@ -572,40 +439,28 @@ def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
     purchase_local = 0
     purchase_shipped = 0
 
-    meat_keywords = {"beef", "pork", "lamb", "chicken", "turkey", "meat", "steak"}
-    plant_keywords = {"tofu", "bean", "beans", "lentil", "vegetable", "veggie", "salad"}
-
-    for row in rows:
-        ts = _parse_ts(row.get("timestamp"))
-        if ts is None:
-            continue
-        date_key = ts.date().isoformat()
-        if date_key not in daily:
+    for position, event in enumerate(events):
+        if event.day >= today:
             continue
-        event_type = (row.get("event_type") or "").lower()
-        metadata = row.get("metadata") or {}
-        scores = row.get("scores") or {}
+        event_type = event.event_type
+        metadata = event.metadata
 
         if event_type == "food":
             ingredients = [str(item).lower() for item in metadata.get("ingredients") or []]
             sustainability_score = _safe_float(metadata.get("sustainability_score"))
             if sustainability_score is None:
-                sustainability_score = _safe_float(scores.get("sustainability_impact"))
-            if any(keyword in ingredients for keyword in meat_keywords):
+                sustainability_score = _safe_float(event.scores.get("sustainability_impact"))
+            if any(keyword in ingredients for keyword in MEAT_KEYWORDS):
                 co2e, water, waste = 5.0, 4.0, 2.0
                 food_meat += 1
-            elif any(keyword in ingredients for keyword in plant_keywords):
+            elif any(keyword in ingredients for keyword in PLANT_KEYWORDS):
                 co2e, water, waste = 2.0, 2.0, 1.0
                 food_plant += 1
             else:
                 base = 3.5 if sustainability_score is None else 5.0 - (sustainability_score / 20.0)
                 co2e, water, waste = base, base * 0.8, base * 0.5
-            daily[date_key]["co2e"] += co2e
-            daily[date_key]["water"] += water
-            daily[date_key]["waste"] += waste
             impact_totals["Food"] += co2e + water + waste
-
-        if event_type == "movement":
+        elif event_type == "movement":
             mode = str(metadata.get("type") or "").lower()
             if "car" in mode or "drive" in mode:
                 co2e, water, waste = 4.0, 1.2, 1.0
@@ -615,12 +470,8 @@ def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
                 transport_walk += 1
             else:
                 co2e, water, waste = 1.5, 0.6, 0.4
-            daily[date_key]["co2e"] += co2e
-            daily[date_key]["water"] += water
-            daily[date_key]["waste"] += waste
             impact_totals["Transport"] += co2e + water + waste
-
-        if event_type == "spending":
+        elif event_type == "spending":
             local_flag = bool(metadata.get("local_purchase"))
             shipped_flag = bool(metadata.get("shipping") or metadata.get("shipped") or metadata.get("delivery"))
             if local_flag:
@@ -631,27 +482,16 @@ def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
                 purchase_shipped += 1
             else:
                 co2e, water, waste = 2.2, 1.2, 1.0
-            daily[date_key]["co2e"] += co2e
-            daily[date_key]["water"] += water
-            daily[date_key]["waste"] += waste
             impact_totals["Purchases"] += co2e + water + waste
+        else:
+            continue
+        footprint[position] = (co2e, water, waste)
+
+    indices = day_indices(events.ordinals, history_start)
+    daily = np.stack([daily_sums(indices, footprint[:, column], HISTORY_DAYS + 1) for column in range(3)], axis=1)
 
     lookback_days = 30
-    lookback_start = today - timedelta(days=lookback_days - 1)
-    co2e_values = []
-    water_values = []
-    waste_values = []
-    for offset in range(lookback_days):
-        date_value = lookback_start + timedelta(days=offset)
-        day = daily.get(date_value.isoformat(), {"co2e": 0.0, "water": 0.0, "waste": 0.0})
-        co2e_values.append(day["co2e"])
-        water_values.append(day["water"])
-        waste_values.append(day["waste"])
-
-    co2e_base = _safe_avg(co2e_values)
-    water_base = _safe_avg(water_values)
-    waste_base = _safe_avg(waste_values)
-    current_footprint = co2e_base + water_base + waste_base
+    co2e_base, water_base, waste_base = daily[-lookback_days:].mean(axis=0).tolist()
 
     food_total = food_meat + food_plant
     transport_total = transport_car + transport_walk
@@ -659,30 +499,42 @@ def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
     meat_ratio = food_meat / float(food_total) if food_total else 0.0
     car_ratio = transport_car / float(transport_total) if transport_total else 0.0
     shipped_ratio = purchase_shipped / float(purchase_total) if purchase_total else 0.0
-
     improvement_factor = min(0.4, 0.15 + meat_ratio * 0.2 + car_ratio * 0.2 + shipped_ratio * 0.15)
 
-    trajectories = {"current": [], "green_swaps": []}
-    for offset in range(horizon_days + 1):
-        date_value = today + timedelta(days=offset)
-        trajectories["current"].append(
-            {
-                "date": date_value.isoformat(),
-                "co2e": round(co2e_base, 2),
-                "water": round(water_base, 2),
-                "waste": round(waste_base, 2),
-            }
-        )
-        trajectories["green_swaps"].append(
-            {
-                "date": date_value.isoformat(),
-                "co2e": round(co2e_base * (1 - improvement_factor), 2),
-                "water": round(water_base * (1 - improvement_factor), 2),
-                "waste": round(waste_base * (1 - improvement_factor), 2),
-            }
-        )
+    offsets = day_offsets(horizon_days)
+    return {
+        "today": today,
+        "horizon": horizon_days,
+        "offsets": offsets,
+        "dates": date_labels(today, offsets),
+        "bases": {"co2e": co2e_base, "water": water_base, "waste": waste_base},
+        "improvement_factor": improvement_factor,
+        "impact_totals": impact_totals,
+        "daily_footprint": daily[:-1].sum(axis=1),
+    }
+
+
+def _sustainability_columns(model: dict[str, Any], factor: float = 1.0) -> dict[str, np.ndarray]:
+    constant = np.ones(len(model["offsets"])) * factor
+    return {key: constant * value for key, value in model["bases"].items()}
+
 
-    improvement_potential = round(improvement_factor * 100, 2)
+def project_sustainability(
+    user_id: str,
+    days: int = 30,
+    window: EventWindow | None = None,
+    layout: Layout = "points",
+) -> dict[str, Any]:
+    model = _sustainability_model(user_id, days, window)
+    dates = model["dates"]
+    improvement_factor = model["improvement_factor"]
+    trajectories = {
+        "current": render(dates, _sustainability_columns(model), layout),
+        "green_swaps": render(dates, _sustainability_columns(model, 1 - improvement_factor), layout),
+    }
+
+    current_footprint = sum(model["bases"].values())
+    impact_totals = model["impact_totals"]
     total_impact = sum(impact_totals.values()) or 1.0
     top_impact_areas = [
         {
@@ -695,94 +547,36 @@ def project_sustainability(user_id: str, days: int = 30) -> dict[str, Any]:
     ]
     top_impact_areas.sort(key=lambda item: item["impact"], reverse=True)
 
-    projected_footprint = round(current_footprint * horizon_days, 2)
-
     return {
         "current_footprint": round(current_footprint, 2),
-        "projected_footprint": projected_footprint,
+        "projected_footprint": round(current_footprint * model["horizon"], 2),
         "trajectories": trajectories,
-        "improvement_potential": improvement_potential,
+        "improvement_potential": round(improvement_factor * 100, 2),
         "top_impact_areas": top_impact_areas,
     }
 
 
-def compare_scenarios(
+def _scenario_series(
     user_id: str,
-    scenarios: list[dict[str, Any]],
-    metric: str,
-    days: int = 30,
-) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    horizon_days = max(1, int(days))
-    metric_key = (metric or "").lower()
-
-    def _custom_inputs() -> dict[str, float]:
-        for scenario in scenarios:
-            if (scenario.get("name") or "").lower() == "custom":
-                inputs = scenario.get("inputs") or scenario.get("custom") or {}
-                return {key: float(value) for key, value in inputs.items() if value is not None}
-        return {}
-
-    inputs = _custom_inputs()
-    today = datetime.utcnow().date()
-    lookback_days = min(30, horizon_days)
-    spend_start = today - timedelta(days=lookback_days - 1)
-
-    spend_response = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,amount,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", datetime.combine(spend_start, datetime.min.time()).isoformat())
-        .lte("timestamp", datetime.combine(today, datetime.max.time()).isoformat())
-        .execute()
-    )
-    spend_rows = spend_response.data or []
-    spend_total = 0.0
-    for row in spend_rows:
-        if (row.get("event_type") or "").lower() != "spending":
-            continue
-        amount = _safe_float(row.get("amount"))
-        if amount is not None:
-            spend_total += abs(amount)
-    baseline_daily_spend = spend_total / float(max(1, lookback_days))
-
-    scenario_results: list[dict[str, Any]] = []
-    scenario_series: list[list[dict[str, Any]]] = []
-
+    metric_key: str,
+    horizon_days: int,
+    inputs: dict[str, float],
+    baseline_daily_spend: float,
+    window: EventWindow,
+) -> tuple[list[str], dict[str, np.ndarray], dict[str, Any]]:
     if metric_key == "wallet":
-        base = project_wallet_shortterm(user_id, horizon_days)
-        current_points = base["trajectories"]["current"]
-        swaps_points = base["trajectories"]["with_swaps"]
-        start_balance = float(current_points[0]["balance"]) if current_points else 0.0
-        end_balance = float(current_points[-1]["balance"]) if current_points else start_balance
-        daily_net = (end_balance - start_balance) / float(max(1, horizon_days))
-
+        model = _wallet_shortterm_model(user_id, horizon_days, window)
         custom_spend = inputs.get("daily_spending", baseline_daily_spend)
-        custom_daily_net = daily_net + (baseline_daily_spend - custom_spend)
-
-        series_map = {
-            "current": [
-                {"date": point["date"], "value": float(point["balance"])} for point in current_points
-            ],
-            "with_swaps": [
-                {"date": point["date"], "value": float(point["balance"])} for point in swaps_points
-            ],
-            "custom": [
-                {
-                    "date": current_points[index]["date"],
-                    "value": round(start_balance + custom_daily_net * index, 2),
-                }
-                for index in range(len(current_points))
-            ],
-        }
-    elif metric_key == "wellness":
-        base = project_wellness(user_id, horizon_days)
-        current_points = base["trajectories"]["current"]
-        improved_points = base["trajectories"]["improved"]
-        base_stress = float(current_points[0]["stress"]) if current_points else 50.0
-        current_score = float(current_points[0]["score"]) if current_points else 0.0
+        custom_daily_net = model["average_daily_net"] + (baseline_daily_spend - custom_spend)
+        return model["dates"], {
+            "current": model["current"],
+            "with_swaps": model["with_swaps"],
+            "custom": linear_path(model["latest_balance"], custom_daily_net, model["offsets"]),
+        }, {"history": model["daily_nets"], "cumulative": True}
+
+    if metric_key == "wellness":
+        model = _wellness_model(user_id, horizon_days, window)
+        current_score = model["current_score"]
 
         custom_sleep = inputs.get("sleep_hours", 7.5)
         custom_exercise = inputs.get("exercise_days", 3.0)
@@ -794,39 +588,26 @@ def compare_scenarios(
         custom_movement_score = _clamp(min(100.0, (custom_minutes / 120.0) * 100.0))
         custom_diet_score = _clamp(custom_meal * 10.0)
         spend_penalty = _clamp(100.0 - max(0.0, custom_spend - baseline_daily_spend) * 0.2)
-        custom_stress = _clamp((base_stress + spend_penalty) / 2.0)
-
-        weights = {"sleep": 0.3, "movement": 0.3, "diet": 0.2, "stress": 0.2}
+        custom_stress = _clamp((model["bases"]["stress"] + spend_penalty) / 2.0)
         custom_score = (
-            custom_sleep_score * weights["sleep"]
-            + custom_movement_score * weights["movement"]
-            + custom_diet_score * weights["diet"]
-            + custom_stress * weights["stress"]
+            custom_sleep_score * WELLNESS_WEIGHTS["sleep"]
+            + custom_movement_score * WELLNESS_WEIGHTS["movement"]
+            + custom_diet_score * WELLNESS_WEIGHTS["diet"]
+            + custom_stress * WELLNESS_WEIGHTS["stress"]
         )
-
-        series_map = {
-            "current": [
-                {"date": point["date"], "value": float(point["score"])} for point in current_points
-            ],
-            "with_swaps": [
-                {"date": point["date"], "value": float(point["score"])} for point in improved_points
-            ],
-            "custom": [
-                {
-                    "date": current_points[index]["date"],
-                    "value": round(
-                        current_score + (custom_score - current_score) * (index / float(max(1, horizon_days))),
-                        2,
-                    ),
-                }
-                for index in range(len(current_points))
-            ],
+        return model["dates"], {
+            "current": _wellness_columns(model)["score"],
+            "with_swaps": _wellness_columns(model, improved=True)["score"],
+            "custom": interpolate(current_score, custom_score, model["offsets"], horizon_days),
+        }, {
+            "history": model["daily_composite"][-30:],
+            "cumulative": False,
+            "minimum": 0.0,
+            "maximum": 100.0,
         }
-    elif metric_key == "sustainability":
-        base = project_sustainability(user_id, horizon_days)
-        current_points = base["trajectories"]["current"]
-        green_points = base["trajectories"]["green_swaps"]
 
+    if metric_key == "sustainability":
+        model = _sustainability_model(user_id, horizon_days, window)
         custom_meal = inputs.get("meal_quality", 6.0)
         custom_exercise = inputs.get("exercise_days", 3.0)
         custom_spend = inputs.get("daily_spending", baseline_daily_spend)
@@ -836,43 +617,91 @@ def compare_scenarios(
         exercise_factor = 1.0 - (custom_exercise / 7.0) * 0.05
         custom_factor = max(0.6, min(1.4, meal_factor * spend_factor * exercise_factor))
 
-        def _total(point: dict[str, Any]) -> float:
-            return float(point["co2e"]) + float(point["water"]) + float(point["waste"])
+        current_total = sum(_sustainability_columns(model).values())
+        return model["dates"], {
+            "current": current_total,
+            "with_swaps": sum(_sustainability_columns(model, 1 - model["improvement_factor"]).values()),
+            "custom": current_total * custom_factor,
+        }, {"history": model["daily_footprint"][-30:], "cumulative": False, "minimum": 0.0}
 
-        series_map = {
-            "current": [{"date": point["date"], "value": round(_total(point), 2)} for point in current_points],
-            "with_swaps": [{"date": point["date"], "value": round(_total(point), 2)} for point in green_points],
-            "custom": [
-                {"date": point["date"], "value": round(_total(point) * custom_factor, 2)}
-                for point in current_points
-            ],
-        }
-    else:
-        raise ValueError("Unsupported metric")
+    raise ValueError("Unsupported metric")
+
+
+def compare_scenarios(
+    user_id: str,
+    scenarios: list[dict[str, Any]],
+    metric: str,
+    days: int = 30,
+    layout: Layout = "points",
+    mode: str = "projection",
+    paths: int = DEFAULT_PATHS,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    horizon_days = max(1, min(MAX_HORIZON_DAYS, int(days)))
+    metric_key = (metric or "").lower()
+
+    def _custom_inputs() -> dict[str, float]:
+        for scenario in scenarios:
+            if (scenario.get("name") or "").lower() == "custom":
+                inputs = scenario.get("inputs") or scenario.get("custom") or {}
+                return {key: float(value) for key, value in inputs.items() if value is not None}
+        return {}
+
+    inputs = _custom_inputs()
+    today = datetime.utcnow().date()
+    lookback_days = min(30, horizon_days)
+    spend_start = today - timedelta(days=lookback_days - 1)
+
+    loader = EventWindowLoader(user_id)
+    window = loader.get(today - timedelta(days=HISTORY_DAYS), today)
+    recent = window.slice(spend_start, today)
+    spend_amounts = recent.amount_values[recent.type_mask("spending")]
+    spend_total = float(np.abs(spend_amounts[~np.isnan(spend_amounts)]).sum())
+    baseline_daily_spend = spend_total / float(max(1, lookback_days))
+
+    dates, series_map, simulation = _scenario_series(
+        user_id, metric_key, horizon_days, inputs, baseline_daily_spend, window
+    )
+    bands_map = {}
+    if mode == "simulation":
+        bands_map = simulate_scenarios(
+            simulation["history"],
+            series_map,
+            paths=paths,
+            seed=seed,
+            cumulative=simulation["cumulative"],
+            minimum=simulation.get("minimum"),
+            maximum=simulation.get("maximum"),
+        )
 
     scenario_order = [scenario.get("name") for scenario in scenarios if scenario.get("name")]
     if not scenario_order:
         scenario_order = ["current", "with_swaps", "custom"]
 
+    scenario_results: list[dict[str, Any]] = []
+    scenario_values: list[np.ndarray] = []
     for name in scenario_order:
         key = str(name).lower()
-        data = series_map.get(key, [])
-        final_value = float(data[-1]["value"]) if data else 0.0
-        scenario_results.append({"name": key, "data": data, "final_value": round(final_value, 2)})
-        scenario_series.append(data)
+        values = series_map.get(key)
+        if values is None:
+            empty = render([], {"value": np.zeros(0)}, layout)
+            scenario_results.append({"name": key, "data": empty, "final_value": 0.0})
+            continue
+        values = np.round(values, 2)
+        result = {
+            "name": key,
+            "data": render(dates, {"value": values}, layout),
+            "final_value": round(float(values[-1]), 2),
+        }
+        if key in bands_map:
+            result["bands"] = render(dates, bands_map[key], layout)
+        scenario_results.append(result)
+        scenario_values.append(values)
 
     divergence_points = []
-    if scenario_series and scenario_series[0]:
-        length = min(len(series) for series in scenario_series if series)
-        for index in range(length):
-            values = [series[index]["value"] for series in scenario_series if len(series) > index]
-            if not values:
-                continue
-            impact = max(values) - min(values)
-            divergence_points.append(
-                {"date": scenario_series[0][index]["date"], "impact": round(float(impact), 2)}
-            )
-        divergence_points.sort(key=lambda item: item["impact"], reverse=True)
-        divergence_points = divergence_points[:3]
+    if scenario_values and str(scenario_order[0]).lower() in series_map:
+        impact = np.round(np.ptp(np.stack(scenario_values), axis=0), 2)
+        for index in np.argsort(-impact, kind="stable")[:3]:
+            divergence_points.append({"date": dates[index], "impact": round(float(impact[index]), 2)})
 
     return {"scenarios": scenario_results, "divergence_points": divergence_points}
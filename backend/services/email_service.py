@@ -5,19 +5,40 @@ import smtplib
 from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from pathlib import Path
 from typing import Any
 
 from db.supabase import get_supabase_client
-from services.analytics_service import get_dashboard_stats
-from services.pattern_detection import generate_insight_notifications
+from services.analytics_service import get_dashboard_stats, get_dashboard_stats_for_users
+from services.batch_fetch import chunked, fetch_rows_in
+from services.email_templates import compile_template, get_template, render_template
+from services.event_query import EventProjection, fetch_events, iter_events
+from services.friend_graph import friend_ids, friend_ids_for_users
+from services.pattern_detection import generate_insight_notifications, generate_insight_notifications_for_users
+from services.query_gather import gather_queries
 
-EVENTS_TABLE = "events"
 GOAL_PARTICIPANTS_TABLE = "goal_participants"
 SHARED_GOALS_TABLE = "shared_goals"
 USER_ACTIVITIES_TABLE = "user_activities"
 PREFERENCES_TABLE = "notification_preferences"
-FRIENDSHIPS_TABLE = "friendships"
+WEEKLY_EVENT_PROJECTION = EventProjection(("timestamp",), scores_keys=("sustainability_impact",))
+FRIEND_ACTIVITY_LIMIT = 3
+FRIEND_ACTIVITY_SCAN_LIMIT = 1000
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = max(1, int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100")))
+WEEKLY_SUMMARY_TEMPLATE = "weekly_summary.html"
+EMAIL_VERIFICATION_TEMPLATE = "email_verification.html"
+ACCOUNT_DELETION_TEMPLATE = "account_deletion.html"
+HIGHLIGHT_ITEM = compile_template("<li>{text}</li>", "highlight_item")
+INSIGHT_ITEM = compile_template("<li><strong>{title}</strong> — {message}</li>", "insight_item")
+GOAL_ROW = compile_template(
+    "<div class='goal-row'>"
+    "<div class='goal-title'>{title}</div>"
+    "<div class='goal-bar'><span style='width:{pct}%'></span></div>"
+    "<div class='goal-meta'>{current}/{target}</div>"
+    "</div>",
+    "goal_row",
+)
+FRIEND_ITEM = compile_template("<li>{title} — {description}</li>", "friend_item")
 
 
 def _require_supabase():
@@ -34,16 +55,7 @@ def _week_window() -> tuple[datetime, datetime]:
 
 
 def _fetch_events(user_id: str, start: datetime, end: datetime) -> list[dict[str, Any]]:
-    supabase = _require_supabase()
-    response = (
-        supabase.table(EVENTS_TABLE)
-        .select("scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    return response.data or []
+    return fetch_events(user_id, WEEKLY_EVENT_PROJECTION, start, end)
 
 
 def _sum_sustainability(events: list[dict[str, Any]]) -> float:
@@ -56,38 +68,6 @@ def _sum_sustainability(events: list[dict[str, Any]]) -> float:
     return round(total, 2)
 
 
-def _friend_ids(user_id: str) -> set[str]:
-    supabase = _require_supabase()
-    friends: set[str] = set()
-    direct = (
-        supabase.table(FRIENDSHIPS_TABLE)
-        .select("friend_id")
-        .eq("user_id", user_id)
-        .eq("status", "accepted")
-        .execute()
-        .data
-        or []
-    )
-    reverse = (
-        supabase.table(FRIENDSHIPS_TABLE)
-        .select("user_id")
-        .eq("friend_id", user_id)
-        .eq("status", "accepted")
-        .execute()
-        .data
-        or []
-    )
-    for row in direct:
-        fid = row.get("friend_id")
-        if fid:
-            friends.add(str(fid))
-    for row in reverse:
-        fid = row.get("user_id")
-        if fid:
-            friends.add(str(fid))
-    return friends
-
-
 def _goal_progress(user_id: str) -> list[dict[str, Any]]:
     supabase = _require_supabase()
     participants = (
@@ -109,7 +89,10 @@ def _goal_progress(user_id: str) -> list[dict[str, Any]]:
         .data
         or []
     )
-    goals_by_id = {str(row.get("id")): row for row in goals}
+    return _goal_rows(participants, {str(row.get("id")): row for row in goals})
+
+
+def _goal_rows(participants: list[dict[str, Any]], goals_by_id: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     results: list[dict[str, Any]] = []
     for row in participants:
         goal_id = str(row.get("goal_id"))
@@ -130,35 +113,131 @@ def _goal_progress(user_id: str) -> list[dict[str, Any]]:
     return results
 
 
-def _friend_achievements(user_id: str) -> list[dict[str, Any]]:
-    supabase = _require_supabase()
-    friend_ids = _friend_ids(user_id)
-    if not friend_ids:
-        return []
-    response = (
+def _friend_activity_query(supabase, actor_ids: list[str], limit: int):
+    return (
         supabase.table(USER_ACTIVITIES_TABLE)
         .select("user_id,title,description,created_at")
-        .in_("user_id", list(friend_ids))
+        .in_("user_id", actor_ids)
         .order("created_at", desc=True)
-        .limit(3)
-        .execute()
+        .limit(limit)
     )
+
+
+def _friend_achievements(user_id: str) -> list[dict[str, Any]]:
+    supabase = _require_supabase()
+    friends = friend_ids(user_id)
+    if not friends:
+        return []
+    response = _friend_activity_query(supabase, sorted(friends), FRIEND_ACTIVITY_LIMIT).execute()
     return response.data or []
 
 
+def _weekly_events_for_users(user_ids: list[str], start: datetime, end: datetime) -> dict[str, list[dict[str, Any]]]:
+    events: dict[str, list[dict[str, Any]]] = {user_id: [] for user_id in user_ids}
+    for chunk in chunked(user_ids):
+        for row in iter_events(chunk, WEEKLY_EVENT_PROJECTION, start, end):
+            user_events = events.get(str(row.get("user_id")))
+            if user_events is not None:
+                user_events.append(row)
+    return events
+
+
+def _goal_progress_for_users(user_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    participants = fetch_rows_in(
+        GOAL_PARTICIPANTS_TABLE,
+        "user_id,goal_id,current_progress,last_updated",
+        "user_id",
+        user_ids,
+        order=("user_id", "goal_id"),
+    )
+    goals = fetch_rows_in(
+        SHARED_GOALS_TABLE,
+        "id,title,target_value",
+        "id",
+        (row.get("goal_id") for row in participants),
+    )
+    goals_by_id = {str(row.get("id")): row for row in goals}
+    by_user: dict[str, list[dict[str, Any]]] = {user_id: [] for user_id in user_ids}
+    for row in participants:
+        user_rows = by_user.get(str(row.get("user_id")))
+        if user_rows is not None and row.get("goal_id"):
+            user_rows.append(row)
+    return {user_id: _goal_rows(rows, goals_by_id) for user_id, rows in by_user.items()}
+
+
+def _friend_achievements_for_users(user_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+    supabase = _require_supabase()
+    friends = friend_ids_for_users(user_ids)
+    recent: list[dict[str, Any]] = []
+    complete_after = ""
+    for chunk in chunked(sorted(set().union(*friends.values()))):
+        rows = _friend_activity_query(supabase, chunk, FRIEND_ACTIVITY_SCAN_LIMIT).execute().data or []
+        recent.extend(rows)
+        if len(rows) >= FRIEND_ACTIVITY_SCAN_LIMIT:
+            complete_after = max(complete_after, str(rows[-1].get("created_at") or ""))
+    recent.sort(key=lambda row: str(row.get("created_at") or ""), reverse=True)
+    results: dict[str, list[dict[str, Any]]] = {}
+    for user_id, user_friends in friends.items():
+        if not user_friends:
+            results[user_id] = []
+            continue
+        picked = [row for row in recent if str(row.get("user_id")) in user_friends][:FRIEND_ACTIVITY_LIMIT]
+        if complete_after and (
+            len(picked) < FRIEND_ACTIVITY_LIMIT or str(picked[-1].get("created_at") or "") <= complete_after
+        ):
+            picked = _friend_activity_query(supabase, sorted(user_friends), FRIEND_ACTIVITY_LIMIT).execute().data or []
+        results[user_id] = picked
+    return results
+
+
 def generate_weekly_summary(user_id: str) -> dict[str, Any]:
     start, end = _week_window()
-    events = _fetch_events(user_id, start, end)
-    sustainability = _sum_sustainability(events)
-    stats_payload = get_dashboard_stats(user_id, "week")
-    stats = stats_payload.get("stats") or {}
+    results = gather_queries(
+        {
+            "events": lambda: _fetch_events(user_id, start, end),
+            "stats": lambda: get_dashboard_stats(user_id, "week"),
+            "insights": lambda: generate_insight_notifications(user_id)[:3],
+            "goals": lambda: _goal_progress(user_id),
+            "friends": lambda: _friend_achievements(user_id),
+        }
+    )
+    return _weekly_summary(start, end, results)
+
+
+def generate_weekly_summaries(user_ids: list[str]) -> dict[str, dict[str, Any]]:
+    start, end = _week_window()
+    results = gather_queries(
+        {
+            "events": lambda: _weekly_events_for_users(user_ids, start, end),
+            "stats": lambda: get_dashboard_stats_for_users(user_ids, "week"),
+            "insights": lambda: generate_insight_notifications_for_users(user_ids),
+            "goals": lambda: _goal_progress_for_users(user_ids),
+            "friends": lambda: _friend_achievements_for_users(user_ids),
+        }
+    )
+    return {
+        user_id: _weekly_summary(
+            start,
+            end,
+            {
+                "events": results["events"][user_id],
+                "stats": results["stats"][user_id],
+                "insights": results["insights"][user_id][:3],
+                "goals": results["goals"][user_id],
+                "friends": results["friends"][user_id],
+            },
+        )
+        for user_id in user_ids
+    }
+
+
+def _weekly_summary(start: datetime, end: datetime, results: dict[str, Any]) -> dict[str, Any]:
+    sustainability = _sum_sustainability(results["events"])
+    stats = results["stats"].get("stats") or {}
     spending_total = float(stats.get("spending_total", {}).get("value") or 0)
     spending_change = float(stats.get("spending_total", {}).get("change") or 0)
     savings_total = float(stats.get("money_saved_via_swaps", {}).get("value") or 0)
     wellness_change = float(stats.get("wellness_score_avg", {}).get("change") or 0)
-    insights = generate_insight_notifications(user_id)[:3]
-    goals = _goal_progress(user_id)
-    friends = _friend_achievements(user_id)
     return {
         "week_start": start.date().isoformat(),
         "week_end": end.date().isoformat(),
@@ -167,51 +246,34 @@ def generate_weekly_summary(user_id: str) -> dict[str, Any]:
         "spending_vs_budget": round(spending_change, 2),
         "wellness_change": round(wellness_change, 2),
         "sustainability_total": sustainability,
-        "insights": insights,
-        "goals": goals,
-        "friends": friends,
+        "insights": results["insights"],
+        "goals": results["goals"],
+        "friends": results["friends"],
     }
 
 
 def _render_template(summary: dict[str, Any]) -> str:
-    template_path = Path(__file__).resolve().parent.parent / "templates" / "weekly_summary.html"
-    template = template_path.read_text(encoding="utf-8")
     highlights = [
-        f"Saved ${summary['savings_total']:.2f} through swaps",
-        f"Spent ${summary['spending_total']:.2f} ({summary['spending_vs_budget']:+.2f} vs last week)",
-        f"Wellness change {summary['wellness_change']:+.1f} pts",
+        {"text": f"Saved ${summary['savings_total']:.2f} through swaps"},
+        {"text": f"Spent ${summary['spending_total']:.2f} ({summary['spending_vs_budget']:+.2f} vs last week)"},
+        {"text": f"Wellness change {summary['wellness_change']:+.1f} pts"},
     ]
-    highlights_html = "".join(f"<li>{item}</li>" for item in highlights)
-    insights_html = "".join(
-        f"<li><strong>{row.get('title')}</strong> — {row.get('message')}</li>"
-        for row in summary["insights"]
-    )
-    goals_html = "".join(
-        (
-            "<div class='goal-row'>"
-            f"<div class='goal-title'>{row['title']}</div>"
-            f"<div class='goal-bar'><span style='width:{row['pct']}%'></span></div>"
-            f"<div class='goal-meta'>{row['current']}/{row['target']}</div>"
-            "</div>"
-        )
-        for row in summary["goals"]
-    )
-    friends_html = "".join(
-        f"<li>{row.get('title')} — {row.get('description') or ''}</li>"
-        for row in summary["friends"]
-    )
-    return template.format(
-        week_range=f"{summary['week_start']} to {summary['week_end']}",
-        savings_total=f"${summary['savings_total']:.2f}",
-        spending_total=f"${summary['spending_total']:.2f}",
-        spending_vs_budget=f"{summary['spending_vs_budget']:+.2f}",
-        wellness_change=f"{summary['wellness_change']:+.1f}",
-        sustainability_total=f"{summary['sustainability_total']:.1f} kg CO₂",
-        highlights_html=highlights_html or "<li>No highlights yet.</li>",
-        insights_html=insights_html or "<li>No insights yet.</li>",
-        goals_html=goals_html or "<div class='empty'>No goals this week.</div>",
-        friends_html=friends_html or "<li>No friend activity yet.</li>",
-        cta_url=os.getenv("LIFEMOSAIC_APP_URL", "https://lifemosaic.app"),
+    insights = [{"title": row.get("title"), "message": row.get("message")} for row in summary["insights"]]
+    friends = [{"title": row.get("title"), "description": row.get("description") or ""} for row in summary["friends"]]
+    return get_template(WEEKLY_SUMMARY_TEMPLATE).render(
+        {
+            "week_range": f"{summary['week_start']} to {summary['week_end']}",
+            "savings_total": f"${summary['savings_total']:.2f}",
+            "spending_total": f"${summary['spending_total']:.2f}",
+            "spending_vs_budget": f"{summary['spending_vs_budget']:+.2f}",
+            "wellness_change": f"{summary['wellness_change']:+.1f}",
+            "sustainability_total": f"{summary['sustainability_total']:.1f} kg CO₂",
+            "highlights_html": HIGHLIGHT_ITEM.render_each(highlights) or "<li>No highlights yet.</li>",
+            "insights_html": INSIGHT_ITEM.render_each(insights) or "<li>No insights yet.</li>",
+            "goals_html": GOAL_ROW.render_each(summary["goals"]) or "<div class='empty'>No goals this week.</div>",
+            "friends_html": FRIEND_ITEM.render_each(friends) or "<li>No friend activity yet.</li>",
+            "cta_url": os.getenv("LIFEMOSAIC_APP_URL", "https://lifemosaic.app"),
+        }
     )
 
 
@@ -226,98 +288,116 @@ def _get_user_email(user_id: str) -> str | None:
         return None
 
 
-def send_email_verification_email(user_id: str, verify_url: str) -> dict[str, Any]:
-    email = _get_user_email(user_id)
-    if not email:
-        return {"status": "skipped", "reason": "no_email"}
+def _smtp_settings() -> dict[str, Any] | None:
     smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
+    if not smtp_host:
+        return None
     smtp_user = os.getenv("SMTP_USERNAME")
     smtp_pass = os.getenv("SMTP_PASSWORD")
-    smtp_from = os.getenv("SMTP_FROM", smtp_user or "no-reply@lifemosaic.app")
-    if not smtp_host or not smtp_user or not smtp_pass:
-        return {"status": "skipped", "reason": "smtp_not_configured"}
-    subject = "Verify your LifeMosaic email"
-    html = (
-        "<html><body style='font-family:Arial,sans-serif;'>"
-        "<h2>Verify your email</h2>"
-        "<p>Use the link below to verify your LifeMosaic account.</p>"
-        f"<p><a href='{verify_url}'>Verify email</a></p>"
-        "<p>If you did not create this account, you can ignore this email.</p>"
-        "</body></html>"
-    )
-    message = MIMEMultipart("alternative")
-    message["Subject"] = subject
-    message["From"] = smtp_from
-    message["To"] = email
-    message.attach(MIMEText(html, "html"))
-    use_tls = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        if use_tls:
-            server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.sendmail(smtp_from, [email], message.as_string())
-    return {"status": "sent", "email": email}
+    if bool(smtp_user) != bool(smtp_pass):
+        return None
+    return {
+        "host": smtp_host,
+        "port": int(os.getenv("SMTP_PORT", "587")),
+        "username": smtp_user,
+        "password": smtp_pass,
+        "from": os.getenv("SMTP_FROM", smtp_user or "no-reply@lifemosaic.app"),
+        "use_tls": os.getenv("SMTP_USE_TLS", "true").lower() != "false",
+    }
 
 
-def send_account_deletion_email(user_id: str, confirm_url: str) -> dict[str, Any]:
+class SMTPSession:
+    def __init__(self, settings: dict[str, Any], max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION) -> None:
+        self.settings = settings
+        self.max_messages = max_messages
+        self.connections = 0
+        self.messages = 0
+        self._server: smtplib.SMTP | None = None
+        self._sent_on_connection = 0
+
+    @classmethod
+    def from_env(cls) -> "SMTPSession | None":
+        settings = _smtp_settings()
+        return cls(settings) if settings is not None else None
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._server is None:
+            server = smtplib.SMTP(self.settings["host"], self.settings["port"], timeout=SMTP_TIMEOUT_SECONDS)
+            try:
+                if self.settings["use_tls"]:
+                    server.starttls()
+                if self.settings["username"]:
+                    server.login(self.settings["username"], self.settings["password"])
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+            self._sent_on_connection = 0
+            self.connections += 1
+        return self._server
+
+    def send(self, email: str, subject: str, html: str) -> None:
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self.settings["from"]
+        message["To"] = email
+        message.attach(MIMEText(html, "html"))
+        payload = message.as_string()
+        try:
+            self._connect().sendmail(self.settings["from"], [email], payload)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self._connect().sendmail(self.settings["from"], [email], payload)
+        self.messages += 1
+        self._sent_on_connection += 1
+        if self._sent_on_connection >= self.max_messages:
+            self.close()
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _send_email(user_id: str, subject: str, html: str, session: SMTPSession | None = None) -> dict[str, Any]:
     email = _get_user_email(user_id)
     if not email:
         return {"status": "skipped", "reason": "no_email"}
-    smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USERNAME")
-    smtp_pass = os.getenv("SMTP_PASSWORD")
-    smtp_from = os.getenv("SMTP_FROM", smtp_user or "no-reply@lifemosaic.app")
-    if not smtp_host or not smtp_user or not smtp_pass:
+    if session is not None:
+        session.send(email, subject, html)
+        return {"status": "sent", "email": email}
+    settings = _smtp_settings()
+    if settings is None:
         return {"status": "skipped", "reason": "smtp_not_configured"}
-    subject = "Confirm your LifeMosaic account deletion"
-    html = (
-        "<html><body style='font-family:Arial,sans-serif;'>"
-        "<h2>Confirm your account deletion</h2>"
-        "<p>You requested to delete your LifeMosaic account. This action schedules deletion "
-        "in 30 days. You can cancel anytime before then.</p>"
-        f"<p><a href='{confirm_url}'>Confirm deletion</a></p>"
-        "<p>If you did not request this, you can ignore this email.</p>"
-        "</body></html>"
-    )
-    message = MIMEMultipart("alternative")
-    message["Subject"] = subject
-    message["From"] = smtp_from
-    message["To"] = email
-    message.attach(MIMEText(html, "html"))
-    use_tls = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        if use_tls:
-            server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.sendmail(smtp_from, [email], message.as_string())
+    with SMTPSession(settings) as one_off:
+        one_off.send(email, subject, html)
     return {"status": "sent", "email": email}
 
 
-def send_weekly_email(user_id: str) -> dict[str, Any]:
-    summary = generate_weekly_summary(user_id)
-    email = _get_user_email(user_id)
-    if not email:
-        return {"status": "skipped", "reason": "no_email"}
-    smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USERNAME")
-    smtp_pass = os.getenv("SMTP_PASSWORD")
-    smtp_from = os.getenv("SMTP_FROM", smtp_user or "no-reply@lifemosaic.app")
-    if not smtp_host or not smtp_user or not smtp_pass:
-        return {"status": "skipped", "reason": "smtp_not_configured"}
+def send_email_verification_email(user_id: str, verify_url: str) -> dict[str, Any]:
+    html = render_template(EMAIL_VERIFICATION_TEMPLATE, {"verify_url": verify_url})
+    return _send_email(user_id, "Verify your LifeMosaic email", html)
+
+
+def send_account_deletion_email(user_id: str, confirm_url: str) -> dict[str, Any]:
+    html = render_template(ACCOUNT_DELETION_TEMPLATE, {"confirm_url": confirm_url})
+    return _send_email(user_id, "Confirm your LifeMosaic account deletion", html)
+
+
+def send_weekly_email(
+    user_id: str, summary: dict[str, Any] | None = None, session: SMTPSession | None = None
+) -> dict[str, Any]:
+    if summary is None:
+        summary = generate_weekly_summary(user_id)
     subject = f"Your LifeMosaic Week: ${summary['savings_total']:.0f} saved, {summary['wellness_change']:+.0f} wellness pts"
-    html = _render_template(summary)
-    message = MIMEMultipart("alternative")
-    message["Subject"] = subject
-    message["From"] = smtp_from
-    message["To"] = email
-    message.attach(MIMEText(html, "html"))
-    use_tls = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        if use_tls:
-            server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.sendmail(smtp_from, [email], message.as_string())
-    return {"status": "sent", "email": email}
+    return _send_email(user_id, subject, _render_template(summary), session)
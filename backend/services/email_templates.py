@@ -0,0 +1,55 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([a-z_][a-z0-9_]*)(\|raw)?\}")
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    name: str
+    literals: tuple[str, ...]
+    slots: tuple[tuple[str, bool], ...]
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        parts = [self.literals[0]]
+        for (key, raw), literal in zip(self.slots, self.literals[1:]):
+            try:
+                value = values[key]
+            except KeyError:
+                raise KeyError(f"Template {self.name} is missing value '{key}'") from None
+            parts.append(str(value) if raw else escape(str(value)))
+            parts.append(literal)
+        return "".join(parts)
+
+    def render_each(self, rows: Iterable[Mapping[str, Any]]) -> str:
+        return "".join(self.render(row) for row in rows)
+
+
+def _templates_dir() -> Path:
+    return Path(__file__).resolve().parents[1] / "templates"
+
+
+def compile_template(source: str, name: str = "<string>") -> EmailTemplate:
+    literals: list[str] = []
+    slots: list[tuple[str, bool]] = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(source):
+        literals.append(source[position : match.start()])
+        slots.append((match.group(1), match.group(2) is not None))
+        position = match.end()
+    literals.append(source[position:])
+    return EmailTemplate(name=name, literals=tuple(literals), slots=tuple(slots))
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> EmailTemplate:
+    path = _templates_dir() / name
+    return compile_template(path.read_text(encoding="utf-8"), name)
+
+
+def render_template(name: str, values: Mapping[str, Any]) -> str:
+    return get_template(name).render(values)
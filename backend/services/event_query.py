@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterator, TypedDict
+
+from db.supabase import get_async_supabase_client, get_supabase_client
+
+EVENTS_TABLE = "events"
+EVENT_COLUMNS = (
+    "id",
+    "user_id",
+    "timestamp",
+    "created_at",
+    "event_type",
+    "category",
+    "title",
+    "amount",
+    "metadata",
+    "scores",
+)
+JSON_COLUMNS = ("metadata", "scores")
+EVENT_PAGE_SIZE = 1000
+
+
+class EventRow(TypedDict, total=False):
+    id: str
+    user_id: str
+    timestamp: str
+    created_at: str
+    event_type: str
+    category: str
+    title: str
+    amount: float | None
+    metadata: dict[str, Any]
+    scores: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class EventProjection:
+    columns: tuple[str, ...]
+    metadata_keys: tuple[str, ...] = ()
+    scores_keys: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        unknown = [column for column in self.columns if column not in EVENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown event columns: {', '.join(unknown)}")
+        for column, keys in self._json_paths():
+            if keys and column in self.columns:
+                raise ValueError(f"Select either {column} or {column} keys, not both")
+
+    def _json_paths(self) -> tuple[tuple[str, tuple[str, ...]], ...]:
+        return (("metadata", self.metadata_keys), ("scores", self.scores_keys))
+
+    def with_columns(self, *columns: str) -> "EventProjection":
+        merged = self.columns + tuple(column for column in columns if column not in self.columns)
+        return EventProjection(merged, self.metadata_keys, self.scores_keys)
+
+    def select_clause(self) -> str:
+        parts = list(self.columns)
+        for column, keys in self._json_paths():
+            parts.extend(f"{column}__{key}:{column}->{key}" for key in keys)
+        return ",".join(parts)
+
+    def shape(self, row: dict[str, Any]) -> EventRow:
+        shaped: dict[str, Any] = {column: row.get(column) for column in self.columns}
+        for column, keys in self._json_paths():
+            if keys:
+                shaped[column] = {
+                    key: row[f"{column}__{key}"] for key in keys if row.get(f"{column}__{key}") is not None
+                }
+        return shaped
+
+
+FULL_EVENT = EventProjection(EVENT_COLUMNS)
+
+
+def keyset_after(query, after: dict[str, str] | None):
+    if not after:
+        return query
+    timestamp = after["timestamp"]
+    return query.or_(f'timestamp.gt."{timestamp}",and(timestamp.eq."{timestamp}",id.gt.{after["id"]})')
+
+
+def keyset_before(query, before: dict[str, str] | None):
+    if not before:
+        return query
+    timestamp = before["timestamp"]
+    return query.or_(f'timestamp.lt."{timestamp}",and(timestamp.eq."{timestamp}",id.lt.{before["id"]})')
+
+
+def _events_query(
+    supabase,
+    user_id: str | list[str],
+    projection: EventProjection,
+    start: datetime | None,
+    end: datetime | None,
+    event_types: list[str] | None,
+):
+    query = supabase.table(EVENTS_TABLE).select(projection.select_clause())
+    if isinstance(user_id, list):
+        query = query.in_("user_id", user_id)
+    else:
+        query = query.eq("user_id", user_id)
+    if start is not None:
+        query = query.gte("timestamp", start.isoformat())
+    if end is not None:
+        query = query.lte("timestamp", end.isoformat())
+    if event_types:
+        query = query.in_("event_type", event_types)
+    return query
+
+
+def fetch_events(
+    user_id: str,
+    projection: EventProjection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    event_types: list[str] | None = None,
+    ordered: bool = False,
+) -> list[EventRow]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    query = _events_query(supabase, user_id, projection, start, end, event_types)
+    if ordered:
+        query = query.order("timestamp", desc=False)
+    response = query.execute()
+    return [projection.shape(row) for row in response.data or []]
+
+
+async def fetch_events_async(
+    user_id: str,
+    projection: EventProjection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    event_types: list[str] | None = None,
+    ordered: bool = False,
+) -> list[EventRow]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    query = _events_query(client, user_id, projection, start, end, event_types)
+    if ordered:
+        query = query.order("timestamp", desc=False)
+    response = await query.execute()
+    return [projection.shape(row) for row in response.data or []]
+
+
+def iter_events(
+    user_id: str | list[str],
+    projection: EventProjection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    event_types: list[str] | None = None,
+    page_size: int = EVENT_PAGE_SIZE,
+) -> Iterator[EventRow]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    paged = projection.with_columns("id", "timestamp")
+    if isinstance(user_id, list):
+        paged = paged.with_columns("user_id")
+    after: dict[str, str] | None = None
+    while True:
+        query = keyset_after(_events_query(supabase, user_id, paged, start, end, event_types), after)
+        rows = query.order("timestamp", desc=False).order("id", desc=False).limit(page_size).execute().data or []
+        for row in rows:
+            yield paged.shape(row)
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+        after = {"timestamp": str(last.get("timestamp")), "id": str(last.get("id"))}
+
+
+async def iter_events_async(
+    user_id: str,
+    projection: EventProjection,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    event_types: list[str] | None = None,
+    page_size: int = EVENT_PAGE_SIZE,
+) -> AsyncIterator[EventRow]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    paged = projection.with_columns("id", "timestamp")
+    after: dict[str, str] | None = None
+    while True:
+        query = keyset_after(_events_query(client, user_id, paged, start, end, event_types), after)
+        response = await query.order("timestamp", desc=False).order("id", desc=False).limit(page_size).execute()
+        rows = response.data or []
+        for row in rows:
+            yield paged.shape(row)
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+        after = {"timestamp": str(last.get("timestamp")), "id": str(last.get("id"))}
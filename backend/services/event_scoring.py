@@ -1,6 +1,14 @@
 from typing import Any, Dict
 
-from services.config_loader import get_scoring_rules
+from services.config_loader import get_scoring_ruleset
+from services.scoring_ruleset import (
+    HEALTHY_FLAG_PATTERN,
+    JUNK_FLAG_PATTERN,
+    MEAT_INGREDIENTS,
+    PLANT_INGREDIENTS,
+    PROCESSED_INGREDIENTS,
+    ScoringRuleset,
+)
 
 
 def _clamp(value: float, min_value: float = -100.0, max_value: float = 100.0) -> float:
@@ -16,15 +24,6 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
-def _pick_profile(rules: dict[str, Any], user_profile: str | None) -> dict[str, Any]:
-    profiles = rules.get("profiles") or {}
-    if user_profile and user_profile in profiles:
-        return profiles[user_profile]
-    if "Student" in profiles:
-        return profiles["Student"]
-    return next(iter(profiles.values()), {})
-
-
 def _join_explanations(parts: list[str]) -> str:
     return ", ".join([part for part in parts if part])
 
@@ -35,14 +34,11 @@ def compute_event_scores(
     amount: Any = None,
     metadata: Dict[str, Any] | None = None,
     user_profile: str | None = None,
+    ruleset: ScoringRuleset | None = None,
 ) -> Dict[str, Any]:
     m = metadata or {}
-    rules = get_scoring_rules()
-    profile_rules = _pick_profile(rules, user_profile)
-    food_rules = profile_rules.get("food", {})
-    movement_rules = profile_rules.get("movement", {})
-    sleep_rules = profile_rules.get("sleep", {})
-    sustainability_rules = rules.get("sustainability", {})
+    rules = ruleset or get_scoring_ruleset()
+    profile = rules.profile(user_profile)
 
     wellness = 0
     cost = 0.0
@@ -61,67 +57,55 @@ def compute_event_scores(
         ingredients = m.get("ingredients") or []
         nutrition_quality_score = _safe_float(m.get("nutrition_quality_score"))
 
-        healthy_bonus = float(food_rules.get("healthy_bonus", 50))
-        junk_penalty = float(food_rules.get("junk_penalty", -30))
         if nutrition_quality_score is not None:
             if nutrition_quality_score >= 7:
-                wellness += healthy_bonus
-                wellness_explanations.append(f"Healthy meal (+{int(healthy_bonus)})")
+                wellness += profile.healthy_bonus
+                wellness_explanations.append(profile.healthy_explanation)
             elif nutrition_quality_score <= 3:
-                wellness += junk_penalty
-                wellness_explanations.append(f"Low quality meal ({int(junk_penalty)})")
+                wellness += profile.junk_penalty
+                wellness_explanations.append(profile.junk_explanation)
         else:
-            if any(key in quality_flag for key in ["healthy", "salad", "whole", "fresh"]):
-                wellness += healthy_bonus
-                wellness_explanations.append(f"Healthy meal (+{int(healthy_bonus)})")
-            elif any(key in quality_flag for key in ["junk", "fast", "fried", "processed"]):
-                wellness += junk_penalty
-                wellness_explanations.append(f"Low quality meal ({int(junk_penalty)})")
-
-        food_sustainability = sustainability_rules.get("food", {})
-        names = [str(i).lower() for i in ingredients if isinstance(i, str)]
-        if any(n in names for n in ["tofu", "bean", "beans", "lentil", "vegetable", "veggie", "salad"]):
-            value = float(food_sustainability.get("plant_based", 40))
-            sustainability += value
-            sustainability_explanations.append(f"Plant-based (+{int(value)})")
-        if any(n in names for n in ["beef", "pork", "lamb", "meat", "steak", "chicken"]):
-            value = float(food_sustainability.get("meat", -30))
-            sustainability += value
-            sustainability_explanations.append(f"Meat ({int(value)})")
-        if any(n in names for n in ["processed", "frozen", "packaged", "chips", "soda"]):
-            value = float(food_sustainability.get("processed", -20))
-            sustainability += value
-            sustainability_explanations.append(f"Processed ({int(value)})")
+            if HEALTHY_FLAG_PATTERN.search(quality_flag):
+                wellness += profile.healthy_bonus
+                wellness_explanations.append(profile.healthy_explanation)
+            elif JUNK_FLAG_PATTERN.search(quality_flag):
+                wellness += profile.junk_penalty
+                wellness_explanations.append(profile.junk_explanation)
+
+        names = {i.lower() for i in ingredients if isinstance(i, str)}
+        if not PLANT_INGREDIENTS.isdisjoint(names):
+            sustainability += rules.plant_based
+            sustainability_explanations.append(rules.plant_based_explanation)
+        if not MEAT_INGREDIENTS.isdisjoint(names):
+            sustainability += rules.meat
+            sustainability_explanations.append(rules.meat_explanation)
+        if not PROCESSED_INGREDIENTS.isdisjoint(names):
+            sustainability += rules.processed
+            sustainability_explanations.append(rules.processed_explanation)
 
     elif et == "movement":
         duration = _safe_float(m.get("duration_minutes")) or (amt_num or 0)
-        per_minute = float(movement_rules.get("per_minute", 2))
-        max_score = float(movement_rules.get("max", 100))
-        movement_score = min(max_score, (duration or 0) * per_minute)
+        movement_score = min(profile.movement_max, (duration or 0) * profile.movement_per_minute)
         wellness += movement_score
         if duration and duration > 0:
             wellness_explanations.append(f"Movement {int(duration)} min (+{int(movement_score)})")
         activity_type = str(m.get("type", "")).lower()
-        transport_rules = sustainability_rules.get("transport", {})
         if "walk" in activity_type:
-            value = float(transport_rules.get("walk", 50))
-            sustainability += value
-            sustainability_explanations.append(f"Walking (+{int(value)})")
+            sustainability += rules.walk
+            sustainability_explanations.append(rules.walk_explanation)
         elif "bike" in activity_type:
-            value = float(transport_rules.get("bike", 45))
-            sustainability += value
-            sustainability_explanations.append(f"Biking (+{int(value)})")
+            sustainability += rules.bike
+            sustainability_explanations.append(rules.bike_explanation)
         elif "car" in activity_type or "drive" in activity_type:
-            value = float(transport_rules.get("car", -30))
-            sustainability += value
-            sustainability_explanations.append(f"Car travel ({int(value)})")
+            sustainability += rules.car
+            sustainability_explanations.append(rules.car_explanation)
 
     elif et == "sleep":
         hours = amt_num or _safe_float(m.get("hours"))
         if hours is not None:
-            optimal_min = float(sleep_rules.get("optimal_min", 7))
-            optimal_max = float(sleep_rules.get("optimal_max", 8))
-            penalty = float(sleep_rules.get("penalty_per_hour", -10))
+            optimal_min = profile.sleep_optimal_min
+            optimal_max = profile.sleep_optimal_max
+            penalty = profile.sleep_penalty_per_hour
             if optimal_min <= hours <= optimal_max:
                 wellness_explanations.append("Optimal sleep window (0)")
             else:
@@ -1,15 +1,25 @@
-from datetime import datetime, timedelta
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Literal
 
-from db.supabase import get_supabase_client
+from db.supabase import get_async_supabase_client, get_supabase_client
 from models.events import EventCreate, EventOut
-from services.analytics_service import save_daily_snapshot
+from services.config_loader import get_scoring_ruleset
+from services.daily_rollups import apply_rollup_deltas, refresh_daily_rollup
+from services.event_query import FULL_EVENT, keyset_after, keyset_before
 from services.event_scoring import compute_event_scores
-from services.movement_service import update_daily_movement
-from services.achievements import check_and_award_achievements
-from services.alert_service import create_alert
-from services.push_service import notify_spending_alert
+from services.mosaic_service import invalidate_mosaic_snapshots
+from services.post_insert_queue import enqueue_post_insert, enqueue_post_insert_batch
+from services.response_cache import invalidate_user
 
 TABLE_NAME = "events"
+BULK_INSERT_BATCH = 500
+RESCORE_PAGE_SIZE = 500
+RESCORE_FIELDS = "id,user_id,event_type,category,title,amount,metadata,scores,timestamp"
+STREAM_PAGE_SIZE = 1000
+CountMode = Literal["exact", "planned", "estimated"]
 
 
 def create_event(event: EventCreate) -> EventOut:
@@ -28,81 +38,69 @@ def create_event(event: EventCreate) -> EventOut:
     if not response.data:
         raise RuntimeError("Failed to create event")
     created = EventOut(**response.data[0])
-    try:
-        event_date = (event.timestamp or datetime.utcnow()).date()
-        save_daily_snapshot(event.user_id, datetime.combine(event_date, datetime.min.time()))
-        if (event.event_type or "").lower() == "movement":
-            update_daily_movement(event.user_id, event_date)
-        check_and_award_achievements(event.user_id)
-        if (event.event_type or "").lower() == "spending":
-            _maybe_spending_alert(event.user_id, event.amount, event.timestamp)
-    except Exception:
-        pass
+    enqueue_post_insert({**payload, "id": response.data[0].get("id"), "user_id": event.user_id})
     return created
 
 
-def _maybe_spending_alert(user_id: str, amount: float | None, timestamp: datetime | None) -> None:
-    if amount is None:
-        return
+def create_events_bulk(events: list[EventCreate]) -> list[EventOut]:
+    if not events:
+        return []
     supabase = get_supabase_client()
+    payloads = []
+    for event in events:
+        metadata = (
+            event.metadata.model_dump()
+            if hasattr(event.metadata, "model_dump")
+            else (event.metadata or None)
+        )
+        payload = event.model_dump()
+        payload["scores"] = compute_event_scores(event.event_type, event.category, event.amount, metadata)
+        payloads.append(payload)
     if supabase is None:
-        return
-    end = timestamp or datetime.utcnow()
-    start = end - timedelta(days=7)
-    response = (
-        supabase.table(TABLE_NAME)
-        .select("amount,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = response.data or []
-    daily_totals: dict[str, float] = {}
-    for row in rows:
-        ts = row.get("timestamp")
-        if not ts:
-            continue
-        try:
-            day = datetime.fromisoformat(str(ts).replace("Z", "+00:00")).date().isoformat()
-        except Exception:
-            continue
-        val = row.get("amount")
-        if val is None:
-            continue
-        daily_totals[day] = daily_totals.get(day, 0.0) + abs(float(val))
-    if not daily_totals:
-        return
-    avg_daily = sum(daily_totals.values()) / max(1, len(daily_totals))
-    current_amount = abs(float(amount))
-    if avg_daily <= 0:
-        return
-    if current_amount < avg_daily * 1.4:
-        return
-    overage = max(0.0, current_amount - avg_daily)
-    create_alert(
-        user_id,
-        "reminders",
-        "Spending alert",
-        f"Spending hit ${current_amount:.2f} today",
-        "/analytics",
-    )
-    notify_spending_alert(user_id, overage)
+        return [
+            EventOut(id=f"evt_placeholder_{index}", created_at=datetime.utcnow(), **payload)
+            for index, payload in enumerate(payloads)
+        ]
+    created: list[EventOut] = []
+    for start in range(0, len(payloads), BULK_INSERT_BATCH):
+        batch = payloads[start : start + BULK_INSERT_BATCH]
+        response = supabase.table(TABLE_NAME).insert(batch).execute()
+        if not response.data or len(response.data) != len(batch):
+            raise RuntimeError("Failed to create events")
+        created.extend(EventOut(**row) for row in response.data)
+        enqueue_post_insert_batch([{**payload, "id": row.get("id")} for payload, row in zip(batch, response.data)])
+    return created
 
 
-def get_events(
+def encode_event_cursor(row: dict[str, Any]) -> str:
+    payload = json.dumps({"t": str(row["timestamp"]), "i": str(row["id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> dict[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        before = {"timestamp": str(payload["t"]), "id": str(payload["i"])}
+        datetime.fromisoformat(before["timestamp"].replace("Z", "+00:00"))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not before["id"] or any(char in before["id"] for char in ',()"'):
+        raise ValueError("Invalid cursor")
+    return before
+
+
+def _list_query(
+    supabase,
     user_id: str,
-    start_date: datetime | None = None,
-    end_date: datetime | None = None,
-    event_types: list[str] | None = None,
-    categories: list[str] | None = None,
-    limit: int = 50,
-    offset: int = 0,
-) -> dict[str, object]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    query = supabase.table(TABLE_NAME).select("*", count="exact").eq("user_id", user_id)
+    start_date: datetime | None,
+    end_date: datetime | None,
+    event_types: list[str] | None,
+    categories: list[str] | None,
+    before: dict[str, str] | None,
+    count: CountMode | None = None,
+):
+    query = supabase.table(TABLE_NAME).select(FULL_EVENT.select_clause(), count=count).eq("user_id", user_id)
     if start_date is not None:
         query = query.gte("timestamp", start_date.isoformat())
     if end_date is not None:
@@ -111,36 +109,115 @@ def get_events(
         query = query.in_("event_type", event_types)
     if categories:
         query = query.in_("category", categories)
-    query = query.order("timestamp", desc=True)
-    query = query.range(offset, offset + limit - 1)
-    response = query.execute()
+    query = keyset_before(query, before)
+    return query.order("timestamp", desc=True).order("id", desc=True)
+
+
+def _paged_events_query(
+    client,
+    user_id: str,
+    start_date: datetime | None,
+    end_date: datetime | None,
+    event_types: list[str] | None,
+    categories: list[str] | None,
+    limit: int,
+    offset: int,
+    cursor: str | None,
+    count: CountMode | None,
+):
+    before = decode_event_cursor(cursor) if cursor else None
+    query = _list_query(client, user_id, start_date, end_date, event_types, categories, before, count)
+    if before is None and offset:
+        return query.range(offset, offset + limit)
+    return query.limit(limit + 1)
+
+
+def _events_page(response, limit: int, count: CountMode | None) -> dict[str, object]:
     rows = response.data or []
-    total = int(response.count or 0)
-    if total == 0 and rows:
-        total = offset + len(rows)
-    has_more = offset + len(rows) < total
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     return {
         "events": [EventOut(**row) for row in rows],
-        "total": total,
+        "total": int(response.count) if count and response.count is not None else None,
         "has_more": has_more,
+        "next_cursor": encode_event_cursor(rows[-1]) if has_more else None,
     }
 
 
-def rescore_events(
+def get_events(
     user_id: str,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     event_types: list[str] | None = None,
     categories: list[str] | None = None,
-) -> int:
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+) -> dict[str, object]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    query = (
-        supabase.table(TABLE_NAME)
-        .select("id,event_type,category,amount,metadata,timestamp")
-        .eq("user_id", user_id)
+    query = _paged_events_query(
+        supabase, user_id, start_date, end_date, event_types, categories, limit, offset, cursor, count
+    )
+    return _events_page(query.execute(), limit, count)
+
+
+async def get_events_async(
+    user_id: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    event_types: list[str] | None = None,
+    categories: list[str] | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+) -> dict[str, object]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    query = _paged_events_query(
+        client, user_id, start_date, end_date, event_types, categories, limit, offset, cursor, count
     )
+    return _events_page(await query.execute(), limit, count)
+
+
+async def stream_events_async(
+    user_id: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    event_types: list[str] | None = None,
+    categories: list[str] | None = None,
+    cursor: str | None = None,
+    page_size: int = STREAM_PAGE_SIZE,
+) -> AsyncIterator[EventOut]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    before = decode_event_cursor(cursor) if cursor else None
+    while True:
+        query = _list_query(client, user_id, start_date, end_date, event_types, categories, before)
+        rows = (await query.limit(page_size).execute()).data or []
+        for row in rows:
+            yield EventOut(**row)
+        if len(rows) < page_size:
+            return
+        before = {"timestamp": str(rows[-1]["timestamp"]), "id": str(rows[-1]["id"])}
+
+
+def _rescore_query(
+    supabase,
+    user_id: str,
+    start_date: datetime | None,
+    end_date: datetime | None,
+    event_types: list[str] | None,
+    categories: list[str] | None,
+    after: dict[str, str] | None,
+    page_size: int,
+):
+    query = supabase.table(TABLE_NAME).select(RESCORE_FIELDS).eq("user_id", user_id)
     if start_date is not None:
         query = query.gte("timestamp", start_date.isoformat())
     if end_date is not None:
@@ -149,23 +226,71 @@ def rescore_events(
         query = query.in_("event_type", event_types)
     if categories:
         query = query.in_("category", categories)
-    response = query.execute()
-    rows = response.data or []
-    if not rows:
-        return 0
-    updates = []
-    for row in rows:
-        scores = compute_event_scores(
-            row.get("event_type", ""),
-            row.get("category", ""),
-            row.get("amount"),
-            row.get("metadata") or {},
-        )
-        updates.append({"id": row.get("id"), "scores": scores})
-    upsert_resp = supabase.table(TABLE_NAME).upsert(updates, on_conflict="id").execute()
-    if upsert_resp.error:
-        raise RuntimeError(str(upsert_resp.error))
-    return len(updates)
+    query = keyset_after(query, after)
+    return query.order("timestamp", desc=False).order("id", desc=False).limit(page_size)
+
+
+def rescore_events(
+    user_id: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    event_types: list[str] | None = None,
+    categories: list[str] | None = None,
+    page_size: int = RESCORE_PAGE_SIZE,
+    checkpoint: dict[str, str] | None = None,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+) -> int:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    ruleset = get_scoring_ruleset()
+    page_size = max(1, min(RESCORE_PAGE_SIZE, int(page_size)))
+    after = checkpoint
+    scanned = 0
+    written = 0
+    while True:
+        response = _rescore_query(
+            supabase, user_id, start_date, end_date, event_types, categories, after, page_size
+        ).execute()
+        rows = response.data or []
+        if not rows:
+            break
+        updates = []
+        previous = []
+        for row in rows:
+            scores = compute_event_scores(
+                row.get("event_type", ""),
+                row.get("category", ""),
+                row.get("amount"),
+                row.get("metadata") or {},
+                ruleset=ruleset,
+            )
+            if scores != row.get("scores"):
+                updates.append({**row, "scores": scores})
+                previous.append(row)
+        if updates:
+            supabase.table(TABLE_NAME).upsert(updates, on_conflict="id").execute()
+            by_day: dict[date, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = {}
+            for old, new in zip(previous, updates):
+                if old.get("timestamp"):
+                    day = datetime.fromisoformat(str(old["timestamp"]).replace("Z", "+00:00")).date()
+                    day_rows = by_day.setdefault(day, ([], []))
+                    day_rows[0].append(new)
+                    day_rows[1].append(old)
+            for day, (added, removed) in sorted(by_day.items()):
+                if not apply_rollup_deltas(user_id, day, added, removed):
+                    refresh_daily_rollup(user_id, day)
+            invalidate_mosaic_snapshots(user_id, sorted(by_day))
+            invalidate_user(user_id)
+        scanned += len(rows)
+        written += len(updates)
+        last = rows[-1]
+        after = {"timestamp": str(last.get("timestamp")), "id": str(last.get("id"))}
+        if on_progress is not None:
+            on_progress({"user_id": user_id, "scanned": scanned, "written": written, "checkpoint": after})
+        if len(rows) < page_size:
+            break
+    return scanned
 
 
 def get_event_stats(
@@ -0,0 +1,160 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date as date_type, datetime
+from functools import cached_property
+from typing import Any, Iterator
+
+import numpy as np
+
+from db.supabase import get_supabase_client
+
+EVENTS_TABLE = "events"
+WINDOW_FIELDS = "event_type,category,amount,metadata,scores,timestamp,title"
+
+
+def _safe_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def _parse_ts(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except Exception:
+            return None
+    return None
+
+
+@dataclass(frozen=True)
+class EventRecord:
+    timestamp: datetime
+    day: date_type
+    event_type: str
+    category: str
+    amount: float | None
+    title: str
+    metadata: dict[str, Any]
+    scores: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class EventWindow:
+    start: date_type
+    end: date_type
+    timestamps: tuple[datetime, ...]
+    days: tuple[date_type, ...]
+    event_types: tuple[str, ...]
+    categories: tuple[str, ...]
+    amounts: tuple[float | None, ...]
+    titles: tuple[str, ...]
+    metadata: tuple[dict[str, Any], ...]
+    scores: tuple[dict[str, Any], ...]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        for values in zip(
+            self.timestamps,
+            self.days,
+            self.event_types,
+            self.categories,
+            self.amounts,
+            self.titles,
+            self.metadata,
+            self.scores,
+        ):
+            yield EventRecord(*values)
+
+    @cached_property
+    def ordinals(self) -> np.ndarray:
+        return np.fromiter((day.toordinal() for day in self.days), dtype=np.int64, count=len(self.days))
+
+    @cached_property
+    def amount_values(self) -> np.ndarray:
+        return np.array([np.nan if amount is None else amount for amount in self.amounts], dtype=float)
+
+    def type_mask(self, *event_types: str) -> np.ndarray:
+        return np.isin(np.array(self.event_types, dtype=object), event_types)
+
+    def category_mask(self, *categories: str) -> np.ndarray:
+        return np.isin(np.array(self.categories, dtype=object), categories)
+
+    def covers(self, start: date_type, end: date_type) -> bool:
+        return self.start <= start and end <= self.end
+
+    def slice(self, start: date_type, end: date_type) -> "EventWindow":
+        lo = bisect_left(self.days, start)
+        hi = bisect_right(self.days, end)
+        return EventWindow(
+            start=max(start, self.start),
+            end=min(end, self.end),
+            timestamps=self.timestamps[lo:hi],
+            days=self.days[lo:hi],
+            event_types=self.event_types[lo:hi],
+            categories=self.categories[lo:hi],
+            amounts=self.amounts[lo:hi],
+            titles=self.titles[lo:hi],
+            metadata=self.metadata[lo:hi],
+            scores=self.scores[lo:hi],
+        )
+
+
+def build_event_window(rows: list[dict[str, Any]], start: date_type, end: date_type) -> EventWindow:
+    parsed = []
+    for row in rows:
+        ts = _parse_ts(row.get("timestamp"))
+        if ts is None:
+            continue
+        parsed.append((ts, row))
+    parsed.sort(key=lambda item: item[0])
+    return EventWindow(
+        start=start,
+        end=end,
+        timestamps=tuple(ts for ts, _ in parsed),
+        days=tuple(ts.date() for ts, _ in parsed),
+        event_types=tuple((row.get("event_type") or "").lower() for _, row in parsed),
+        categories=tuple((row.get("category") or "").lower() for _, row in parsed),
+        amounts=tuple(_safe_float(row.get("amount")) for _, row in parsed),
+        titles=tuple(row.get("title") or "" for _, row in parsed),
+        metadata=tuple(row.get("metadata") or {} for _, row in parsed),
+        scores=tuple(row.get("scores") or {} for _, row in parsed),
+    )
+
+
+def load_event_window(user_id: str, start: date_type, end: date_type) -> EventWindow:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    response = (
+        supabase.table(EVENTS_TABLE)
+        .select(WINDOW_FIELDS)
+        .eq("user_id", user_id)
+        .gte("timestamp", datetime.combine(start, datetime.min.time()).isoformat())
+        .lte("timestamp", datetime.combine(end, datetime.max.time()).isoformat())
+        .order("timestamp", desc=False)
+        .execute()
+    )
+    return build_event_window(response.data or [], start, end)
+
+
+class EventWindowLoader:
+    def __init__(self, user_id: str) -> None:
+        self.user_id = user_id
+        self._window: EventWindow | None = None
+
+    def get(self, start: date_type, end: date_type) -> EventWindow:
+        if self._window is None:
+            self._window = load_event_window(self.user_id, start, end)
+        elif not self._window.covers(start, end):
+            self._window = load_event_window(
+                self.user_id, min(start, self._window.start), max(end, self._window.end)
+            )
+        return self._window.slice(start, end)
@@ -0,0 +1,90 @@
+import os
+import threading
+from typing import Any, Iterable
+
+from services.batch_fetch import fetch_rows_in
+from services.response_cache import InMemoryBackend
+
+FRIENDSHIPS_TABLE = "friendships"
+FRIEND_GRAPH_MAX_USERS = max(1, int(os.getenv("FRIEND_GRAPH_MAX_USERS", "50000")))
+FRIEND_GRAPH_TTL_SECONDS = float(os.getenv("FRIEND_GRAPH_TTL_SECONDS", "300"))
+
+_adjacency = InMemoryBackend(FRIEND_GRAPH_MAX_USERS, FRIEND_GRAPH_TTL_SECONDS)
+_versions: dict[str, int] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _lock:
+        _stats[name] += amount
+
+
+def _accepted(query):
+    return query.eq("status", "accepted")
+
+
+def _load_adjacency(user_ids: list[str]) -> dict[str, frozenset[str]]:
+    friends: dict[str, set[str]] = {user_id: set() for user_id in user_ids}
+    for row in fetch_rows_in(
+        FRIENDSHIPS_TABLE, "user_id,friend_id", "user_id", user_ids, _accepted, order=("user_id", "friend_id")
+    ):
+        if row.get("friend_id") and str(row.get("user_id")) in friends:
+            friends[str(row["user_id"])].add(str(row["friend_id"]))
+    for row in fetch_rows_in(
+        FRIENDSHIPS_TABLE, "user_id,friend_id", "friend_id", user_ids, _accepted, order=("friend_id", "user_id")
+    ):
+        if row.get("user_id") and str(row.get("friend_id")) in friends:
+            friends[str(row["friend_id"])].add(str(row["user_id"]))
+    return {user_id: frozenset(ids) for user_id, ids in friends.items()}
+
+
+def friend_ids_for_users(user_ids: Iterable[str]) -> dict[str, frozenset[str]]:
+    wanted = sorted({str(user_id) for user_id in user_ids if user_id})
+    result: dict[str, frozenset[str]] = {}
+    missing: list[str] = []
+    for user_id in wanted:
+        cached = _adjacency.get(user_id)
+        if cached is None:
+            missing.append(user_id)
+        else:
+            result[user_id] = cached
+    _count("hits", len(result))
+    if not missing:
+        return result
+    _count("misses", len(missing))
+    with _lock:
+        versions = {user_id: _versions.get(user_id, 0) for user_id in missing}
+    loaded = _load_adjacency(missing)
+    _count("loads")
+    with _lock:
+        for user_id, friends in loaded.items():
+            if _versions.get(user_id, 0) == versions[user_id]:
+                _adjacency.set(user_id, friends)
+    result.update(loaded)
+    return result
+
+
+def friend_ids(user_id: str) -> frozenset[str]:
+    return friend_ids_for_users([user_id]).get(str(user_id), frozenset())
+
+
+def invalidate_friend_graph(user_ids: Iterable[str]) -> None:
+    stale = {str(user_id) for user_id in user_ids if user_id}
+    with _lock:
+        for user_id in stale:
+            _versions[user_id] = _versions.get(user_id, 0) + 1
+        _stats["invalidations"] += len(stale)
+    for user_id in stale:
+        _adjacency.delete(user_id)
+
+
+def get_friend_graph_metrics() -> dict[str, Any]:
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "cached_users": len(_adjacency),
+        **stats,
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
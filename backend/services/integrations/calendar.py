@@ -7,7 +7,7 @@ from urllib import request, parse
 
 from db.supabase import get_supabase_client
 from models.events import EventCreate
-from services.event_service import create_event
+from services.event_service import create_events_bulk
 
 PROVIDER = "google_calendar"
 TABLE_NAME = "integrations"
@@ -125,7 +125,7 @@ def sync_events(user_id: str, days: int = 30) -> dict[str, Any]:
     headers = {"Authorization": f"Bearer {access_token}"}
     payload = _request_json(url, headers=headers)
     items = payload.get("items") or []
-    created_events: list[str] = []
+    events: list[EventCreate] = []
     for item in items:
         summary = item.get("summary") or "Calendar event"
         start = (item.get("start") or {}).get("dateTime") or (item.get("start") or {}).get("date")
@@ -146,8 +146,8 @@ def sync_events(user_id: str, days: int = 30) -> dict[str, Any]:
                 "calendar_source": "google",
             },
         )
-        created = create_event(event)
-        created_events.append(created.id)
+        events.append(event)
+    created_events = [created.id for created in create_events_bulk(events)]
     supabase = _require_supabase()
     supabase.table(TABLE_NAME).update({"last_sync": datetime.utcnow().isoformat()}).eq("id", row.get("id")).execute()
     return {"synced": len(created_events), "event_ids": created_events}
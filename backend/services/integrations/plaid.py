@@ -7,7 +7,7 @@ from urllib import request
 
 from db.supabase import get_supabase_client
 from models.events import EventCreate
-from services.event_service import create_event
+from services.event_service import create_events_bulk
 
 PROVIDER = "plaid"
 TABLE_NAME = "integrations"
@@ -146,7 +146,7 @@ def sync_transactions(user_id: str, days: int = 30) -> dict[str, Any]:
     }
     transactions = _plaid_request("/transactions/get", payload)
     items = transactions.get("transactions") or []
-    created_ids: list[str] = []
+    events: list[EventCreate] = []
     for item in items:
         amount = float(item.get("amount") or 0)
         name = item.get("name") or "Bank transaction"
@@ -168,8 +168,8 @@ def sync_transactions(user_id: str, days: int = 30) -> dict[str, Any]:
                 "plaid_transaction_id": item.get("transaction_id"),
             },
         )
-        created = create_event(event)
-        created_ids.append(created.id)
+        events.append(event)
+    created_ids = [created.id for created in create_events_bulk(events)]
     supabase = _require_supabase()
     supabase.table(TABLE_NAME).update({"last_sync": datetime.utcnow().isoformat()}).eq("id", row.get("id")).execute()
     return {"synced": len(created_ids), "event_ids": created_ids}
@@ -0,0 +1,16 @@
+import threading
+from typing import Hashable, Iterable
+
+
+class LockStripes:
+    def __init__(self, stripes: int) -> None:
+        self._locks = [threading.Lock() for _ in range(max(1, stripes))]
+
+    def _index(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+
+    def lock_for(self, key: Hashable) -> threading.Lock:
+        return self._locks[self._index(key)]
+
+    def locks_for(self, keys: Iterable[Hashable]) -> list[threading.Lock]:
+        return [self._locks[index] for index in sorted({self._index(key) for key in keys})]
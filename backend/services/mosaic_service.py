@@ -1,11 +1,27 @@
+import calendar
+import logging
+import uuid
 from datetime import date as date_type, datetime, timedelta
-from typing import Any
+from typing import Any, Iterable
 
-from db.supabase import get_supabase_client
+from db.supabase import get_async_supabase_client, get_supabase_client
+from services.event_query import EventProjection, iter_events, iter_events_async
+from services.query_gather import gather_queries, gather_queries_async
+
+logger = logging.getLogger(__name__)
 
-EVENTS_TABLE = "events"
 MOVEMENT_TABLE = "movement_patterns"
 ACTIVITY_TABLE = "activity_logs"
+MOSAIC_SNAPSHOTS_TABLE = "mosaic_snapshots"
+MOSAIC_SNAPSHOT_VERSION = 1
+MOSAIC_MAX_RANGE_DAYS = 31
+MOSAIC_LATE_ROW_DAYS = 1
+MOSAIC_GUARD_FIELDS = ("version", "stale", "invalidation_id")
+MOSAIC_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "amount", "timestamp"),
+    metadata_keys=("duration_minutes", "nutrition_quality_score"),
+    scores_keys=("wellness_impact",),
+)
 
 
 def _day_bounds(d: date_type) -> tuple[datetime, datetime]:
@@ -83,43 +99,289 @@ def generate_daily_story(tiles: list[dict[str, Any]]) -> str:
     return f"{unique_parts[0].capitalize()}, {unique_parts[1]}, and {unique_parts[2]}."
 
 
-def generate_daily_mosaic(user_id: str, date: date_type) -> dict[str, Any]:
+def _row_day(value: Any) -> date_type | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def _range_days(start_date: date_type, end_date: date_type) -> list[date_type]:
+    if end_date < start_date:
+        raise ValueError("end_date must be on or after start_date")
+    span = (end_date - start_date).days + 1
+    if span > MOSAIC_MAX_RANGE_DAYS:
+        raise ValueError(f"Mosaic range cannot exceed {MOSAIC_MAX_RANGE_DAYS} days")
+    return [start_date + timedelta(days=offset) for offset in range(span)]
+
+
+def _range_side_queries(client, user_id: str, start_date: date_type, end_date: date_type) -> dict[str, Any]:
+    start, _ = _day_bounds(start_date)
+    _, end = _day_bounds(end_date)
+    return {
+        "movement": (
+            client.table(MOVEMENT_TABLE)
+            .select("date,steps,active_minutes,workout_count,total_movement_score")
+            .eq("user_id", user_id)
+            .gte("date", start_date.isoformat())
+            .lte("date", end_date.isoformat())
+        ),
+        "activity": (
+            client.table(ACTIVITY_TABLE)
+            .select("duration_minutes,activity_type,start_time,end_time")
+            .eq("user_id", user_id)
+            .eq("activity_type", "focus_session")
+            .gte("start_time", start.isoformat())
+            .lte("end_time", end.isoformat())
+        ),
+    }
+
+
+def _mosaics_from_rows(days: list[date_type], rows: dict[str, list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    events_by_day: dict[date_type, list[dict[str, Any]]] = {day: [] for day in days}
+    movement_by_day: dict[date_type, dict[str, Any]] = {}
+    activity_by_day: dict[date_type, list[dict[str, Any]]] = {day: [] for day in days}
+    for row in rows["events"]:
+        day = _row_day(row.get("timestamp"))
+        if day in events_by_day:
+            events_by_day[day].append(row)
+    for row in rows["movement"]:
+        day = _row_day(row.get("date"))
+        if day is not None:
+            movement_by_day.setdefault(day, row)
+    for row in rows["activity"]:
+        day = _row_day(row.get("start_time"))
+        if day in activity_by_day and _row_day(row.get("end_time")) == day:
+            activity_by_day[day].append(row)
+    return [
+        _build_daily_mosaic(day, events_by_day[day], movement_by_day.get(day, {}), activity_by_day[day])
+        for day in days
+    ]
+
+
+def _compute_range_mosaics(user_id: str, start_date: date_type, end_date: date_type) -> list[dict[str, Any]]:
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
+    start, _ = _day_bounds(start_date)
+    _, end = _day_bounds(end_date)
+    queries: dict[str, Any] = {
+        "events": lambda: list(iter_events(user_id, MOSAIC_EVENT_PROJECTION, start, end)),
+    }
+    for name, query in _range_side_queries(supabase, user_id, start_date, end_date).items():
+        queries[name] = lambda query=query: query.execute().data or []
+    return _mosaics_from_rows(_range_days(start_date, end_date), gather_queries(queries))
+
+
+async def _compute_range_mosaics_async(
+    user_id: str, start_date: date_type, end_date: date_type
+) -> list[dict[str, Any]]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    start, _ = _day_bounds(start_date)
+    _, end = _day_bounds(end_date)
 
-    start, end = _day_bounds(date)
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,scores,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = events_resp.data or []
+    async def _events() -> list[dict[str, Any]]:
+        return [row async for row in iter_events_async(user_id, MOSAIC_EVENT_PROJECTION, start, end)]
+
+    async def _rows(query) -> list[dict[str, Any]]:
+        return (await query.execute()).data or []
+
+    queries: dict[str, Any] = {"events": _events}
+    for name, query in _range_side_queries(client, user_id, start_date, end_date).items():
+        queries[name] = lambda query=query: _rows(query)
+    return _mosaics_from_rows(_range_days(start_date, end_date), await gather_queries_async(queries))
 
-    movement_resp = (
-        supabase.table(MOVEMENT_TABLE)
-        .select("steps,active_minutes,workout_count,total_movement_score")
-        .eq("user_id", user_id)
-        .eq("date", date.isoformat())
-        .maybe_single()
-        .execute()
-    )
-    movement_row = movement_resp.data or {}
 
-    activity_resp = (
-        supabase.table(ACTIVITY_TABLE)
-        .select("duration_minutes,activity_type,start_time,end_time")
+def _is_closed_day(day: date_type) -> bool:
+    return day < datetime.utcnow().date() - timedelta(days=MOSAIC_LATE_ROW_DAYS)
+
+
+def _snapshots_query(client, user_id: str, days: list[date_type]):
+    return (
+        client.table(MOSAIC_SNAPSHOTS_TABLE)
+        .select(",".join(("date,overall_score,story,tiles", *MOSAIC_GUARD_FIELDS)))
         .eq("user_id", user_id)
-        .eq("activity_type", "focus_session")
-        .gte("start_time", start.isoformat())
-        .lte("end_time", end.isoformat())
-        .execute()
+        .gte("date", days[0].isoformat())
+        .lte("date", days[-1].isoformat())
     )
-    activity_rows = activity_resp.data or []
 
+
+def _snapshot_mosaics(
+    rows: list[dict[str, Any]],
+) -> tuple[dict[date_type, dict[str, Any]], dict[date_type, dict[str, Any]]]:
+    mosaics: dict[date_type, dict[str, Any]] = {}
+    outdated: dict[date_type, dict[str, Any]] = {}
+    for row in rows:
+        day = _row_day(row.get("date"))
+        if day is None or not _is_closed_day(day):
+            continue
+        if row.get("stale") or row.get("version") != MOSAIC_SNAPSHOT_VERSION:
+            outdated[day] = {field: row.get(field) for field in MOSAIC_GUARD_FIELDS}
+            continue
+        mosaics[day] = {
+            "date": day.isoformat(),
+            "overall_score": float(row.get("overall_score") or 0.0),
+            "story": row.get("story") or "",
+            "tiles": row.get("tiles") or [],
+        }
+    return mosaics, outdated
+
+
+def _snapshot_payloads(user_id: str, mosaics: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    updated_at = datetime.utcnow().isoformat()
+    return [
+        {
+            "user_id": user_id,
+            "date": mosaic["date"],
+            "version": MOSAIC_SNAPSHOT_VERSION,
+            "overall_score": mosaic["overall_score"],
+            "story": mosaic["story"],
+            "tiles": mosaic["tiles"],
+            "stale": False,
+            "invalidation_id": None,
+            "updated_at": updated_at,
+        }
+        for mosaic in mosaics
+        if _is_closed_day(date_type.fromisoformat(mosaic["date"]))
+    ]
+
+
+def _snapshot_writes(client, payloads: list[dict[str, Any]], outdated: dict[date_type, dict[str, Any]]) -> list:
+    writes = []
+    fresh = [payload for payload in payloads if date_type.fromisoformat(payload["date"]) not in outdated]
+    if fresh:
+        writes.append(
+            client.table(MOSAIC_SNAPSHOTS_TABLE).upsert(fresh, on_conflict="user_id,date", ignore_duplicates=True)
+        )
+    for payload in payloads:
+        seen = outdated.get(date_type.fromisoformat(payload["date"]))
+        if seen is None:
+            continue
+        query = (
+            client.table(MOSAIC_SNAPSHOTS_TABLE)
+            .update(payload)
+            .eq("user_id", payload["user_id"])
+            .eq("date", payload["date"])
+        )
+        for field in MOSAIC_GUARD_FIELDS:
+            query = query.is_(field, "null") if seen[field] is None else query.eq(field, seen[field])
+        writes.append(query)
+    return writes
+
+
+def _missing_span(
+    days: list[date_type], stored: dict[date_type, dict[str, Any]]
+) -> tuple[date_type, date_type] | None:
+    missing = [day for day in days if day not in stored]
+    if not missing:
+        return None
+    return missing[0], missing[-1]
+
+
+def generate_range_mosaic(user_id: str, start_date: date_type, end_date: date_type) -> list[dict[str, Any]]:
+    days = _range_days(start_date, end_date)
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    stored: dict[date_type, dict[str, Any]] = {}
+    outdated: dict[date_type, dict[str, Any]] = {}
+    if _is_closed_day(days[0]):
+        try:
+            stored, outdated = _snapshot_mosaics(_snapshots_query(supabase, user_id, days).execute().data or [])
+        except Exception:
+            logger.warning("mosaic snapshot read failed", exc_info=True, extra={"user_id": user_id})
+    span = _missing_span(days, stored)
+    if span is not None:
+        computed = [
+            mosaic
+            for mosaic in _compute_range_mosaics(user_id, *span)
+            if date_type.fromisoformat(mosaic["date"]) not in stored
+        ]
+        try:
+            for write in _snapshot_writes(supabase, _snapshot_payloads(user_id, computed), outdated):
+                write.execute()
+        except Exception:
+            logger.warning("mosaic snapshot write failed", exc_info=True, extra={"user_id": user_id})
+        stored.update({date_type.fromisoformat(mosaic["date"]): mosaic for mosaic in computed})
+    return [stored[day] for day in days]
+
+
+async def generate_range_mosaic_async(
+    user_id: str, start_date: date_type, end_date: date_type
+) -> list[dict[str, Any]]:
+    days = _range_days(start_date, end_date)
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    stored: dict[date_type, dict[str, Any]] = {}
+    outdated: dict[date_type, dict[str, Any]] = {}
+    if _is_closed_day(days[0]):
+        try:
+            response = await _snapshots_query(client, user_id, days).execute()
+            stored, outdated = _snapshot_mosaics(response.data or [])
+        except Exception:
+            logger.warning("mosaic snapshot read failed", exc_info=True, extra={"user_id": user_id})
+    span = _missing_span(days, stored)
+    if span is not None:
+        computed = [
+            mosaic
+            for mosaic in await _compute_range_mosaics_async(user_id, *span)
+            if date_type.fromisoformat(mosaic["date"]) not in stored
+        ]
+        try:
+            for write in _snapshot_writes(client, _snapshot_payloads(user_id, computed), outdated):
+                await write.execute()
+        except Exception:
+            logger.warning("mosaic snapshot write failed", exc_info=True, extra={"user_id": user_id})
+        stored.update({date_type.fromisoformat(mosaic["date"]): mosaic for mosaic in computed})
+    return [stored[day] for day in days]
+
+
+def invalidate_mosaic_snapshots(user_id: str, days: Iterable[date_type]) -> None:
+    closed = sorted({day.isoformat() for day in days if _is_closed_day(day)})
+    if not closed:
+        return
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    invalidated_at = datetime.utcnow().isoformat()
+    supabase.table(MOSAIC_SNAPSHOTS_TABLE).upsert(
+        [
+            {
+                "user_id": user_id,
+                "date": day,
+                "version": MOSAIC_SNAPSHOT_VERSION,
+                "overall_score": 0,
+                "story": "",
+                "tiles": [],
+                "stale": True,
+                "invalidation_id": uuid.uuid4().hex,
+                "updated_at": invalidated_at,
+            }
+            for day in closed
+        ],
+        on_conflict="user_id,date",
+    ).execute()
+
+
+def generate_daily_mosaic(user_id: str, date: date_type) -> dict[str, Any]:
+    return generate_range_mosaic(user_id, date, date)[0]
+
+
+async def generate_daily_mosaic_async(user_id: str, date: date_type) -> dict[str, Any]:
+    return (await generate_range_mosaic_async(user_id, date, date))[0]
+
+
+def _build_daily_mosaic(
+    date: date_type,
+    rows: list[dict[str, Any]],
+    movement_row: dict[str, Any],
+    activity_rows: list[dict[str, Any]],
+) -> dict[str, Any]:
     sleep_hours = 0.0
     social_minutes = 0.0
     nutrition_scores: list[float] = []
@@ -196,6 +458,24 @@ def generate_daily_mosaic(user_id: str, date: date_type) -> dict[str, Any]:
 
 
 def generate_week_mosaic(user_id: str, start_date: date_type) -> list[dict[str, Any]]:
-    return [
-        generate_daily_mosaic(user_id, start_date + timedelta(days=offset)) for offset in range(7)
-    ]
+    return generate_range_mosaic(user_id, start_date, start_date + timedelta(days=6))
+
+
+async def generate_week_mosaic_async(user_id: str, start_date: date_type) -> list[dict[str, Any]]:
+    return await generate_range_mosaic_async(user_id, start_date, start_date + timedelta(days=6))
+
+
+def _month_range(month: str) -> tuple[date_type, date_type]:
+    try:
+        first = datetime.strptime(month, "%Y-%m").date()
+    except ValueError as exc:
+        raise ValueError("Invalid month, expected YYYY-MM") from exc
+    return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+
+def generate_month_mosaic(user_id: str, month: str) -> list[dict[str, Any]]:
+    return generate_range_mosaic(user_id, *_month_range(month))
+
+
+async def generate_month_mosaic_async(user_id: str, month: str) -> list[dict[str, Any]]:
+    return await generate_range_mosaic_async(user_id, *_month_range(month))
@@ -110,16 +110,8 @@ def update_daily_movement(user_id: str, d: date_type) -> Dict[str, Any]:
         "updated_at": datetime.utcnow().isoformat(),
     }
 
-    upsert_resp = (
-        supabase.table(TABLE_NAME)
-        .upsert(payload, on_conflict="user_id,date")
-        .select("*")
-        .single()
-        .execute()
-    )
-    if upsert_resp.error:
-        raise RuntimeError(upsert_resp.error.message)
-    return upsert_resp.data
+    upsert_resp = supabase.table(TABLE_NAME).upsert(payload, on_conflict="user_id,date").execute()
+    return upsert_resp.data[0] if upsert_resp.data else payload
 
 
 def get_movement_history(user_id: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
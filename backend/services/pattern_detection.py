@@ -2,9 +2,14 @@ from datetime import datetime, timedelta, date as date_type
 from typing import Any, Dict, List
 
 from db.supabase import get_supabase_client
+from services.batch_fetch import chunked, fetch_rows_in
+from services.event_query import EventProjection, fetch_events, iter_events
 
-EVENTS_TABLE = "events"
 SCORES_TABLE = "score_snapshots"
+PATTERN_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "amount", "timestamp", "title"),
+    metadata_keys=("meal_prep", "nutrition_quality_score", "location", "mood", "social_context"),
+)
 
 
 def _parse_dt(value: Any) -> datetime | None:
@@ -59,19 +64,7 @@ def _pearson(x: List[float], y: List[float]) -> float:
 
 
 def _fetch_events(user_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,amount,metadata,timestamp,title")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .order("timestamp", desc=False)
-        .execute()
-    )
-    return resp.data or []
+    return fetch_events(user_id, PATTERN_EVENT_PROJECTION, start, end, ordered=True)
 
 
 def _fetch_scores(user_id: str, start_day: date_type, end_day: date_type) -> Dict[str, Dict[str, float]]:
@@ -332,6 +325,37 @@ def generate_insight_notifications(user_id: str) -> List[Dict[str, Any]]:
     start = end - timedelta(days=14)
     events = _fetch_events(user_id, start, end)
     scores = _fetch_scores(user_id, start.date(), end.date())
+    return _insight_notifications(events, scores)
+
+
+def generate_insight_notifications_for_users(user_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    end = datetime.utcnow()
+    start = end - timedelta(days=14)
+    events: Dict[str, List[Dict[str, Any]]] = {user_id: [] for user_id in user_ids}
+    scores: Dict[str, Dict[str, Dict[str, float]]] = {user_id: {} for user_id in user_ids}
+    for chunk in chunked(user_ids):
+        for row in iter_events(chunk, PATTERN_EVENT_PROJECTION, start, end):
+            user_events = events.get(str(row.get("user_id")))
+            if user_events is not None:
+                user_events.append(row)
+    score_rows = fetch_rows_in(
+        SCORES_TABLE,
+        "user_id,date,wallet_score,wellness_score,sustainability_score,movement_score",
+        "user_id",
+        user_ids,
+        lambda query: query.gte("date", start.date().isoformat()).lte("date", end.date().isoformat()),
+        order=("user_id", "date"),
+    )
+    for row in score_rows:
+        user_scores = scores.get(str(row.get("user_id")))
+        if user_scores is not None and row.get("date"):
+            user_scores[str(row.get("date"))] = row
+    return {user_id: _insight_notifications(events[user_id], scores[user_id]) for user_id in user_ids}
+
+
+def _insight_notifications(
+    events: List[Dict[str, Any]], scores: Dict[str, Dict[str, float]]
+) -> List[Dict[str, Any]]:
     notifications: List[Dict[str, Any]] = []
     weekend_spend: Dict[str, float] = {}
     daily_spend: Dict[str, float] = {}
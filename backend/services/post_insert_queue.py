@@ -0,0 +1,408 @@
+import os
+import threading
+import time
+from collections import deque
+from datetime import date as date_type, datetime, timedelta, timezone
+from typing import Any
+
+from db.supabase import get_supabase_client
+from services.achievements import record_achievement_events
+from services.alert_service import create_alert
+from services.analytics_service import apply_event_to_snapshot, save_daily_snapshot
+from services.daily_rollups import apply_rollup_deltas, refresh_daily_rollup
+from services.mosaic_service import invalidate_mosaic_snapshots
+from services.movement_service import update_daily_movement
+from services.push_service import notify_spending_alert
+from services.response_cache import invalidate_user, invalidate_users
+
+QUEUE_MODE = os.getenv("POST_INSERT_QUEUE_MODE", "async").lower()
+WORKER_COUNT = max(1, int(os.getenv("POST_INSERT_QUEUE_WORKERS", "2")))
+MAX_ATTEMPTS = max(1, int(os.getenv("POST_INSERT_QUEUE_MAX_ATTEMPTS", "4")))
+RETRY_BASE_SECONDS = float(os.getenv("POST_INSERT_QUEUE_RETRY_SECONDS", "0.5"))
+RECOMPUTE_GRACE_SECONDS = float(os.getenv("POST_INSERT_QUEUE_RECOMPUTE_GRACE_SECONDS", "2"))
+FAILURE_HISTORY = 100
+EVENTS_TABLE = "events"
+
+_condition = threading.Condition()
+_pending: dict[tuple[str, str], dict[str, Any]] = {}
+_ready: deque[tuple[str, str]] = deque()
+_in_flight: set[tuple[str, str]] = set()
+_recomputed: dict[tuple[str, str], float] = {}
+_workers: list[threading.Thread] = []
+_failures: deque[dict[str, Any]] = deque(maxlen=FAILURE_HISTORY)
+_stats = {"enqueued": 0, "coalesced": 0, "processed": 0, "retried": 0, "failed": 0, "last_lag_seconds": 0.0}
+_stopping = False
+
+
+def _recently_recomputed(key: tuple[str, str]) -> bool:
+    now = time.monotonic()
+    with _condition:
+        while _recomputed:
+            oldest, at = next(iter(_recomputed.items()))
+            if now - at <= RECOMPUTE_GRACE_SECONDS:
+                break
+            del _recomputed[oldest]
+        return key in _recomputed
+
+
+def _mark_recomputed(key: tuple[str, str]) -> None:
+    with _condition:
+        _recomputed.pop(key, None)
+        _recomputed[key] = time.monotonic()
+        pending = _pending.get(key)
+        if pending is not None:
+            pending["full_snapshot"] = True
+            pending["done"].discard("snapshot")
+
+
+def _new_task(user_id: str, day: date_type) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "day": day,
+        "events": [],
+        "movement": False,
+        "spending": None,
+        "full_snapshot": _recently_recomputed((user_id, day.isoformat())),
+        "wellness": None,
+        "done": set(),
+        "failed_steps": [],
+        "attempts": 0,
+        "enqueued_at": time.monotonic(),
+        "not_before": 0.0,
+    }
+
+
+def _merge(task: dict[str, Any], event: dict[str, Any]) -> None:
+    event_type = (event.get("event_type") or "").lower()
+    task["events"].append(event)
+    task["done"].discard("snapshot")
+    task["done"].discard("rollup")
+    task["done"].discard("mosaic")
+    task["done"].discard("achievements")
+    if event_type == "movement":
+        task["movement"] = True
+        task["done"].discard("movement")
+    if event_type == "spending" and event.get("amount") is not None:
+        current = task["spending"]
+        if current is None or abs(float(event["amount"])) > abs(float(current["amount"])):
+            task["spending"] = {"amount": event["amount"], "timestamp": event.get("timestamp")}
+            task["done"].discard("spending_alert")
+
+
+def _maybe_spending_alert(user_id: str, amount: float | None, timestamp: datetime | None) -> None:
+    if amount is None:
+        return
+    supabase = get_supabase_client()
+    if supabase is None:
+        return
+    end = timestamp or datetime.utcnow()
+    start = end - timedelta(days=7)
+    response = (
+        supabase.table(EVENTS_TABLE)
+        .select("amount,timestamp")
+        .eq("user_id", user_id)
+        .gte("timestamp", start.isoformat())
+        .lte("timestamp", end.isoformat())
+        .execute()
+    )
+    rows = response.data or []
+    daily_totals: dict[str, float] = {}
+    for row in rows:
+        ts = row.get("timestamp")
+        if not ts:
+            continue
+        try:
+            day = datetime.fromisoformat(str(ts).replace("Z", "+00:00")).date().isoformat()
+        except Exception:
+            continue
+        val = row.get("amount")
+        if val is None:
+            continue
+        daily_totals[day] = daily_totals.get(day, 0.0) + abs(float(val))
+    if not daily_totals:
+        return
+    avg_daily = sum(daily_totals.values()) / max(1, len(daily_totals))
+    current_amount = abs(float(amount))
+    if avg_daily <= 0:
+        return
+    if current_amount < avg_daily * 1.4:
+        return
+    overage = max(0.0, current_amount - avg_daily)
+    create_alert(
+        user_id,
+        "reminders",
+        "Spending alert",
+        f"Spending hit ${current_amount:.2f} today",
+        "/analytics",
+    )
+    notify_spending_alert(user_id, overage)
+
+
+def _snapshot_step(task: dict[str, Any]) -> None:
+    user_id = task["user_id"]
+    day = datetime.combine(task["day"], datetime.min.time())
+    events = task["events"]
+    scores = None
+    if len(events) == 1 and not task["full_snapshot"]:
+        event = events[0]
+        scores = apply_event_to_snapshot(
+            user_id,
+            day,
+            event.get("event_type"),
+            event.get("category"),
+            event.get("amount"),
+            event.get("scores"),
+        )
+    if scores is None:
+        scores = save_daily_snapshot(user_id, day)
+        _mark_recomputed((user_id, task["day"].isoformat()))
+    task["wellness"] = scores.get("wellness_score")
+
+
+def _rollup_step(task: dict[str, Any]) -> None:
+    user_id = task["user_id"]
+    if task["full_snapshot"] or not apply_rollup_deltas(user_id, task["day"], task["events"]):
+        refresh_daily_rollup(user_id, task["day"])
+        _mark_recomputed((user_id, task["day"].isoformat()))
+
+
+def _mosaic_step(task: dict[str, Any]) -> None:
+    invalidate_mosaic_snapshots(task["user_id"], [task["day"]])
+
+
+def _achievements_step(task: dict[str, Any]) -> None:
+    record_achievement_events(task["user_id"], task["events"], task["day"], task["wellness"])
+
+
+def _spending_alert_step(task: dict[str, Any]) -> None:
+    if task["spending"] is not None:
+        _maybe_spending_alert(task["user_id"], task["spending"]["amount"], task["spending"]["timestamp"])
+
+
+def _movement_step(task: dict[str, Any]) -> None:
+    if task["movement"]:
+        update_daily_movement(task["user_id"], task["day"])
+
+
+TASK_STEPS = (
+    ("snapshot", _snapshot_step, None),
+    ("rollup", _rollup_step, None),
+    ("mosaic", _mosaic_step, None),
+    ("achievements", _achievements_step, "snapshot"),
+    ("spending_alert", _spending_alert_step, None),
+    ("movement", _movement_step, None),
+)
+
+
+def _run_task(task: dict[str, Any]) -> None:
+    done = task["done"]
+    failed: dict[str, Exception] = {}
+    for name, step, requires in TASK_STEPS:
+        if name in done or (requires is not None and requires not in done):
+            continue
+        try:
+            step(task)
+        except Exception as exc:
+            failed[name] = exc
+            continue
+        done.add(name)
+    invalidate_user(task["user_id"])
+    task["failed_steps"] = sorted(failed)
+    if failed:
+        raise next(iter(failed.values()))
+
+
+def _record_failure(task: dict[str, Any], exc: Exception) -> None:
+    _stats["failed"] += 1
+    _failures.append(
+        {
+            "user_id": task["user_id"],
+            "day": task["day"].isoformat(),
+            "events": len(task["events"]),
+            "attempts": task["attempts"],
+            "steps": task["failed_steps"],
+            "error_type": type(exc).__name__,
+            "error": str(exc),
+            "failed_at": datetime.utcnow().isoformat(),
+        }
+    )
+
+
+def _process(key: tuple[str, str], task: dict[str, Any]) -> None:
+    task["attempts"] += 1
+    try:
+        _run_task(task)
+        error = None
+    except Exception as exc:
+        error = exc
+    with _condition:
+        _in_flight.discard(key)
+        merged = _pending.pop(key, None)
+        if error is None:
+            _stats["processed"] += 1
+            _stats["last_lag_seconds"] = round(time.monotonic() - task["enqueued_at"], 3)
+            if merged is not None:
+                _pending[key] = merged
+                _ready.append(key)
+        elif task["attempts"] < MAX_ATTEMPTS:
+            _stats["retried"] += 1
+            task["full_snapshot"] = True
+            if merged is not None:
+                for event in merged["events"]:
+                    _merge(task, event)
+            task["not_before"] = time.monotonic() + RETRY_BASE_SECONDS * (2 ** (task["attempts"] - 1))
+            _pending[key] = task
+            _ready.append(key)
+        else:
+            _record_failure(task, error)
+            if merged is not None:
+                _pending[key] = merged
+                _ready.append(key)
+        _condition.notify_all()
+
+
+def _run_sync(task: dict[str, Any]) -> None:
+    while True:
+        task["attempts"] += 1
+        try:
+            _run_task(task)
+        except Exception as exc:
+            with _condition:
+                if task["attempts"] >= MAX_ATTEMPTS:
+                    _record_failure(task, exc)
+                    return
+                _stats["retried"] += 1
+            task["full_snapshot"] = True
+            time.sleep(RETRY_BASE_SECONDS * (2 ** (task["attempts"] - 1)))
+            continue
+        with _condition:
+            _stats["processed"] += 1
+        return
+
+
+def _next_task() -> tuple[tuple[str, str], dict[str, Any]] | None:
+    while True:
+        if _stopping and not _ready:
+            return None
+        now = time.monotonic()
+        wait = None
+        for _ in range(len(_ready)):
+            key = _ready.popleft()
+            task = _pending.get(key)
+            if task is None:
+                continue
+            if key in _in_flight:
+                _ready.append(key)
+                continue
+            if task["not_before"] > now:
+                _ready.append(key)
+                delay = task["not_before"] - now
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            _pending.pop(key)
+            _in_flight.add(key)
+            return key, task
+        _condition.wait(timeout=wait)
+
+
+def _worker() -> None:
+    while True:
+        with _condition:
+            item = _next_task()
+        if item is None:
+            return
+        _process(*item)
+
+
+def _ensure_workers() -> None:
+    global _stopping
+    _stopping = False
+    alive = [worker for worker in _workers if worker.is_alive()]
+    _workers[:] = alive
+    for index in range(WORKER_COUNT - len(alive)):
+        worker = threading.Thread(target=_worker, name=f"post-insert-{len(alive) + index}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+
+
+def _event_key(event: dict[str, Any]) -> tuple[str, str]:
+    timestamp = event.get("timestamp") or datetime.utcnow()
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return str(event.get("user_id")), timestamp.date().isoformat()
+
+
+def enqueue_post_insert_batch(events: list[dict[str, Any]]) -> None:
+    invalidate_users(event.get("user_id") for event in events)
+    if QUEUE_MODE == "sync":
+        tasks: dict[tuple[str, str], dict[str, Any]] = {}
+        for event in events:
+            key = _event_key(event)
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = _new_task(key[0], date_type.fromisoformat(key[1]))
+            _merge(task, event)
+        with _condition:
+            _stats["enqueued"] += len(events)
+            _stats["coalesced"] += len(events) - len(tasks)
+        for task in tasks.values():
+            _run_sync(task)
+        return
+    with _condition:
+        for event in events:
+            key = _event_key(event)
+            _stats["enqueued"] += 1
+            task = _pending.get(key)
+            if task is None:
+                task = _new_task(key[0], date_type.fromisoformat(key[1]))
+                _pending[key] = task
+                if key not in _in_flight:
+                    _ready.append(key)
+            else:
+                _stats["coalesced"] += 1
+            _merge(task, event)
+        _ensure_workers()
+        _condition.notify_all()
+
+
+def enqueue_post_insert(event: dict[str, Any]) -> None:
+    enqueue_post_insert_batch([event])
+
+
+def drain(timeout: float | None = None) -> bool:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with _condition:
+        while _pending or _in_flight:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            _condition.wait(timeout=remaining)
+    return True
+
+
+def shutdown(timeout: float = 10.0) -> bool:
+    global _stopping
+    drained = drain(timeout)
+    with _condition:
+        _stopping = True
+        _condition.notify_all()
+    for worker in list(_workers):
+        worker.join(timeout=1.0)
+    return drained
+
+
+def get_queue_metrics() -> dict[str, Any]:
+    with _condition:
+        now = time.monotonic()
+        oldest = min((task["enqueued_at"] for task in _pending.values()), default=None)
+        return {
+            "mode": QUEUE_MODE,
+            "workers": sum(1 for worker in _workers if worker.is_alive()),
+            "depth": len(_pending),
+            "in_flight": len(_in_flight),
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            **_stats,
+            "recent_failures": list(_failures),
+        }
@@ -0,0 +1,62 @@
+from datetime import date as date_type
+from typing import Any, Literal
+
+import numpy as np
+
+Layout = Literal["points", "columns"]
+
+
+def day_offsets(horizon: int) -> np.ndarray:
+    return np.arange(horizon + 1, dtype=np.int64)
+
+
+def date_labels(start: date_type, offsets: np.ndarray) -> list[str]:
+    return np.datetime_as_string(np.datetime64(start, "D") + offsets, unit="D").tolist()
+
+
+def day_indices(ordinals: np.ndarray, start: date_type) -> np.ndarray:
+    return ordinals - start.toordinal()
+
+
+def daily_sums(indices: np.ndarray, weights: np.ndarray, days: int) -> np.ndarray:
+    in_range = (indices >= 0) & (indices < days)
+    return np.bincount(indices[in_range], weights=weights[in_range], minlength=days)
+
+
+def daily_counts(indices: np.ndarray, days: int) -> np.ndarray:
+    in_range = (indices >= 0) & (indices < days)
+    return np.bincount(indices[in_range], minlength=days)
+
+
+def linear_path(start_value: float, slope: float, offsets: np.ndarray) -> np.ndarray:
+    return start_value + slope * offsets
+
+
+def interpolate(start_value: float, target_value: float, offsets: np.ndarray, horizon: int) -> np.ndarray:
+    return start_value + (target_value - start_value) * (offsets / float(max(1, horizon)))
+
+
+def sqrt_band(std: float, offsets: np.ndarray) -> np.ndarray:
+    return std * np.sqrt(np.maximum(1, offsets))
+
+
+def band_columns(center: np.ndarray, interval: np.ndarray, name: str = "balance") -> dict[str, np.ndarray]:
+    return {name: center, "lower": center - interval, "upper": center + interval}
+
+
+def to_points(dates: list[str], columns: dict[str, np.ndarray]) -> list[dict[str, Any]]:
+    keys = ("date", *columns.keys())
+    rounded = [np.round(values, 2).tolist() for values in columns.values()]
+    return [dict(zip(keys, row)) for row in zip(dates, *rounded)]
+
+
+def to_columns(dates: list[str], columns: dict[str, np.ndarray]) -> dict[str, list[Any]]:
+    return {"date": dates, **{key: np.round(values, 2).tolist() for key, values in columns.items()}}
+
+
+def render(
+    dates: list[str], columns: dict[str, np.ndarray], layout: Layout = "points"
+) -> list[dict[str, Any]] | dict[str, list[Any]]:
+    if layout == "columns":
+        return to_columns(dates, columns)
+    return to_points(dates, columns)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+QUERY_GATHER_WORKERS = max(1, int(os.getenv("QUERY_GATHER_WORKERS", "16")))
+SLOW_QUERY_SECONDS = float(os.getenv("QUERY_GATHER_SLOW_SECONDS", "1.0"))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=QUERY_GATHER_WORKERS, thread_name_prefix="query-gather")
+    return _executor
+
+
+def _record(name: str, started: float, timings: dict[str, float]) -> None:
+    elapsed = time.monotonic() - started
+    timings[name] = round(elapsed, 4)
+    if elapsed >= SLOW_QUERY_SECONDS:
+        logger.warning("slow gathered query", extra={"query": name, "seconds": round(elapsed, 3)})
+
+
+def _timed(name: str, func: Callable[[], Any], timings: dict[str, float]) -> Any:
+    started = time.monotonic()
+    try:
+        return func()
+    finally:
+        _record(name, started, timings)
+
+
+def _run_in_worker(name: str, func: Callable[[], Any], timings: dict[str, float]) -> Any:
+    _worker_state.active = True
+    try:
+        return _timed(name, func, timings)
+    finally:
+        _worker_state.active = False
+
+
+def _log_gather(started: float, timings: dict[str, float]) -> None:
+    logger.debug(
+        "gathered queries",
+        extra={
+            "wall_seconds": round(time.monotonic() - started, 4),
+            "sum_seconds": round(sum(timings.values()), 4),
+            "timings": dict(timings),
+        },
+    )
+
+
+def gather_queries(
+    queries: dict[str, Callable[[], Any]],
+    timings: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    timings = timings if timings is not None else {}
+    started = time.monotonic()
+    if len(queries) < 2 or getattr(_worker_state, "active", False):
+        results = {name: _timed(name, func, timings) for name, func in queries.items()}
+    else:
+        executor = _get_executor()
+        futures = {name: executor.submit(_run_in_worker, name, func, timings) for name, func in queries.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    _log_gather(started, timings)
+    return results
+
+
+async def gather_queries_async(
+    queries: dict[str, Callable[[], Awaitable[Any]]],
+    timings: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    timings = timings if timings is not None else {}
+    started = time.monotonic()
+
+    async def _run(name: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        query_started = time.monotonic()
+        try:
+            return await func()
+        finally:
+            _record(name, query_started, timings)
+
+    values = await asyncio.gather(*(_run(name, func) for name, func in queries.items()))
+    _log_gather(started, timings)
+    return dict(zip(queries, values))
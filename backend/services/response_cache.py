@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() not in {"0", "false", "no"}
+LOCAL_MAX_ENTRIES = max(1, int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000")))
+LOCAL_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+SHARED_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_SHARED_TTL_SECONDS", "300"))
+SHARED_BACKEND = os.getenv("RESPONSE_CACHE_SHARED_BACKEND", "").lower()
+GENERATION_PREFIX = "gen:"
+RESPONSE_PREFIX = "resp:"
+
+
+class InMemoryBackend:
+    def __init__(self, max_entries: int = LOCAL_MAX_ENTRIES, default_ttl: float | None = None) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            expires_at, value = self._entries.get(key, (None, 0))
+            value = int(value) + 1
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_local = InMemoryBackend(LOCAL_MAX_ENTRIES, LOCAL_TTL_SECONDS)
+_generations: dict[str, int] = {}
+_shared: Any | None = InMemoryBackend(LOCAL_MAX_ENTRIES * 4, SHARED_TTL_SECONDS) if SHARED_BACKEND == "memory" else None
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "backend_errors": 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def set_shared_backend(backend: Any | None) -> None:
+    global _shared
+    _shared = backend
+
+
+def _generation(user_id: str) -> int:
+    local = _generations.get(user_id, 0)
+    if _shared is not None:
+        try:
+            return max(local, int(_shared.get(f"{GENERATION_PREFIX}{user_id}") or 0))
+        except Exception:
+            _count("backend_errors")
+    return local
+
+
+def _cache_key(user_id: str, endpoint: str, params: dict[str, Any], generation: int) -> str:
+    encoded = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    return f"{RESPONSE_PREFIX}{user_id}:{generation}:{endpoint}:{encoded}"
+
+
+def _lookup(key: str) -> Any | None:
+    value = _local.get(key)
+    if value is not None:
+        _count("hits")
+        return value
+    if _shared is not None:
+        try:
+            encoded = _shared.get(key)
+        except Exception:
+            encoded = None
+            _count("backend_errors")
+        if encoded is not None:
+            value = json.loads(encoded)
+            _local.set(key, value)
+            _count("shared_hits")
+            return value
+    _count("misses")
+    return None
+
+
+def _store(key: str, value: Any) -> None:
+    _local.set(key, value)
+    if _shared is not None:
+        try:
+            _shared.set(key, json.dumps(value, default=str), SHARED_TTL_SECONDS)
+        except Exception:
+            _count("backend_errors")
+
+
+def cached_response(
+    user_id: str,
+    endpoint: str,
+    params: dict[str, Any],
+    compute: Callable[[], Any],
+) -> Any:
+    if not CACHE_ENABLED:
+        return compute()
+    key = _cache_key(user_id, endpoint, params, _generation(user_id))
+    value = _lookup(key)
+    if value is None:
+        value = compute()
+        _store(key, value)
+    return value
+
+
+async def cached_response_async(
+    user_id: str,
+    endpoint: str,
+    params: dict[str, Any],
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    if not CACHE_ENABLED:
+        return await compute()
+    key = _cache_key(user_id, endpoint, params, _generation(user_id))
+    value = _lookup(key)
+    if value is None:
+        value = await compute()
+        _store(key, value)
+    return value
+
+
+def invalidate_user(user_id: str) -> None:
+    if not user_id:
+        return
+    with _stats_lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+    key = f"{GENERATION_PREFIX}{user_id}"
+    if _shared is not None:
+        try:
+            _shared.incr(key)
+        except Exception:
+            _count("backend_errors")
+    _count("invalidations")
+
+
+def invalidate_users(user_ids) -> None:
+    for user_id in {str(user_id) for user_id in user_ids if user_id}:
+        invalidate_user(user_id)
+
+
+def get_cache_metrics() -> dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["shared_hits"] + stats["misses"]
+    return {
+        "enabled": CACHE_ENABLED,
+        "shared_backend": type(_shared).__name__ if _shared is not None else None,
+        "local_entries": len(_local),
+        **stats,
+        "hit_rate": round((stats["hits"] + stats["shared_hits"]) / lookups, 4) if lookups else 0.0,
+    }
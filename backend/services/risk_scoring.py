@@ -1,14 +1,31 @@
 from datetime import datetime, timedelta, date as date_type
 from typing import Any
 
-from db.supabase import get_supabase_client
+from db.supabase import get_async_supabase_client, get_supabase_client
+from services.event_query import EventProjection, fetch_events, fetch_events_async
+from services.query_gather import gather_queries, gather_queries_async
 
-EVENTS_TABLE = "events"
 ACTIVITY_TABLE = "activity_logs"
 MOVEMENT_PATTERN_TABLE = "movement_patterns"
 MOVEMENT_TESTS_TABLE = "movement_tests"
 MOVEMENT_TEST_INSIGHTS_TABLE = "movement_test_insights"
 RISK_HISTORY_TABLE = "risk_history"
+RISK_WINDOWS = {"burnout": 7, "injury": 7, "isolation": 7, "financial": 30}
+RISK_EVENT_PROJECTION = EventProjection(
+    ("event_type", "category", "title", "amount", "timestamp"),
+    metadata_keys=(
+        "hours",
+        "type",
+        "group",
+        "pain_level",
+        "pain_score",
+        "current_balance",
+        "recurring",
+        "is_recurring",
+    ),
+)
+REHAB_KEYWORDS = ("rehab", "pt", "physio", "therapy")
+GROUP_KEYWORDS = ("group", "team", "class", "meetup")
 
 
 def _safe_float(value: Any) -> float | None:
@@ -39,79 +56,231 @@ def _risk_level(score: float) -> str:
     return "low"
 
 
-def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    window_days = max(1, int(days))
-    end = datetime.utcnow()
-    start = end - timedelta(days=window_days - 1)
-    dates = [start.date() + timedelta(days=offset) for offset in range(window_days)]
-    daily = {
-        day: {
-            "sleep_hours": 0.0,
-            "mood_values": [],
-            "focus_minutes": 0.0,
-            "breaks": 0,
-            "late_night": False,
-        }
-        for day in dates
+def _empty_day() -> dict[str, Any]:
+    return {
+        "events": 0,
+        "sleep_hours": 0.0,
+        "mood_values": [],
+        "breaks": 0,
+        "late_night": False,
+        "social": 0,
+        "group": 0,
+        "rehab": 0,
+        "pain": 0,
+        "spending": 0.0,
+        "income": 0.0,
+        "net": None,
+        "recurring": 0,
+        "balance": None,
+        "focus_minutes": 0.0,
+        "active_minutes": [],
+        "poor_form": 0,
     }
 
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,amount,metadata,timestamp")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = events_resp.data or []
-    for row in rows:
+
+def _add_event_features(day: dict[str, Any], row: dict[str, Any], ts: datetime) -> None:
+    event_type = (row.get("event_type") or "").lower()
+    category = (row.get("category") or "").lower()
+    title = (row.get("title") or "").lower()
+    metadata = row.get("metadata") or {}
+    meta_type = str(metadata.get("type") or "").lower()
+    raw_amount = _safe_float(row.get("amount"))
+    amount = raw_amount or 0.0
+
+    day["events"] += 1
+    if ts.hour >= 23 or ts.hour < 5:
+        day["late_night"] = True
+
+    if event_type == "sleep":
+        hours = raw_amount
+        if hours is None:
+            hours = _safe_float(metadata.get("hours"))
+        if hours is not None and hours > 0:
+            day["sleep_hours"] += min(24.0, hours)
+    if event_type == "mood" and raw_amount is not None:
+        day["mood_values"].append(max(0.0, min(10.0, raw_amount)))
+    if event_type == "break" or (event_type == "habit" and meta_type == "break"):
+        day["breaks"] += 1
+
+    if event_type == "social":
+        day["social"] += 1
+        if metadata.get("group") is True or meta_type in GROUP_KEYWORDS:
+            day["group"] += 1
+        if any(key in title for key in GROUP_KEYWORDS):
+            day["group"] += 1
+
+    rehab_hit = event_type == "habit" and meta_type in REHAB_KEYWORDS
+    if rehab_hit or any(key in title for key in REHAB_KEYWORDS):
+        day["rehab"] += 1
+    pain_level = _safe_float(metadata.get("pain_level") or metadata.get("pain_score"))
+    if event_type in {"pain", "injury"} or pain_level is not None or "pain" in title:
+        day["pain"] += 1
+
+    current_balance = _safe_float(metadata.get("current_balance"))
+    if current_balance is not None and (day["balance"] is None or ts > day["balance"][0]):
+        day["balance"] = (ts, current_balance)
+    if event_type == "spending":
+        day["spending"] += abs(amount)
+        day["net"] = (day["net"] or 0.0) - abs(amount)
+        if metadata.get("recurring") or metadata.get("is_recurring"):
+            day["recurring"] += 1
+    if category == "finance" or event_type == "income":
+        day["income"] += amount
+        day["net"] = (day["net"] or 0.0) + amount
+
+
+def _window_dates(end: datetime, window_days: int, offset_days: int = 0) -> list[date_type]:
+    last = end.date() - timedelta(days=offset_days)
+    return [last - timedelta(days=window_days - 1 - offset) for offset in range(window_days)]
+
+
+def _risk_start(end: datetime, windows: dict[str, int]) -> datetime:
+    spans = [
+        window_days * 2 if name in {"injury", "isolation"} else window_days
+        for name, window_days in windows.items()
+    ]
+    span_days = max(spans, default=1)
+    return datetime.combine(end.date() - timedelta(days=span_days - 1), datetime.min.time())
+
+
+def _risk_side_queries(client, user_id: str, end: datetime, windows: dict[str, int]) -> dict[str, Any]:
+    queries: dict[str, Any] = {}
+    if "burnout" in windows:
+        focus_start = datetime.combine(_window_dates(end, windows["burnout"])[0], datetime.min.time())
+        queries["activity"] = (
+            client.table(ACTIVITY_TABLE)
+            .select("duration_minutes,start_time,end_time,activity_type")
+            .eq("user_id", user_id)
+            .eq("activity_type", "focus_session")
+            .gte("start_time", focus_start.isoformat())
+            .lte("end_time", end.isoformat())
+        )
+    if "injury" in windows:
+        injury_days = windows["injury"]
+        queries["movement"] = (
+            client.table(MOVEMENT_PATTERN_TABLE)
+            .select("date,active_minutes")
+            .eq("user_id", user_id)
+            .gte("date", _window_dates(end, injury_days, injury_days)[0].isoformat())
+            .lte("date", end.date().isoformat())
+        )
+        tests_start = datetime.combine(_window_dates(end, injury_days)[0], datetime.min.time())
+        queries["tests"] = (
+            client.table(MOVEMENT_TESTS_TABLE)
+            .select("id,created_at, movement_test_insights(form_score)")
+            .eq("user_id", user_id)
+            .gte("created_at", tests_start.isoformat())
+            .lte("created_at", end.isoformat())
+        )
+    return queries
+
+
+def _assemble_risk_features(
+    end: datetime,
+    events: list[dict[str, Any]],
+    side_rows: dict[str, list[dict[str, Any]]],
+) -> dict[str, Any]:
+    days: dict[date_type, dict[str, Any]] = {}
+
+    def _day(value: date_type) -> dict[str, Any]:
+        return days.setdefault(value, _empty_day())
+
+    for row in events:
         ts = _parse_ts(row.get("timestamp"))
+        if ts is not None:
+            _add_event_features(_day(ts.date()), row, ts)
+
+    for row in side_rows.get("activity") or []:
+        ts = _parse_ts(row.get("start_time")) or _parse_ts(row.get("end_time"))
         if ts is None:
             continue
-        day = ts.date()
-        if day not in daily:
+        minutes = _safe_float(row.get("duration_minutes")) or 0.0
+        _day(ts.date())["focus_minutes"] += max(0.0, minutes)
+
+    for row in side_rows.get("movement") or []:
+        try:
+            day = date_type.fromisoformat(str(row.get("date")))
+        except Exception:
             continue
-        event_type = (row.get("event_type") or "").lower()
-        amount = _safe_float(row.get("amount"))
-        metadata = row.get("metadata") or {}
-        if event_type == "sleep":
-            hours = amount
-            if hours is None:
-                hours = _safe_float(metadata.get("hours"))
-            if hours is not None and hours > 0:
-                daily[day]["sleep_hours"] += min(24.0, hours)
-        if event_type == "mood" and amount is not None:
-            daily[day]["mood_values"].append(max(0.0, min(10.0, amount)))
-        if event_type == "break" or (
-            event_type == "habit" and str(metadata.get("type", "")).lower() == "break"
-        ):
-            daily[day]["breaks"] += 1
-        if ts.hour >= 23 or ts.hour < 5:
-            daily[day]["late_night"] = True
-
-    activity_resp = (
-        supabase.table(ACTIVITY_TABLE)
-        .select("duration_minutes,start_time,end_time,activity_type")
-        .eq("user_id", user_id)
-        .eq("activity_type", "focus_session")
-        .gte("start_time", start.isoformat())
-        .lte("end_time", end.isoformat())
-        .execute()
-    )
-    activity_rows = activity_resp.data or []
-    for row in activity_rows:
-        ts = _parse_ts(row.get("start_time")) or _parse_ts(row.get("end_time"))
+        _day(day)["active_minutes"].append(_safe_float(row.get("active_minutes")) or 0.0)
+
+    for test in side_rows.get("tests") or []:
+        ts = _parse_ts(test.get("created_at"))
         if ts is None:
             continue
-        day = ts.date()
-        if day not in daily:
-            continue
-        minutes = _safe_float(row.get("duration_minutes")) or 0.0
-        daily[day]["focus_minutes"] += max(0.0, minutes)
+        insights = test.get("movement_test_insights") or []
+        insight = insights[0] if isinstance(insights, list) and insights else None
+        form_score = _safe_float((insight or {}).get("form_score"))
+        if form_score is not None and form_score < 60:
+            _day(ts.date())["poor_form"] += 1
+
+    return {"end": end, "days": days}
+
+
+def load_risk_features(user_id: str, windows: dict[str, int]) -> dict[str, Any]:
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    end = datetime.utcnow()
+    queries = _risk_side_queries(supabase, user_id, end, windows)
+    results = gather_queries(
+        {
+            "events": lambda: fetch_events(user_id, RISK_EVENT_PROJECTION, _risk_start(end, windows), end),
+            **{name: (lambda query=query: query.execute().data or []) for name, query in queries.items()},
+        }
+    )
+    events = results.pop("events")
+    return _assemble_risk_features(end, events, results)
+
+
+async def load_risk_features_async(user_id: str, windows: dict[str, int]) -> dict[str, Any]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    end = datetime.utcnow()
+    queries = _risk_side_queries(client, user_id, end, windows)
+
+    async def _rows(query) -> list[dict[str, Any]]:
+        return (await query.execute()).data or []
+
+    results = await gather_queries_async(
+        {
+            "events": lambda: fetch_events_async(
+                user_id, RISK_EVENT_PROJECTION, _risk_start(end, windows), end
+            ),
+            **{name: (lambda query=query: _rows(query)) for name, query in queries.items()},
+        }
+    )
+    events = results.pop("events")
+    return _assemble_risk_features(end, events, results)
+
+
+def _features_for(features: dict[str, Any], dates: list[date_type]) -> list[tuple[date_type, dict[str, Any]]]:
+    days = features["days"]
+    return [(day, days.get(day) or _empty_day()) for day in dates]
+
+
+def _finalize(window_days: int, factor_values: list[tuple[str, float, str]], recommendations: list[str]) -> dict[str, Any]:
+    factors = [
+        {"name": name, "impact": round(impact, 2), "details": detail}
+        for name, impact, detail in factor_values
+        if impact > 0
+    ]
+    factors.sort(key=lambda item: item["impact"], reverse=True)
+    factors = factors[:3]
+
+    risk_score = round(min(100.0, sum(item["impact"] for item in factors)), 2)
+    return {
+        "days": window_days,
+        "risk": risk_score,
+        "level": _risk_level(risk_score),
+        "factors": factors,
+        "recommendations": recommendations,
+    }
+
 
+def _burnout_model(features: dict[str, Any], window_days: int) -> dict[str, Any]:
+    daily = _features_for(features, _window_dates(features["end"], window_days))
     sleep_deficit_hours = 0.0
     sleep_days = 0
     total_sleep = 0.0
@@ -120,7 +289,7 @@ def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
     late_night_days = []
     no_break_days = []
 
-    for day, data in daily.items():
+    for day, data in daily:
         sleep_hours = data["sleep_hours"]
         if sleep_hours > 0:
             sleep_days += 1
@@ -132,7 +301,7 @@ def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
         if data["mood_values"]:
             average_mood = sum(data["mood_values"]) / len(data["mood_values"])
             if average_mood < 5:
-                mood_low_days.append(day)
+                mood_low_days.append(data)
         if data["late_night"]:
             late_night_days.append(day)
         if data["breaks"] < 2:
@@ -141,9 +310,7 @@ def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
     avg_sleep = total_sleep / sleep_days if sleep_days > 0 else None
     avg_mood = None
     if mood_low_days:
-        mood_values = []
-        for day in mood_low_days:
-            mood_values.extend(daily[day]["mood_values"])
+        mood_values = [value for data in mood_low_days for value in data["mood_values"]]
         if mood_values:
             avg_mood = sum(mood_values) / len(mood_values)
 
@@ -179,17 +346,6 @@ def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
         ),
     ]
 
-    factors = [
-        {"name": name, "impact": round(impact, 2), "details": detail}
-        for name, impact, detail in factor_values
-        if impact > 0
-    ]
-    factors.sort(key=lambda item: item["impact"], reverse=True)
-    factors = factors[:3]
-
-    risk_score = round(min(100.0, sum(item["impact"] for item in factors)), 2)
-    level = _risk_level(risk_score)
-
     recommendations: list[str] = []
     if sleep_deficit_hours > 0:
         recommendations.append("Aim for 7-8 hours of sleep each night.")
@@ -202,104 +358,28 @@ def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
     if no_break_days:
         recommendations.append("Log at least two short breaks per day.")
 
-    return {
-        "days": window_days,
-        "risk": risk_score,
-        "level": level,
-        "factors": factors,
-        "recommendations": recommendations,
-    }
+    return _finalize(window_days, factor_values, recommendations)
 
 
-def calculate_injury_risk(user_id: str, days: int = 7) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    window_days = max(1, int(days))
-    end = datetime.utcnow()
-    start = end - timedelta(days=window_days - 1)
+def _injury_model(features: dict[str, Any], window_days: int) -> dict[str, Any]:
+    end = features["end"]
+    current = _features_for(features, _window_dates(end, window_days))
+    previous = _features_for(features, _window_dates(end, window_days, window_days))
 
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,title,metadata,timestamp,amount")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = events_resp.data or []
-
-    rehab_events = 0
-    pain_events = 0
-
-    for row in rows:
-        event_type = (row.get("event_type") or "").lower()
-        title = (row.get("title") or "").lower()
-        metadata = row.get("metadata") or {}
-        meta_type = str(metadata.get("type") or "").lower()
-        rehab_hit = event_type == "habit" and meta_type in {"rehab", "pt", "physio", "therapy"}
-        rehab_hit = rehab_hit or any(key in title for key in ["rehab", "pt", "physio", "therapy"])
-        if rehab_hit:
-            rehab_events += 1
-
-        pain_level = _safe_float(metadata.get("pain_level") or metadata.get("pain_score"))
-        pain_hit = event_type in {"pain", "injury"} or pain_level is not None or "pain" in title
-        if pain_hit:
-            pain_events += 1
-
-    movement_resp = (
-        supabase.table(MOVEMENT_PATTERN_TABLE)
-        .select("date,active_minutes")
-        .eq("user_id", user_id)
-        .gte("date", (start - timedelta(days=window_days)).date().isoformat())
-        .lte("date", end.date().isoformat())
-        .execute()
-    )
-    movement_rows = movement_resp.data or []
-    current_total = 0.0
-    previous_total = 0.0
-    current_count = 0
-    previous_count = 0
-
-    for row in movement_rows:
-        date_val = row.get("date")
-        try:
-            day = date_type.fromisoformat(str(date_val))
-        except Exception:
-            continue
-        minutes = _safe_float(row.get("active_minutes")) or 0.0
-        if day >= start.date():
-            current_total += minutes
-            current_count += 1
-        elif day >= (start - timedelta(days=window_days)).date():
-            previous_total += minutes
-            previous_count += 1
-
-    current_avg = current_total / float(max(1, current_count))
-    previous_avg = previous_total / float(max(1, previous_count))
+    rehab_events = sum(data["rehab"] for _, data in current)
+    pain_events = sum(data["pain"] for _, data in current)
+    poor_form = sum(data["poor_form"] for _, data in current)
+    current_minutes = [value for _, data in current for value in data["active_minutes"]]
+    previous_minutes = [value for _, data in previous for value in data["active_minutes"]]
+
+    current_avg = sum(current_minutes) / float(max(1, len(current_minutes)))
+    previous_avg = sum(previous_minutes) / float(max(1, len(previous_minutes)))
     spike = False
     if previous_avg > 0:
         spike = current_avg > previous_avg * 1.5
     elif current_avg >= 30:
         spike = True
 
-    tests_resp = (
-        supabase.table(MOVEMENT_TESTS_TABLE)
-        .select("id,created_at, movement_test_insights(form_score)")
-        .eq("user_id", user_id)
-        .gte("created_at", start.isoformat())
-        .lte("created_at", end.isoformat())
-        .execute()
-    )
-    tests = tests_resp.data or []
-    poor_form = 0
-    for test in tests:
-        insights = test.get("movement_test_insights") or []
-        insight = insights[0] if isinstance(insights, list) and insights else None
-        form_score = _safe_float((insight or {}).get("form_score"))
-        if form_score is not None and form_score < 60:
-            poor_form += 1
-
     factor_values = [
         (
             "Skipped rehab/PT",
@@ -322,74 +402,19 @@ def calculate_injury_risk(user_id: str, days: int = 7) -> dict[str, Any]:
             f"{poor_form} tests under form score 60.",
         ),
     ]
-    factors = [
-        {"name": name, "impact": round(impact, 2), "details": detail}
-        for name, impact, detail in factor_values
-        if impact > 0
-    ]
-    factors.sort(key=lambda item: item["impact"], reverse=True)
-    factors = factors[:3]
+    return _finalize(window_days, factor_values, ["Gradual increase only", "Rest day needed", "See PT"])
 
-    risk_score = round(min(100.0, sum(item["impact"] for item in factors)), 2)
-    return {
-        "days": window_days,
-        "risk": risk_score,
-        "level": _risk_level(risk_score),
-        "factors": factors,
-        "recommendations": ["Gradual increase only", "Rest day needed", "See PT"],
-    }
 
+def _isolation_model(features: dict[str, Any], window_days: int) -> dict[str, Any]:
+    end = features["end"]
+    current = _features_for(features, _window_dates(end, window_days))
+    previous = _features_for(features, _window_dates(end, window_days, window_days))
 
-def calculate_isolation_risk(user_id: str, days: int = 7) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    window_days = max(1, int(days))
-    end = datetime.utcnow()
-    start = end - timedelta(days=window_days - 1)
-    previous_start = start - timedelta(days=window_days)
-
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,title,metadata,timestamp,amount")
-        .eq("user_id", user_id)
-        .gte("timestamp", previous_start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
-    )
-    rows = events_resp.data or []
-    social_count = 0
-    group_count = 0
-    mood_values: list[float] = []
-    current_events = 0
-    previous_events = 0
-
-    for row in rows:
-        ts = _parse_ts(row.get("timestamp"))
-        if ts is None:
-            continue
-        event_type = (row.get("event_type") or "").lower()
-        title = (row.get("title") or "").lower()
-        metadata = row.get("metadata") or {}
-        in_current = ts.date() >= start.date()
-        if in_current:
-            current_events += 1
-        else:
-            previous_events += 1
-
-        if in_current and event_type == "social":
-            social_count += 1
-            meta_type = str(metadata.get("type") or "").lower()
-            is_group = metadata.get("group") is True
-            if is_group or meta_type in {"group", "team", "class", "meetup"}:
-                group_count += 1
-            if any(key in title for key in ["group", "team", "class", "meetup"]):
-                group_count += 1
-
-        if in_current and event_type == "mood":
-            amount = _safe_float(row.get("amount"))
-            if amount is not None:
-                mood_values.append(max(0.0, min(10.0, amount)))
+    social_count = sum(data["social"] for _, data in current)
+    group_count = sum(data["group"] for _, data in current)
+    mood_values = [value for _, data in current for value in data["mood_values"]]
+    current_events = sum(data["events"] for _, data in current)
+    previous_events = sum(data["events"] for _, data in previous)
 
     social_target = (3.0 / 7.0) * window_days
     low_social = social_count < social_target
@@ -420,73 +445,20 @@ def calculate_isolation_risk(user_id: str, days: int = 7) -> dict[str, Any]:
             "No group activities logged.",
         ),
     ]
-    factors = [
-        {"name": name, "impact": round(impact, 2), "details": detail}
-        for name, impact, detail in factor_values
-        if impact > 0
-    ]
-    factors.sort(key=lambda item: item["impact"], reverse=True)
-    factors = factors[:3]
-
-    risk_score = round(min(100.0, sum(item["impact"] for item in factors)), 2)
-    return {
-        "days": window_days,
-        "risk": risk_score,
-        "level": _risk_level(risk_score),
-        "factors": factors,
-        "recommendations": ["Schedule social event", "Call a friend", "Join group activity"],
-    }
-
-
-def calculate_financial_risk(user_id: str, days: int = 30) -> dict[str, Any]:
-    supabase = get_supabase_client()
-    if supabase is None:
-        raise RuntimeError("Supabase client is not configured")
-    window_days = max(1, int(days))
-    end = datetime.utcnow()
-    start = end - timedelta(days=window_days - 1)
-
-    events_resp = (
-        supabase.table(EVENTS_TABLE)
-        .select("event_type,category,title,metadata,timestamp,amount")
-        .eq("user_id", user_id)
-        .gte("timestamp", start.isoformat())
-        .lte("timestamp", end.isoformat())
-        .execute()
+    return _finalize(
+        window_days, factor_values, ["Schedule social event", "Call a friend", "Join group activity"]
     )
-    rows = events_resp.data or []
 
-    spending_total = 0.0
-    income_total = 0.0
-    recurring_count = 0
-    net_by_day: dict[date_type, float] = {}
-    latest_balance = None
-    latest_balance_ts = None
 
-    for row in rows:
-        ts = _parse_ts(row.get("timestamp"))
-        if ts is None:
-            continue
-        day = ts.date()
-        event_type = (row.get("event_type") or "").lower()
-        category = (row.get("category") or "").lower()
-        amount = _safe_float(row.get("amount")) or 0.0
-        metadata = row.get("metadata") or {}
-
-        current_balance = _safe_float(metadata.get("current_balance"))
-        if current_balance is not None:
-            if latest_balance_ts is None or ts > latest_balance_ts:
-                latest_balance_ts = ts
-                latest_balance = current_balance
-
-        if event_type == "spending":
-            spending_total += abs(amount)
-            net_by_day[day] = net_by_day.get(day, 0.0) - abs(amount)
-            if metadata.get("recurring") or metadata.get("is_recurring"):
-                recurring_count += 1
-        if category == "finance" or event_type == "income":
-            income_total += amount
-            net_by_day[day] = net_by_day.get(day, 0.0) + amount
+def _financial_model(features: dict[str, Any], window_days: int) -> dict[str, Any]:
+    daily = _features_for(features, _window_dates(features["end"], window_days))
+
+    spending_total = sum(data["spending"] for _, data in daily)
+    income_total = sum(data["income"] for _, data in daily)
+    recurring_count = sum(data["recurring"] for _, data in daily)
+    net_by_day = {day: data["net"] for day, data in daily if data["net"] is not None}
+    balances = [data["balance"] for _, data in daily if data["balance"] is not None]
+    latest_balance = max(balances, key=lambda item: item[0])[1] if balances else None
 
     if latest_balance is None:
         latest_balance = sum(net_by_day.values())
@@ -523,21 +495,72 @@ def calculate_financial_risk(user_id: str, days: int = 30) -> dict[str, Any]:
             f"Net trend {second_half:.2f} vs {first_half:.2f}.",
         ),
     ]
-    factors = [
-        {"name": name, "impact": round(impact, 2), "details": detail}
-        for name, impact, detail in factor_values
-        if impact > 0
-    ]
-    factors.sort(key=lambda item: item["impact"], reverse=True)
-    factors = factors[:3]
+    return _finalize(
+        window_days, factor_values, ["Review subscriptions", "Set spending limit", "Build emergency fund"]
+    )
 
-    risk_score = round(min(100.0, sum(item["impact"] for item in factors)), 2)
+
+RISK_MODELS = {
+    "burnout": _burnout_model,
+    "injury": _injury_model,
+    "isolation": _isolation_model,
+    "financial": _financial_model,
+}
+
+
+def _risk_windows(windows: dict[str, int] | None) -> dict[str, int]:
+    windows = {name: max(1, int(days)) for name, days in (windows or RISK_WINDOWS).items()}
+    unknown = set(windows) - set(RISK_MODELS)
+    if unknown:
+        raise ValueError(f"Unsupported risk types: {', '.join(sorted(unknown))}")
+    return windows
+
+
+def evaluate_risks(user_id: str, windows: dict[str, int] | None = None) -> dict[str, dict[str, Any]]:
+    windows = _risk_windows(windows)
+    features = load_risk_features(user_id, windows)
+    return {name: RISK_MODELS[name](features, window_days) for name, window_days in windows.items()}
+
+
+async def evaluate_risks_async(
+    user_id: str, windows: dict[str, int] | None = None
+) -> dict[str, dict[str, Any]]:
+    windows = _risk_windows(windows)
+    features = await load_risk_features_async(user_id, windows)
+    return {name: RISK_MODELS[name](features, window_days) for name, window_days in windows.items()}
+
+
+def calculate_burnout_risk(user_id: str, days: int = 7) -> dict[str, Any]:
+    return evaluate_risks(user_id, {"burnout": days})["burnout"]
+
+
+def calculate_injury_risk(user_id: str, days: int = 7) -> dict[str, Any]:
+    return evaluate_risks(user_id, {"injury": days})["injury"]
+
+
+def calculate_isolation_risk(user_id: str, days: int = 7) -> dict[str, Any]:
+    return evaluate_risks(user_id, {"isolation": days})["isolation"]
+
+
+def calculate_financial_risk(user_id: str, days: int = 30) -> dict[str, Any]:
+    return evaluate_risks(user_id, {"financial": days})["financial"]
+
+
+async def calculate_risk_async(user_id: str, risk_type: str, days: int) -> dict[str, Any]:
+    return (await evaluate_risks_async(user_id, {risk_type: days}))[risk_type]
+
+
+def build_risk_snapshot(user_id: str, target_date: date_type | None = None) -> dict[str, Any]:
+    day = target_date or datetime.utcnow().date()
+    risks = evaluate_risks(user_id, RISK_WINDOWS)
     return {
-        "days": window_days,
-        "risk": risk_score,
-        "level": _risk_level(risk_score),
-        "factors": factors,
-        "recommendations": ["Review subscriptions", "Set spending limit", "Build emergency fund"],
+        "user_id": user_id,
+        "date": day.isoformat(),
+        "burnout_risk": risks["burnout"]["risk"],
+        "injury_risk": risks["injury"]["risk"],
+        "isolation_risk": risks["isolation"]["risk"],
+        "financial_risk": risks["financial"]["risk"],
+        "created_at": datetime.utcnow().isoformat(),
     }
 
 
@@ -545,20 +568,7 @@ def save_risk_snapshot(user_id: str, target_date: date_type | None = None) -> di
     supabase = get_supabase_client()
     if supabase is None:
         raise RuntimeError("Supabase client is not configured")
-    day = target_date or datetime.utcnow().date()
-    burnout = calculate_burnout_risk(user_id, 7)
-    injury = calculate_injury_risk(user_id, 7)
-    isolation = calculate_isolation_risk(user_id, 7)
-    financial = calculate_financial_risk(user_id, 30)
-    payload = {
-        "user_id": user_id,
-        "date": day.isoformat(),
-        "burnout_risk": burnout["risk"],
-        "injury_risk": injury["risk"],
-        "isolation_risk": isolation["risk"],
-        "financial_risk": financial["risk"],
-        "created_at": datetime.utcnow().isoformat(),
-    }
+    payload = build_risk_snapshot(user_id, target_date)
     response = (
         supabase.table(RISK_HISTORY_TABLE)
         .upsert(payload, on_conflict="user_id,date")
@@ -571,6 +581,16 @@ def save_risk_snapshot(user_id: str, target_date: date_type | None = None) -> di
     return response.data
 
 
+def save_risk_snapshots(payloads: list[dict[str, Any]]) -> int:
+    if not payloads:
+        return 0
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    supabase.table(RISK_HISTORY_TABLE).upsert(payloads, on_conflict="user_id,date").execute()
+    return len(payloads)
+
+
 def get_risk_history(
     user_id: str, days: int = 30, types: list[str] | None = None
 ) -> list[dict[str, Any]]:
@@ -0,0 +1,58 @@
+import numpy as np
+
+DEFAULT_PATHS = 2000
+MAX_PATHS = 10000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def bootstrap_noise(
+    history: np.ndarray,
+    horizon: int,
+    paths: int = DEFAULT_PATHS,
+    seed: int | None = None,
+    cumulative: bool = True,
+) -> np.ndarray:
+    paths = max(1, min(MAX_PATHS, int(paths)))
+    history = np.asarray(history, dtype=float)
+    history = history[~np.isnan(history)]
+    noise = np.zeros((horizon + 1, paths))
+    if history.size == 0 or horizon < 1:
+        return noise
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(history - history.mean(), size=(horizon, paths))
+    noise[1:] = np.cumsum(samples, axis=0) if cumulative else samples
+    return noise
+
+
+def percentile_bands(
+    quantiles: np.ndarray,
+    center: np.ndarray,
+    minimum: float | None = None,
+    maximum: float | None = None,
+) -> dict[str, np.ndarray]:
+    bands = {}
+    for percentile, offsets in zip(PERCENTILES, quantiles):
+        values = center + offsets
+        if minimum is not None or maximum is not None:
+            values = np.clip(values, minimum, maximum)
+        bands[f"p{percentile}"] = values
+    return bands
+
+
+def simulate_scenarios(
+    history: np.ndarray,
+    series: dict[str, np.ndarray],
+    paths: int = DEFAULT_PATHS,
+    seed: int | None = None,
+    cumulative: bool = True,
+    minimum: float | None = None,
+    maximum: float | None = None,
+) -> dict[str, dict[str, np.ndarray]]:
+    if not series:
+        return {}
+    horizon = len(next(iter(series.values()))) - 1
+    noise = bootstrap_noise(history, horizon, paths, seed, cumulative)
+    quantiles = np.percentile(noise, PERCENTILES, axis=1)
+    return {
+        name: percentile_bands(quantiles, center, minimum, maximum) for name, center in series.items()
+    }
@@ -0,0 +1,99 @@
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+HEALTHY_FLAG_PATTERN = re.compile("healthy|salad|whole|fresh")
+JUNK_FLAG_PATTERN = re.compile("junk|fast|fried|processed")
+PLANT_INGREDIENTS = frozenset({"tofu", "bean", "beans", "lentil", "vegetable", "veggie", "salad"})
+MEAT_INGREDIENTS = frozenset({"beef", "pork", "lamb", "meat", "steak", "chicken"})
+PROCESSED_INGREDIENTS = frozenset({"processed", "frozen", "packaged", "chips", "soda"})
+DEFAULT_PROFILE = "Student"
+
+
+@dataclass(frozen=True)
+class ProfileRules:
+    healthy_bonus: float
+    junk_penalty: float
+    healthy_explanation: str
+    junk_explanation: str
+    movement_per_minute: float
+    movement_max: float
+    sleep_optimal_min: float
+    sleep_optimal_max: float
+    sleep_penalty_per_hour: float
+
+
+@dataclass(frozen=True)
+class ScoringRuleset:
+    profiles: Mapping[str, ProfileRules]
+    default_profile: ProfileRules
+    plant_based: float
+    meat: float
+    processed: float
+    walk: float
+    bike: float
+    car: float
+    plant_based_explanation: str
+    meat_explanation: str
+    processed_explanation: str
+    walk_explanation: str
+    bike_explanation: str
+    car_explanation: str
+
+    def profile(self, name: str | None) -> ProfileRules:
+        if name and name in self.profiles:
+            return self.profiles[name]
+        return self.default_profile
+
+
+def _compile_profile(rules: dict[str, Any]) -> ProfileRules:
+    food_rules = rules.get("food", {})
+    movement_rules = rules.get("movement", {})
+    sleep_rules = rules.get("sleep", {})
+    healthy_bonus = float(food_rules.get("healthy_bonus", 50))
+    junk_penalty = float(food_rules.get("junk_penalty", -30))
+    return ProfileRules(
+        healthy_bonus=healthy_bonus,
+        junk_penalty=junk_penalty,
+        healthy_explanation=f"Healthy meal (+{int(healthy_bonus)})",
+        junk_explanation=f"Low quality meal ({int(junk_penalty)})",
+        movement_per_minute=float(movement_rules.get("per_minute", 2)),
+        movement_max=float(movement_rules.get("max", 100)),
+        sleep_optimal_min=float(sleep_rules.get("optimal_min", 7)),
+        sleep_optimal_max=float(sleep_rules.get("optimal_max", 8)),
+        sleep_penalty_per_hour=float(sleep_rules.get("penalty_per_hour", -10)),
+    )
+
+
+def compile_ruleset(rules: dict[str, Any]) -> ScoringRuleset:
+    profiles = {name: _compile_profile(values or {}) for name, values in (rules.get("profiles") or {}).items()}
+    if DEFAULT_PROFILE in profiles:
+        default_profile = profiles[DEFAULT_PROFILE]
+    else:
+        default_profile = next(iter(profiles.values()), _compile_profile({}))
+    sustainability_rules = rules.get("sustainability", {})
+    food_rules = sustainability_rules.get("food", {})
+    transport_rules = sustainability_rules.get("transport", {})
+    plant_based = float(food_rules.get("plant_based", 40))
+    meat = float(food_rules.get("meat", -30))
+    processed = float(food_rules.get("processed", -20))
+    walk = float(transport_rules.get("walk", 50))
+    bike = float(transport_rules.get("bike", 45))
+    car = float(transport_rules.get("car", -30))
+    return ScoringRuleset(
+        profiles=MappingProxyType(profiles),
+        default_profile=default_profile,
+        plant_based=plant_based,
+        meat=meat,
+        processed=processed,
+        walk=walk,
+        bike=bike,
+        car=car,
+        plant_based_explanation=f"Plant-based (+{int(plant_based)})",
+        meat_explanation=f"Meat ({int(meat)})",
+        processed_explanation=f"Processed ({int(processed)})",
+        walk_explanation=f"Walking (+{int(walk)})",
+        bike_explanation=f"Biking (+{int(bike)})",
+        car_explanation=f"Car travel ({int(car)})",
+    )
@@ -0,0 +1,247 @@
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Iterable
+
+from db.supabase import get_async_supabase_client, get_supabase_client
+from services.batch_fetch import chunked, fetch_rows_in
+from services.friend_graph import FRIEND_GRAPH_TTL_SECONDS, friend_ids
+from services.response_cache import InMemoryBackend
+
+logger = logging.getLogger(__name__)
+
+SOCIAL_TIMELINES_TABLE = "social_timelines"
+TIMELINE_SOURCES_TABLE = "social_timeline_sources"
+USER_ACTIVITIES_TABLE = "user_activities"
+PRIVACY_TABLE = "privacy_settings"
+SHARED_VISIBILITIES = ("public", "friends")
+ACTIVITY_FIELDS = "id,user_id,activity_type,title,description,metadata,created_at,visibility"
+TIMELINE_FIELDS = "activity_id,actor_id,activity_type,title,description,metadata,created_at"
+FANOUT_CHUNK = 500
+TIMELINE_SYNC_MAX_OWNERS = max(1, int(os.getenv("TIMELINE_SYNC_MAX_OWNERS", "50000")))
+
+_synced = InMemoryBackend(TIMELINE_SYNC_MAX_OWNERS, FRIEND_GRAPH_TTL_SECONDS)
+
+
+def _require_supabase():
+    supabase = get_supabase_client()
+    if supabase is None:
+        raise RuntimeError("Supabase client is not configured")
+    return supabase
+
+
+def encode_timeline_cursor(row: dict[str, Any]) -> str:
+    payload = json.dumps({"t": str(row["created_at"]), "i": str(row["activity_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_timeline_cursor(cursor: str) -> dict[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        before = {"created_at": str(payload["t"]), "activity_id": str(payload["i"])}
+        datetime.fromisoformat(before["created_at"].replace("Z", "+00:00"))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not before["activity_id"] or any(char in before["activity_id"] for char in ',()"'):
+        raise ValueError("Invalid cursor")
+    return before
+
+
+def _shares_activity(settings: dict[str, Any] | None) -> bool:
+    if not settings:
+        return True
+    return settings.get("activity_sharing") is not False and settings.get("profile_visibility") != "private"
+
+
+def _sharing_enabled(supabase, user_id: str) -> bool:
+    rows = (
+        supabase.table(PRIVACY_TABLE)
+        .select("profile_visibility,activity_sharing")
+        .eq("user_id", user_id)
+        .limit(1)
+        .execute()
+        .data
+        or []
+    )
+    return _shares_activity(rows[0] if rows else None)
+
+
+def _visible_activities(actor_ids: Iterable[str]) -> list[dict[str, Any]]:
+    return fetch_rows_in(
+        USER_ACTIVITIES_TABLE,
+        ACTIVITY_FIELDS,
+        "user_id",
+        actor_ids,
+        filters=lambda query: query.in_("visibility", list(SHARED_VISIBILITIES)),
+        order=("created_at", "id"),
+    )
+
+
+def _timeline_row(owner_id: str, activity: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "owner_id": owner_id,
+        "activity_id": str(activity["id"]),
+        "actor_id": str(activity["user_id"]),
+        "activity_type": activity.get("activity_type"),
+        "title": activity.get("title") or "",
+        "description": activity.get("description"),
+        "metadata": activity.get("metadata") or {},
+        "created_at": activity.get("created_at"),
+    }
+
+
+def _write_timeline_rows(supabase, rows: list[dict[str, Any]]) -> int:
+    for start in range(0, len(rows), FANOUT_CHUNK):
+        supabase.table(SOCIAL_TIMELINES_TABLE).upsert(
+            rows[start : start + FANOUT_CHUNK], on_conflict="owner_id,activity_id", ignore_duplicates=True
+        ).execute()
+    return len(rows)
+
+
+def fan_out_activity(activity: dict[str, Any], owner_ids: Iterable[str] | None = None) -> int:
+    if not activity.get("id") or activity.get("visibility", "friends") not in SHARED_VISIBILITIES:
+        return 0
+    actor_id = str(activity["user_id"])
+    try:
+        supabase = _require_supabase()
+        if not _sharing_enabled(supabase, actor_id):
+            return 0
+        owners = set(owner_ids) if owner_ids is not None else friend_ids(actor_id)
+        return _write_timeline_rows(supabase, [_timeline_row(owner, activity) for owner in sorted(owners)])
+    except Exception:
+        logger.warning("timeline fan-out failed", exc_info=True, extra={"user_id": actor_id})
+        return 0
+
+
+def refresh_timeline_privacy(
+    user_id: str, previous: dict[str, Any] | None, current: dict[str, Any] | None
+) -> int:
+    if _shares_activity(previous) == _shares_activity(current):
+        return 0
+    try:
+        supabase = _require_supabase()
+        friends = sorted(friend_ids(user_id))
+        for owner_id in friends:
+            _synced.delete(owner_id)
+        if not _shares_activity(current):
+            supabase.table(SOCIAL_TIMELINES_TABLE).delete().eq("actor_id", user_id).execute()
+            return 0
+        if not friends:
+            return 0
+        rows = [_timeline_row(owner, activity) for activity in _visible_activities([user_id]) for owner in friends]
+        return _write_timeline_rows(supabase, rows)
+    except Exception:
+        logger.warning("timeline privacy refresh failed", exc_info=True, extra={"user_id": user_id})
+        return 0
+
+
+def _sharing_actors(actor_ids: Iterable[str]) -> list[str]:
+    actors = sorted(actor_ids)
+    privacy = {
+        str(row.get("user_id")): row
+        for row in fetch_rows_in(
+            PRIVACY_TABLE, "user_id,profile_visibility,activity_sharing", "user_id", actors, order=("user_id",)
+        )
+    }
+    return [actor_id for actor_id in actors if _shares_activity(privacy.get(actor_id))]
+
+
+def _owner_rows(owner_id: str, actor_ids: Iterable[str]) -> list[dict[str, Any]]:
+    return [_timeline_row(owner_id, activity) for activity in _visible_activities(actor_ids)] if actor_ids else []
+
+
+def _record_sources(supabase, owner_id: str, friends: frozenset[str], visible: frozenset[str]) -> None:
+    supabase.table(TIMELINE_SOURCES_TABLE).upsert(
+        {"owner_id": owner_id, "actor_ids": sorted(friends), "synced_at": datetime.utcnow().isoformat()},
+        on_conflict="owner_id",
+    ).execute()
+    _synced.set(owner_id, (friends, visible))
+
+
+def _rebuild(supabase, owner_id: str, friends: frozenset[str], visible: frozenset[str]) -> int:
+    rows = _owner_rows(owner_id, sorted(visible))
+    supabase.table(SOCIAL_TIMELINES_TABLE).delete().eq("owner_id", owner_id).execute()
+    written = _write_timeline_rows(supabase, rows)
+    _record_sources(supabase, owner_id, friends, visible)
+    return written
+
+
+def rebuild_social_timeline(owner_id: str) -> int:
+    friends = friend_ids(owner_id)
+    return _rebuild(_require_supabase(), owner_id, friends, frozenset(_sharing_actors(friends)))
+
+
+def _prune_actors(supabase, owner_id: str, actor_ids: Iterable[str]) -> None:
+    for chunk in chunked(sorted(actor_ids)):
+        supabase.table(SOCIAL_TIMELINES_TABLE).delete().eq("owner_id", owner_id).in_("actor_id", chunk).execute()
+
+
+def visible_timeline_actors(owner_id: str) -> frozenset[str]:
+    return frozenset(_sharing_actors(friend_ids(owner_id)))
+
+
+def sync_social_timeline(owner_id: str) -> frozenset[str]:
+    friends = friend_ids(owner_id)
+    cached = _synced.get(owner_id)
+    if cached is not None and cached[0] == friends:
+        return cached[1]
+    supabase = _require_supabase()
+    rows = (
+        supabase.table(TIMELINE_SOURCES_TABLE)
+        .select("actor_ids")
+        .eq("owner_id", owner_id)
+        .limit(1)
+        .execute()
+        .data
+        or []
+    )
+    visible = frozenset(_sharing_actors(friends))
+    if not rows:
+        _rebuild(supabase, owner_id, friends, visible)
+        return visible
+    synced = {str(actor_id) for actor_id in rows[0].get("actor_ids") or []}
+    added = friends - synced
+    _prune_actors(supabase, owner_id, (synced - friends) | (friends - visible))
+    if added & visible:
+        _write_timeline_rows(supabase, _owner_rows(owner_id, added & visible))
+    if synced != friends:
+        _record_sources(supabase, owner_id, friends, visible)
+    else:
+        _synced.set(owner_id, (friends, visible))
+    return visible
+
+
+async def get_social_timeline_async(owner_id: str, limit: int, cursor: str | None = None) -> dict[str, Any]:
+    client = get_async_supabase_client()
+    if client is None:
+        raise RuntimeError("Supabase client is not configured")
+    before = decode_timeline_cursor(cursor) if cursor else None
+    try:
+        friends = await asyncio.to_thread(sync_social_timeline, owner_id)
+    except Exception:
+        logger.warning("timeline sync failed", exc_info=True, extra={"user_id": owner_id})
+        friends = await asyncio.to_thread(visible_timeline_actors, owner_id)
+    entries: list[dict[str, Any]] = []
+    while len(entries) <= limit:
+        query = client.table(SOCIAL_TIMELINES_TABLE).select(TIMELINE_FIELDS).eq("owner_id", owner_id)
+        if before:
+            created_at = before["created_at"]
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",activity_id.lt.{before["activity_id"]})'
+            )
+        response = await (
+            query.order("created_at", desc=True).order("activity_id", desc=True).limit(limit + 1).execute()
+        )
+        rows = response.data or []
+        entries.extend(row for row in rows if str(row.get("actor_id")) in friends)
+        if len(rows) <= limit:
+            break
+        before = {"created_at": str(rows[-1]["created_at"]), "activity_id": str(rows[-1]["activity_id"])}
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    return {"entries": entries, "next_cursor": encode_timeline_cursor(entries[-1]) if has_more else None}
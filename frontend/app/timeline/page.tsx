@@ -26,7 +26,7 @@ export default function TimelinePage() {
   const [loadingEvents, setLoadingEvents] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [hasMore, setHasMore] = useState(false);
-  const [offset, setOffset] = useState(0);
+  const [cursor, setCursor] = useState<string | null>(null);
 
   const limit = 20;
 
@@ -37,7 +37,7 @@ export default function TimelinePage() {
   }, [loading, router, user]);
 
   const loadEvents = useCallback(
-    async (nextOffset: number, replace: boolean) => {
+    async (nextCursor: string | null, replace: boolean) => {
       try {
         if (replace) {
           setLoadingEvents(true);
@@ -50,11 +50,11 @@ export default function TimelinePage() {
           filters.types,
           undefined,
           limit,
-          nextOffset
+          nextCursor
         );
         setEvents((prev) => (replace ? result.events : [...prev, ...result.events]));
         setHasMore(result.hasMore);
-        setOffset(nextOffset);
+        setCursor(result.nextCursor);
         setError(null);
       } catch (err) {
         const message = err instanceof Error ? err.message : "Unable to load timeline.";
@@ -74,7 +74,7 @@ export default function TimelinePage() {
     if (!user) {
       return;
     }
-    void loadEvents(0, true);
+    void loadEvents(null, true);
   }, [loadEvents, user]);
 
   const handleFilter = useCallback((value: TimelineFiltersValue) => {
@@ -85,8 +85,8 @@ export default function TimelinePage() {
     if (!hasMore || loadingMore) {
       return;
     }
-    void loadEvents(offset + limit, false);
-  }, [hasMore, limit, loadEvents, loadingMore, offset]);
+    void loadEvents(cursor, false);
+  }, [cursor, hasMore, loadEvents, loadingMore]);
 
   const subtitle = useMemo(() => {
     if (loadingEvents) {
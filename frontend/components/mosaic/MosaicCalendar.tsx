@@ -3,7 +3,7 @@
 import { useEffect, useMemo, useState } from "react";
 
 import { Button } from "@/components/ui/button";
-import { getWeekMosaics } from "@/lib/mosaic";
+import { getMonthMosaics, getWeekMosaics } from "@/lib/mosaic";
 import type { DailyMosaic as DailyMosaicType } from "@/types/mosaic";
 import { DailyMosaic } from "@/components/mosaic/DailyMosaic";
 
@@ -11,6 +11,8 @@ type MosaicCalendarProps = {
   initialDate?: string;
 };
 
+type CalendarView = "week" | "month";
+
 const toDateInput = (date: Date) => date.toISOString().slice(0, 10);
 
 const startOfWeek = (date: Date) => {
@@ -21,6 +23,8 @@ const startOfWeek = (date: Date) => {
   return start;
 };
 
+const startOfMonth = (date: Date) => `${toDateInput(date).slice(0, 7)}-01`;
+
 const scoreClass = (score: number) => {
   if (score >= 80) return "text-emerald-200";
   if (score >= 50) return "text-amber-200";
@@ -29,6 +33,7 @@ const scoreClass = (score: number) => {
 
 export function MosaicCalendar({ initialDate }: MosaicCalendarProps) {
   const initial = initialDate ? new Date(initialDate) : new Date();
+  const [view, setView] = useState<CalendarView>("week");
   const [startDate, setStartDate] = useState(() => toDateInput(startOfWeek(initial)));
   const [selectedDate, setSelectedDate] = useState(() => toDateInput(initial));
   const [loading, setLoading] = useState(true);
@@ -41,7 +46,8 @@ export function MosaicCalendar({ initialDate }: MosaicCalendarProps) {
       setLoading(true);
       setError(null);
       try {
-        const payload = await getWeekMosaics(startDate);
+        const payload =
+          view === "month" ? await getMonthMosaics(startDate.slice(0, 7)) : await getWeekMosaics(startDate);
         if (!active) {
           return;
         }
@@ -50,7 +56,7 @@ export function MosaicCalendar({ initialDate }: MosaicCalendarProps) {
         if (!active) {
           return;
         }
-        setError(err instanceof Error ? err.message : "Unable to load week mosaic.");
+        setError(err instanceof Error ? err.message : `Unable to load ${view} mosaic.`);
         setDays([]);
       } finally {
         if (active) {
@@ -62,27 +68,37 @@ export function MosaicCalendar({ initialDate }: MosaicCalendarProps) {
     return () => {
       active = false;
     };
-  }, [startDate]);
+  }, [startDate, view]);
 
   const selectedMosaic = useMemo(
     () => days.find((day) => day.date === selectedDate) ?? null,
     [days, selectedDate]
   );
 
-  const startLabel = useMemo(() => {
+  const rangeLabel = useMemo(() => {
     const date = new Date(startDate);
-    return date.toLocaleDateString(undefined, { month: "short", day: "numeric" });
-  }, [startDate]);
+    if (view === "month") {
+      return date.toLocaleDateString(undefined, { month: "long", year: "numeric", timeZone: "UTC" });
+    }
+    const end = new Date(startDate);
+    end.setDate(end.getDate() + 6);
+    const format = (value: Date) => value.toLocaleDateString(undefined, { month: "short", day: "numeric" });
+    return `${format(date)} - ${format(end)}`;
+  }, [startDate, view]);
 
-  const endLabel = useMemo(() => {
-    const date = new Date(startDate);
-    date.setDate(date.getDate() + 6);
-    return date.toLocaleDateString(undefined, { month: "short", day: "numeric" });
-  }, [startDate]);
+  const showView = (next: CalendarView) => {
+    const anchor = new Date(selectedDate);
+    setView(next);
+    setStartDate(next === "month" ? startOfMonth(anchor) : toDateInput(startOfWeek(anchor)));
+  };
 
-  const shiftWeek = (delta: number) => {
+  const shiftRange = (delta: number) => {
     const date = new Date(startDate);
-    date.setDate(date.getDate() + delta);
+    if (view === "month") {
+      date.setUTCMonth(date.getUTCMonth() + delta);
+    } else {
+      date.setDate(date.getDate() + delta * 7);
+    }
     setStartDate(toDateInput(date));
   };
 
@@ -90,23 +106,37 @@ export function MosaicCalendar({ initialDate }: MosaicCalendarProps) {
     <section className="space-y-4">
       <div className="flex flex-wrap items-center justify-between gap-3">
         <div>
-          <h3 className="text-lg font-semibold text-slate-100">Week mosaic</h3>
-          <p className="text-sm text-slate-400">
-            {startLabel} - {endLabel}
-          </p>
+          <h3 className="text-lg font-semibold text-slate-100">
+            {view === "month" ? "Month mosaic" : "Week mosaic"}
+          </h3>
+          <p className="text-sm text-slate-400">{rangeLabel}</p>
         </div>
         <div className="flex gap-2">
-          <Button type="button" onClick={() => shiftWeek(-7)}>
+          <Button
+            type="button"
+            onClick={() => showView("week")}
+            className={view === "week" ? "ring-1 ring-emerald-400" : ""}
+          >
+            Week
+          </Button>
+          <Button
+            type="button"
+            onClick={() => showView("month")}
+            className={view === "month" ? "ring-1 ring-emerald-400" : ""}
+          >
+            Month
+          </Button>
+          <Button type="button" onClick={() => shiftRange(-1)}>
             Previous
           </Button>
-          <Button type="button" onClick={() => shiftWeek(7)}>
+          <Button type="button" onClick={() => shiftRange(1)}>
             Next
           </Button>
         </div>
       </div>
-      {loading ? <div className="text-sm text-slate-300">Loading week mosaic…</div> : null}
+      {loading ? <div className="text-sm text-slate-300">Loading {view} mosaic…</div> : null}
       {error ? <div className="text-sm text-rose-300">{error}</div> : null}
-      <div className="grid gap-3 sm:grid-cols-2 lg:grid-cols-4">
+      <div className={`grid gap-3 sm:grid-cols-2 ${view === "month" ? "lg:grid-cols-7" : "lg:grid-cols-4"}`}>
         {days.map((day) => (
           <button
             key={day.date}
@@ -328,8 +328,8 @@ export const getEventsByDateRange = async (
   types?: EventType[],
   categories?: EventCategory[],
   limit = 50,
-  offset = 0
-): Promise<{ events: Event[]; total: number; hasMore: boolean }> => {
+  cursor?: string | null
+): Promise<{ events: Event[]; total: number | null; hasMore: boolean; nextCursor: string | null }> => {
   const params = new URLSearchParams();
   params.set("start_date", startDate);
   params.set("end_date", endDate);
@@ -340,16 +340,27 @@ export const getEventsByDateRange = async (
     params.set("categories", categories.join(","));
   }
   params.set("limit", String(limit));
-  params.set("offset", String(offset));
-  const mock = buildMockEvents(types, categories, limit, offset);
-  const payload = await safeFetch<{ events: Event[]; total: number; has_more: boolean }>(
-    `/events?${params.toString()}`,
-    { events: mock.events, total: mock.total, has_more: mock.hasMore }
-  );
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  const mockOffset = cursor ? Number(cursor) || 0 : 0;
+  const mock = buildMockEvents(types, categories, limit, mockOffset);
+  const payload = await safeFetch<{
+    events: Event[];
+    total?: number | null;
+    has_more: boolean;
+    next_cursor?: string | null;
+  }>(`/events?${params.toString()}`, {
+    events: mock.events,
+    total: mock.total,
+    has_more: mock.hasMore,
+    next_cursor: mock.hasMore ? String(mockOffset + limit) : null,
+  });
   return {
     events: payload.events ?? [],
-    total: payload.total ?? 0,
+    total: payload.total ?? null,
     hasMore: payload.has_more ?? false,
+    nextCursor: payload.next_cursor ?? null,
   };
 };
 
@@ -26,6 +26,14 @@ const buildWeekMosaics = (start: string): DailyMosaic[] => {
   });
 };
 
+const buildMonthMosaics = (month: string): DailyMosaic[] => {
+  const [year, monthIndex] = month.split("-").map(Number);
+  const days = new Date(Date.UTC(year, monthIndex, 0)).getUTCDate();
+  return Array.from({ length: days }, (_, index) =>
+    buildDailyMosaic(new Date(Date.UTC(year, monthIndex - 1, index + 1)).toISOString())
+  );
+};
+
 export const getDailyMosaic = async (date: string): Promise<DailyMosaic> => {
   const params = new URLSearchParams();
   params.set("date", date);
@@ -37,3 +45,9 @@ export const getWeekMosaics = async (start: string): Promise<DailyMosaic[]> => {
   params.set("start", start);
   return safeFetch(`/mosaic/week?${params.toString()}`, buildWeekMosaics(start));
 };
+
+export const getMonthMosaics = async (month: string): Promise<DailyMosaic[]> => {
+  const params = new URLSearchParams();
+  params.set("month", month);
+  return safeFetch(`/mosaic/month?${params.toString()}`, buildMonthMosaics(month));
+};